@@ -0,0 +1,9 @@
+"""Offline benchmark suite for Skill Host and Agent hot paths.
+
+Run from the project root:
+
+    python -m bench                      # all suites
+    python -m bench --suite micro        # one suite
+    python -m bench -o bench.json        # save results
+    python -m bench --baseline bench.json --fail-on-regression 10
+"""
@@ -0,0 +1,72 @@
+"""Command-line entry point: python -m bench."""
+
+import argparse
+import json
+import logging
+import sys
+
+from . import load, micro, runner, startup
+from .common import compare, environment, format_table
+
+SUITES = {
+    "micro": micro.run,
+    "runner": runner.run,
+    "http": load.run,
+    "startup": startup.run,
+}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m bench", description="Skill Host and Agent benchmarks")
+    parser.add_argument(
+        "--suite",
+        action="append",
+        choices=sorted(SUITES),
+        help="Suite to run (repeatable, default: all)",
+    )
+    parser.add_argument("--quick", action="store_true", help="Shorter runs for smoke testing")
+    parser.add_argument("-o", "--output", help="Write results as JSON to this file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument(
+        "--fail-on-regression",
+        type=float,
+        metavar="PCT",
+        help="Exit with status 1 if any benchmark is more than PCT%% worse than the baseline",
+    )
+    args = parser.parse_args(argv)
+
+    # Keep per-request INFO logs out of the measurements
+    logging.disable(logging.INFO)
+
+    results = {}
+    for name in args.suite or list(SUITES):
+        print(f"Running {name} benchmarks...", file=sys.stderr)
+        results.update(SUITES[name](quick=args.quick))
+
+    rows = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            rows = compare(results, json.load(f).get("results", {}))
+
+    print(format_table(results, rows))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"environment": environment(), "results": results}, f, indent=2)
+            f.write("\n")
+
+    if rows and args.fail_on_regression is not None:
+        regressions = [r for r in rows if r["change_pct"] > args.fail_on_regression]
+        for row in regressions:
+            print(
+                f"REGRESSION {row['name']}: {row['baseline']} -> {row['current']} "
+                f"{row['unit']} ({row['change_pct']:+.1f}%)",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""Shared timing, statistics and reporting helpers for the benchmarks."""
+
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Result keys compared against a baseline, per unit
+LOWER_IS_BETTER = {"ns/op", "ms"}
+HIGHER_IS_BETTER = {"req/s"}
+
+
+def percentile(sorted_values: Sequence[float], p: float) -> float:
+    """Linear-interpolated percentile of pre-sorted values (p in 0..100)."""
+    if not sorted_values:
+        return math.nan
+    pos = (len(sorted_values) - 1) * p / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (pos - lo)
+
+
+def latency_summary(samples_ms: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/mean/max of latency samples in milliseconds."""
+    ordered = sorted(samples_ms)
+    return {
+        "p50": round(percentile(ordered, 50), 3),
+        "p95": round(percentile(ordered, 95), 3),
+        "p99": round(percentile(ordered, 99), 3),
+        "mean": round(statistics.fmean(ordered), 3) if ordered else math.nan,
+        "max": round(ordered[-1], 3) if ordered else math.nan,
+        "n": len(ordered),
+    }
+
+
+def time_per_op(
+    func: Callable[[], object],
+    min_time: float = 0.2,
+    repeat: int = 5,
+) -> Dict[str, float]:
+    """
+    Time a zero-argument callable, timeit style.
+
+    The loop count is doubled until one round takes at least ``min_time``,
+    then ``repeat`` rounds are measured. The median round is the primary
+    value; the best round is kept as a noise-free lower bound.
+
+    Returns:
+        Dictionary with ``value`` (median ns/op), ``best``, ``loops``, ``unit``
+    """
+    loops = 1
+    while True:
+        elapsed = _run_loops(func, loops)
+        if elapsed >= min_time or loops >= 1 << 24:
+            break
+        loops *= 2
+    rounds = [_run_loops(func, loops) / loops * 1e9 for _ in range(repeat)]
+    return {
+        "value": round(statistics.median(rounds), 1),
+        "best": round(min(rounds), 1),
+        "loops": loops,
+        "unit": "ns/op",
+    }
+
+
+def _run_loops(func: Callable[[], object], loops: int) -> float:
+    start = time.perf_counter()
+    for _ in range(loops):
+        func()
+    return time.perf_counter() - start
+
+
+def environment() -> Dict[str, object]:
+    """Machine and revision details stored next to the results."""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            timeout=5,
+        ).stdout.strip() or None
+    except Exception:
+        commit = None
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def compare(
+    current: Dict[str, Dict[str, object]],
+    baseline: Dict[str, Dict[str, object]],
+) -> List[Dict[str, object]]:
+    """
+    Compare primary values of matching results.
+
+    ``change_pct`` is signed so that positive always means slower/worse,
+    whichever direction the unit improves in.
+
+    Returns:
+        One row per benchmark present in both result sets
+    """
+    rows = []
+    for name, result in current.items():
+        base = baseline.get(name)
+        if not base or base.get("unit") != result.get("unit"):
+            continue
+        old, new = base.get("value"), result.get("value")
+        if not isinstance(old, (int, float)) or not isinstance(new, (int, float)) or old == 0:
+            continue
+        change = (new - old) / old * 100.0
+        if result["unit"] in HIGHER_IS_BETTER:
+            change = -change
+        rows.append({
+            "name": name,
+            "unit": result["unit"],
+            "baseline": old,
+            "current": new,
+            "change_pct": round(change, 1),
+        })
+    return rows
+
+
+def format_table(results: Dict[str, Dict[str, object]], rows: Optional[List[Dict[str, object]]] = None) -> str:
+    """Human-readable summary; includes the baseline delta when available."""
+    deltas = {row["name"]: row["change_pct"] for row in rows or []}
+    width = max((len(name) for name in results), default=10)
+    lines = []
+    for name, result in results.items():
+        line = f"{name:<{width}}  {result['value']:>12} {result['unit']:<6}"
+        extra = {k: v for k, v in result.items() if k in ("p95", "p99", "errors")}
+        if extra:
+            line += "  " + " ".join(f"{k}={v}" for k, v in extra.items())
+        if name in deltas:
+            line += f"  ({deltas[name]:+.1f}% vs baseline)"
+        lines.append(line)
+    return "\n".join(lines)
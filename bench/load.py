@@ -0,0 +1,84 @@
+"""HTTP load test against the in-process ASGI app."""
+
+import asyncio
+import time
+from typing import Dict, Sequence
+
+from .common import latency_summary
+
+# Concurrency levels exercised per endpoint
+DEFAULT_CONCURRENCY = (1, 8, 32)
+
+# (name, method, path, json body)
+ENDPOINTS = (
+    ("health", "GET", "/health", None),
+    ("echo", "POST", "/skills/echo:invoke", {"input": {"text": "hello benchmark"}}),
+)
+
+
+async def _drive(client, method: str, path: str, body, concurrency: int, total: int):
+    """Send ``total`` requests with ``concurrency`` in flight at once."""
+    samples = []
+    errors = 0
+    remaining = total
+
+    async def worker():
+        nonlocal remaining, errors
+        while remaining > 0:
+            remaining -= 1
+            start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body)
+                if response.status_code != 200:
+                    errors += 1
+            except Exception:
+                errors += 1
+            samples.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples, errors, time.perf_counter() - start
+
+
+async def _run(quick: bool, concurrency: Sequence[int]) -> Dict[str, Dict[str, object]]:
+    import httpx
+
+    from src.app import app
+
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for name, method, path, body in ENDPOINTS:
+            # Skill endpoints spawn a process per call; keep their totals smaller
+            per_level = 20 if body is not None else 500
+            if quick:
+                per_level //= 4
+            # Warm-up (imports, registry load, first spawn)
+            await client.request(method, path, json=body)
+            for level in concurrency:
+                total = max(per_level, level * 2)
+                samples, errors, elapsed = await _drive(client, method, path, body, level, total)
+                summary = latency_summary(samples)
+                results[f"http.{name}.c{level}"] = {
+                    "value": round(len(samples) / elapsed, 1),
+                    "unit": "req/s",
+                    **summary,
+                    "errors": errors,
+                }
+    return results
+
+
+def run(quick: bool = False, concurrency: Sequence[int] = DEFAULT_CONCURRENCY) -> Dict[str, Dict[str, object]]:
+    """
+    Measure requests per second and latency percentiles per endpoint and
+    concurrency level. Requests go through httpx's ASGI transport, so no
+    socket or server process is involved.
+
+    Args:
+        quick: Fewer requests per level
+        concurrency: Concurrency levels to test
+
+    Returns:
+        Results keyed by benchmark name
+    """
+    return asyncio.run(_run(quick, concurrency))
@@ -0,0 +1,110 @@
+"""Microbenchmarks for per-request hot paths."""
+
+import json
+import logging
+from pathlib import Path
+from typing import Dict
+
+from .common import time_per_op
+
+
+def run(quick: bool = False) -> Dict[str, Dict[str, object]]:
+    """
+    Benchmark path validation, tool call validation and repair, result model
+    construction, the large-result passthrough, the JSON codec and the
+    trace ID log filter.
+
+    Args:
+        quick: Shorter rounds (for smoke runs)
+
+    Returns:
+        Results keyed by benchmark name
+    """
+    from src.agent.models import ToolCall
+    from src.agent.validator import ToolCallValidator
+    from src.config import config
+    from src.models import NormalizedSkillResult
+    from src.security import validate_path
+    from src.utils import TraceIDFilter
+
+    min_time = 0.05 if quick else 0.2
+    repeat = 3 if quick else 5
+    results = {}
+
+    # Path relative to the working directory, inside the allowed root
+    try:
+        relative_root = config.allowed_root.relative_to(Path.cwd())
+    except ValueError:
+        relative_root = None
+    if relative_root is not None:
+        sample_path = str(relative_root / "logs" / "app.log")
+        results["micro.validate_path"] = time_per_op(
+            lambda: validate_path(sample_path), min_time, repeat
+        )
+
+    validator = ToolCallValidator()
+    tool_call = ToolCall(
+        id="call_1",
+        name="calculator",
+        arguments={"numbers": [1.5, 2.5, 3.5, 4.5], "ops": ["mean", "max"]},
+    )
+    results["micro.tool_call_validate"] = time_per_op(
+        lambda: validator.validate(tool_call), min_time, repeat
+    )
+    # Slips the repair pass fixes instead of a validation retry
+    sloppy_call = ToolCall(
+        id="call_2",
+        name="calculator",
+        arguments={"numbers": "[1.5, 2.5, 3.5, 4.5]", "ops": "mean", "k": "1,000"},
+    )
+    results["micro.tool_call_repair"] = time_per_op(
+        lambda: validator.validate(sloppy_call), min_time, repeat
+    )
+
+    # Shape of a parsed skill envelope as the CLI runner sees it
+    envelope = {
+        "success": True,
+        "skill_id": "calculator",
+        "trace_id": "00000000-0000-0000-0000-000000000000",
+        "data": {"results": {"mean": 3.0, "max": 4.5}},
+        "error": None,
+        "meta": {"latency_ms": 1, "version": "0.1.0"},
+    }
+    results["micro.skill_result_build"] = time_per_op(
+        lambda: NormalizedSkillResult(**envelope), min_time, repeat
+    )
+
+    # Large log_transform-style output through the runner's passthrough
+    # parse and the HTTP response serializer
+    from src.app import _skill_response
+    from src import codec
+    from src.runners.cli_python import _passthrough_result
+
+    records = [
+        {"ts": "2024-01-01T00:00:00", "level": "INFO", "message": f"request {i} done", "line": i}
+        for i in range(2000 if quick else 20000)
+    ]
+    large_output = json.dumps({**envelope, "skill_id": "log_transform", "data": {"records": records}})
+
+    def _passthrough() -> None:
+        result = _passthrough_result(codec.loads(large_output))
+        _skill_response(result)
+
+    results["micro.skill_result_passthrough_large"] = time_per_op(_passthrough, min_time, repeat)
+
+    # Serialization layer vs the stdlib on a tool-result-sized payload
+    payload = {"input": {"records": records[:200]}}
+    results[f"micro.codec_roundtrip.{codec.JSON_BACKEND}"] = time_per_op(
+        lambda: codec.loads(codec.dumps(payload)), min_time, repeat
+    )
+    results["micro.codec_roundtrip.stdlib"] = time_per_op(
+        lambda: json.loads(json.dumps(payload, ensure_ascii=False)), min_time, repeat
+    )
+
+    log_filter = TraceIDFilter()
+    record = logging.LogRecord("bench", logging.INFO, __file__, 1, "message", None, None)
+    results["micro.trace_id_filter"] = time_per_op(
+        lambda: log_filter.filter(record), min_time, repeat
+    )
+
+    return results
@@ -0,0 +1,105 @@
+"""Runner benchmarks: cold and warm invocation of each registered skill."""
+
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+from .common import latency_summary
+
+# Lines in the generated log fixture
+LOG_LINES = 2000
+
+
+def _make_fixtures(allowed_root: Path) -> Path:
+    """Create input files for file-based skills under the allowed root."""
+    fixture_dir = Path(tempfile.mkdtemp(prefix=".bench-", dir=allowed_root))
+    levels = ("INFO", "WARN", "ERROR", "DEBUG")
+    with open(fixture_dir / "app.log", "w", encoding="utf-8") as f:
+        for i in range(LOG_LINES):
+            f.write(
+                f"2024-01-01T00:{i // 60 % 60:02d}:{i % 60:02d}Z {levels[i % 4]} "
+                f"request {i} handled in {i % 97}ms\n"
+            )
+    return fixture_dir
+
+
+def _sample_inputs(fixture_dir: Path) -> Dict[str, dict]:
+    """Representative input per skill ID."""
+    try:
+        relative = fixture_dir.relative_to(Path.cwd())
+    except ValueError:
+        relative = fixture_dir
+    return {
+        "echo": {"text": "hello benchmark"},
+        "calculator": {
+            "numbers": [float(i % 1000) for i in range(1000)],
+            "ops": ["mean", "median", "stddev"],
+        },
+        "log_transform": {"input_path": str(relative / "app.log"), "limit": 0},
+        "file_search": {"query": "request", "root_dir": str(relative), "limit": 20},
+    }
+
+
+def run(quick: bool = False, skills: Optional[list] = None) -> Dict[str, Dict[str, object]]:
+    """
+    Invoke every registered skill through its runner.
+
+    ``cold`` is the first invocation on a freshly created runner factory;
+    ``warm`` is the latency distribution of the following calls.
+
+    Args:
+        quick: Fewer warm iterations
+        skills: Restrict to these skill IDs
+
+    Returns:
+        Results keyed by benchmark name
+    """
+    from src.config import config
+    from src.registry import get_registry
+    from src.runners import RunnerFactory
+
+    iterations = 5 if quick else 30
+    registry = get_registry()
+    fixture_dir = _make_fixtures(config.allowed_root)
+    inputs = _sample_inputs(fixture_dir)
+    results = {}
+    try:
+        for skill_id in sorted(registry.list_skills()):
+            if skills and skill_id not in skills:
+                continue
+            manifest = registry.get_skill(skill_id)
+            input_data = inputs.get(skill_id)
+            if manifest is None or input_data is None:
+                continue
+            if manifest.entry and not os.path.exists(manifest.entry):
+                # Manifest without a script (nothing to measure)
+                continue
+
+            factory = RunnerFactory()
+            start = time.perf_counter()
+            runner = factory.get_runner(manifest)
+            result = runner.invoke(skill_id, input_data, "bench-cold", manifest)
+            cold_ms = (time.perf_counter() - start) * 1000
+            errors = 0 if result.success else 1
+
+            samples = []
+            for i in range(iterations):
+                start = time.perf_counter()
+                result = runner.invoke(skill_id, input_data, f"bench-{i}", manifest)
+                samples.append((time.perf_counter() - start) * 1000)
+                errors += 0 if result.success else 1
+
+            results[f"runner.{skill_id}.cold"] = {"value": round(cold_ms, 3), "unit": "ms"}
+            warm = latency_summary(samples)
+            results[f"runner.{skill_id}.warm"] = {
+                "value": warm["p50"],
+                "unit": "ms",
+                **{k: v for k, v in warm.items() if k != "p50"},
+                "errors": errors,
+            }
+    finally:
+        shutil.rmtree(fixture_dir, ignore_errors=True)
+    return results
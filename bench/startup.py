@@ -0,0 +1,81 @@
+"""Start-up cost: import-time budget of src.app from `python -X importtime`."""
+
+import collections
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Top-level packages reported individually (the rest is summed as "other")
+REPORTED_PACKAGES = ("src", "fastapi", "starlette", "pydantic", "pydantic_core", "yaml", "dotenv", "anyio", "httpx")
+
+# Environment variables that enable the agent subsystem
+LLM_ENV_KEYS = ("OPENAI_API_KEY", "ANTHROPIC_API_KEY", "DASHSCOPE_API_KEY", "LLM_API_KEY")
+
+
+def _parse_importtime(stderr: str) -> List[Tuple[str, int, int]]:
+    """(module, self_us, cumulative_us) for every ``import time:`` line."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            rows.append((parts[2].strip(), int(parts[0]), int(parts[1])))
+        except ValueError:
+            continue
+    return rows
+
+
+def _measure(with_llm: bool) -> Dict[str, float]:
+    """Import src.app in a fresh interpreter; milliseconds per package."""
+    env = dict(os.environ)
+    if not with_llm:
+        # Empty values also stop python-dotenv from filling them in
+        for key in LLM_ENV_KEYS:
+            env[key] = ""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.app"],
+        capture_output=True,
+        text=True,
+        env=env,
+        timeout=120,
+    )
+    rows = _parse_importtime(result.stderr)
+    by_package: Dict[str, float] = collections.defaultdict(float)
+    total_us = 0
+    for module, self_us, _ in rows:
+        top = module.split(".", 1)[0]
+        by_package[top if top in REPORTED_PACKAGES else "other"] += self_us
+        total_us += self_us
+    report = {pkg: us / 1000.0 for pkg, us in by_package.items()}
+    report["total"] = total_us / 1000.0
+    return report
+
+
+def run(quick: bool = False) -> Dict[str, Dict[str, object]]:
+    """
+    Import-time budget of ``import src.app``, with and without an LLM
+    configured (the agent subsystem is only imported in the former).
+
+    Each configuration is measured several times in fresh interpreters and
+    the fastest run is kept, since the first one may be compiling .pyc files.
+    Values are self time summed per top-level package.
+
+    Args:
+        quick: Fewer repetitions
+
+    Returns:
+        Results keyed by benchmark name
+    """
+    repeats = 2 if quick else 5
+    results = {}
+    for label, with_llm in (("llm", True), ("no_llm", False)):
+        runs = [_measure(with_llm) for _ in range(repeats)]
+        packages = sorted({pkg for r in runs for pkg in r})
+        for pkg in packages:
+            best = min(r.get(pkg, 0.0) for r in runs)
+            results[f"startup.{label}.import.{pkg}"] = {"value": round(best, 3), "unit": "ms"}
+    return results
@@ -1,84 +1,682 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
-import json
-import statistics
+import abc
+import array
+import ast
+import heapq
+import itertools
+import math
+import mmap
+import random
 import sys
-import time
-import uuid
-from typing import Any, Dict, Optional
+from pathlib import Path
+from typing import Any, Dict, Iterator
+
+from openskill_sdk import SkillError, allowed_root, run
 
 
 SKILL_ID = "calculator"
 VERSION = "0.1.0"
 
+# Operations computed by the engine
+SUPPORTED_OPS = {
+    "mean",
+    "median",
+    "min",
+    "max",
+    "sum",
+    "variance",
+    "stddev",
+    "percentile",
+    "histogram",
+    "top_k",
+    "approx_percentile",
+}
+
+# Ops that need the second moment tracked by the running statistics
+MOMENT_OPS = {"variance", "stddev"}
+
+# Ops that need every value in memory for an exact answer
+ORDER_OPS = {"median", "percentile"}
+
+# Defaults for op parameters
+DEFAULT_PERCENTILES = [50.0, 90.0, 99.0]
+DEFAULT_BINS = 10
+DEFAULT_TOP_K = 10
+DEFAULT_SKETCH_ERROR = 0.01
+MAX_BINS = 10_000
+MAX_TOP_K = 10_000
+
+# Below this size the NumPy import (tens of ms per process) costs more than it saves
+NUMPY_MIN_SIZE = 10_000
+
+# Values folded into the running statistics per step
+CHUNK_SIZE = 65_536
+
+# File-referenced input (numbers_path)
+SUPPORTED_NUMBER_FORMATS = {"f64", "npy", "text"}
+NUMBER_FILE_EXTENSIONS = {".npy": "npy", ".f64": "f64", ".bin": "f64", ".raw": "f64"}
+NPY_MAGIC = b"\x93NUMPY"
+# Little-endian .npy dtypes readable without NumPy, mapped to array typecodes
+NPY_DTYPES = {"<f8": "d", "<f4": "f", "<i8": "q", "<i4": "i"}
+
+
+def _load_numpy() -> Any:
+    """Import NumPy lazily; returns None when it is not installed."""
+    try:
+        import numpy  # type: ignore
+    except ImportError:
+        return None
+    return numpy
+
+
+class _RunningStats:
+    """
+    One-pass running statistics, mergeable across chunks.
+
+    Each chunk is reduced with C-level builtins and folded in with the
+    Welford/Chan update, so values can be streamed without being kept.
+    The second moment is only tracked when variance/stddev is requested.
+    """
+
+    __slots__ = ("count", "mean", "m2", "total", "minimum", "maximum", "track_m2")
+
+    def __init__(self, track_m2: bool = False) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.track_m2 = track_m2
+
+    def update(self, chunk: list[float]) -> None:
+        n = len(chunk)
+        if n == 0:
+            return
+        chunk_total = math.fsum(chunk)
+        chunk_mean = chunk_total / n
+        combined = self.count + n
+        delta = chunk_mean - self.mean
+        if self.track_m2:
+            chunk_m2 = math.fsum([(x - chunk_mean) ** 2 for x in chunk])
+            self.m2 += chunk_m2 + delta * delta * self.count * n / combined
+        self.mean += delta * n / combined
+        self.count = combined
+        self.total += chunk_total
+        self.minimum = min(self.minimum, min(chunk))
+        self.maximum = max(self.maximum, max(chunk))
+
+    def variance(self) -> float:
+        """Sample variance (n - 1 denominator, 0.0 for a single value)."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+
+class _KLLSketch:
+    """
+    KLL quantile sketch (Karnin, Lang, Liberty 2016).
+
+    Keeps O(k) weighted samples in a stack of compactors; level ``h`` items
+    carry weight ``2**h``. Sketches with the same ``k`` can be merged, so
+    chunks (or files) can be summarized independently.
+    """
+
+    _DECAY = 2.0 / 3.0
+
+    def __init__(self, k: int, seed: int | None = None) -> None:
+        self.k = k
+        self.levels: list[list[float]] = [[]]
+        self._rng = random.Random(seed)
+
+    @classmethod
+    def for_error(cls, rank_error: float) -> "_KLLSketch":
+        """Size the sketch so the normalized rank error stays below ``rank_error``."""
+        # Empirical KLL bound (~99% confidence): eps ~= 2.296 / k**0.9723
+        k = math.ceil((2.296 / rank_error) ** (1 / 0.9723))
+        return cls(max(8, min(k, 65_535)))
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self.levels) - level - 1
+        return max(2, math.ceil(self.k * self._DECAY ** depth))
+
+    def update(self, chunk: list[float]) -> None:
+        self.levels[0].extend(chunk)
+        self._compress()
+
+    def merge(self, other: "_KLLSketch") -> None:
+        while len(self.levels) < len(other.levels):
+            self.levels.append([])
+        for level, items in enumerate(other.levels):
+            self.levels[level].extend(items)
+        self._compress()
+
+    def _compress(self) -> None:
+        while sum(len(items) for items in self.levels) > sum(
+            self._capacity(h) for h in range(len(self.levels))
+        ):
+            for h, items in enumerate(self.levels):
+                if len(items) >= self._capacity(h):
+                    if h + 1 == len(self.levels):
+                        self.levels.append([])
+                    items.sort()
+                    # Odd leftover stays behind; the rest is halved and promoted
+                    keep = [items.pop()] if len(items) % 2 else []
+                    offset = self._rng.randrange(2)
+                    self.levels[h + 1].extend(items[offset::2])
+                    self.levels[h] = keep
+                    break
+
+    def quantiles(self, qs: list[float]) -> list[float]:
+        weighted = sorted(
+            (x, 1 << h) for h, items in enumerate(self.levels) for x in items
+        )
+        if not weighted:
+            return [math.nan for _ in qs]
+        total = sum(w for _, w in weighted)
+        results = []
+        for q in qs:
+            target = q * total
+            acc = 0
+            value = weighted[-1][0]
+            for x, w in weighted:
+                acc += w
+                if acc >= target:
+                    value = x
+                    break
+            results.append(value)
+        return results
+
+
+def _format_p(p: float) -> str:
+    return f"{p:g}"
+
+
+def _select(values: list[float], k: int) -> float:
+    """
+    Return the k-th smallest value (0-based) by quickselect.
+
+    Partitioning with list comprehensions keeps each pass in C, which beats a
+    full ``sorted()`` on large inputs without needing NumPy.
+    """
+    while len(values) > 64:
+        sample = (values[0], values[len(values) // 2], values[-1], values[random.randrange(len(values))])
+        pivot = sorted(sample)[1]
+        lows = [x for x in values if x < pivot]
+        if k < len(lows):
+            values = lows
+            continue
+        highs = [x for x in values if x > pivot]
+        n_pivot = len(values) - len(lows) - len(highs)
+        if k < len(lows) + n_pivot:
+            return pivot
+        k -= len(lows) + n_pivot
+        values = highs
+    return sorted(values)[k]
+
+
+def _median(values: list[float]) -> float:
+    n = len(values)
+    mid = n // 2
+    if n % 2:
+        return _select(values, mid)
+    lower = _select(values, mid - 1)
+    # The upper middle is the smallest value above ``lower`` unless ``lower`` repeats
+    above = [x for x in values if x > lower]
+    upper = lower if n - len(above) > mid else min(above)
+    return (lower + upper) / 2
+
+
+def _percentile_sorted(ordered: list[float], p: float) -> float:
+    """Linear interpolation between closest ranks (NumPy's default method)."""
+    pos = (len(ordered) - 1) * p / 100.0
+    lo = math.floor(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def _histogram_python(
+    chunks: Iterator[list[float]], lo: float, hi: float, bins: int
+) -> Dict[str, Any]:
+    counts = [0] * bins
+    if hi == lo:
+        # Same convention as NumPy for a degenerate range
+        lo, hi = lo - 0.5, hi + 0.5
+    width = (hi - lo) / bins
+    last = bins - 1
+    for chunk in chunks:
+        for x in chunk:
+            i = int((x - lo) / width)
+            counts[i if i < last else last] += 1
+    return {"edges": [lo + width * i for i in range(bins)] + [hi], "counts": counts}
+
+
+def _parse_op_options(payload: Dict[str, Any], ops: list[str]) -> Dict[str, Any]:
+    """Validate parameters for the requested ops."""
+    options: Dict[str, Any] = {}
+
+    if "percentile" in ops or "approx_percentile" in ops:
+        percentiles = payload.get("percentiles")
+        if percentiles is None:
+            percentiles = DEFAULT_PERCENTILES
+        if (
+            not isinstance(percentiles, list)
+            or not percentiles
+            or not all(
+                isinstance(p, (int, float)) and not isinstance(p, bool) and 0 <= p <= 100
+                for p in percentiles
+            )
+        ):
+            raise SkillError(
+                "INVALID_ARGUMENT",
+                'Field "percentiles" must be a non-empty array of numbers between 0 and 100',
+                {"field": "percentiles"},
+            )
+        options["percentiles"] = [float(p) for p in percentiles]
+
+    if "histogram" in ops:
+        bins = payload.get("bins", DEFAULT_BINS)
+        if isinstance(bins, bool) or not isinstance(bins, int) or not 1 <= bins <= MAX_BINS:
+            raise SkillError(
+                "INVALID_ARGUMENT",
+                f'Field "bins" must be an integer between 1 and {MAX_BINS}',
+                {"field": "bins"},
+            )
+        options["bins"] = bins
+
+    if "top_k" in ops:
+        k = payload.get("k", DEFAULT_TOP_K)
+        if isinstance(k, bool) or not isinstance(k, int) or not 1 <= k <= MAX_TOP_K:
+            raise SkillError(
+                "INVALID_ARGUMENT",
+                f'Field "k" must be an integer between 1 and {MAX_TOP_K}',
+                {"field": "k"},
+            )
+        options["k"] = k
+
+    if "approx_percentile" in ops:
+        sketch_error = payload.get("sketch_error", DEFAULT_SKETCH_ERROR)
+        if (
+            isinstance(sketch_error, bool)
+            or not isinstance(sketch_error, (int, float))
+            or not 0.0001 <= sketch_error <= 0.5
+        ):
+            raise SkillError(
+                "INVALID_ARGUMENT",
+                'Field "sketch_error" must be a number between 0.0001 and 0.5',
+                {"field": "sketch_error"},
+            )
+        options["sketch_error"] = float(sketch_error)
 
-def _now_ms() -> int:
-    return int(time.time() * 1000)
+    return options
 
 
-def _make_result(
-    *,
-    success: bool,
-    trace_id: str,
-    data: Dict[str, Any] | None = None,
-    error: Dict[str, Any] | None = None,
-    latency_ms: int | None = None,
-) -> Dict[str, Any]:
-    return {
-        "success": success,
-        "skill_id": SKILL_ID,
-        "trace_id": trace_id,
-        "data": data if success else None,
-        "error": None if success else (error or {"code": "INTERNAL", "message": "Unknown error"}),
-        "meta": {
-            "latency_ms": latency_ms if latency_ms is not None else 0,
-            "version": VERSION,
-        },
-    }
+def _resolve_under_root(path: Any, field: str) -> Path:
+    """Resolve a relative path and ensure it stays under the allowed root."""
+    if not isinstance(path, str) or not path.strip():
+        raise SkillError(
+            "INVALID_ARGUMENT",
+            f'Field "{field}" must be a non-empty string',
+            {"field": field},
+        )
+    if Path(path).is_absolute() or ".." in path:
+        raise SkillError(
+            "FORBIDDEN_PATH",
+            f"Absolute paths and path traversal are not allowed: {path}",
+            {"field": field},
+        )
+    root = allowed_root()
+    resolved = Path(path).resolve()
+    try:
+        resolved.relative_to(root)
+    except ValueError:
+        raise SkillError(
+            "FORBIDDEN_PATH",
+            f"Path is outside allowed root ({root}): {path}",
+            {"field": field},
+        )
+    return resolved
 
 
-def _read_stdin_text() -> str:
-    return sys.stdin.read()
+class _NumberSource(abc.ABC):
+    """
+    Re-iterable, chunked view over the input numbers.
 
+    Sources stream ``CHUNK_SIZE`` floats at a time so file-backed inputs are
+    never fully decoded unless an exact order statistic needs every value.
+    """
 
-def _extract_trace_id_from_input(input_obj: Any) -> Optional[str]:
-    if not isinstance(input_obj, dict):
-        return None
-    for k in ("trace_id", "_trace_id"):
-        v = input_obj.get(k)
-        if isinstance(v, str) and v.strip():
-            return v.strip()
-    return None
+    field = "numbers"
+
+    # Rough element count used to decide whether NumPy is worth importing
+    size_hint = 0
+
+    @abc.abstractmethod
+    def chunks(self) -> Iterator[list[float]]:
+        """Yield the numbers in order, at most ``CHUNK_SIZE`` per list."""
 
+    def materialize(self) -> list[float]:
+        return [x for chunk in self.chunks() for x in chunk]
 
-def _ensure_trace_id(maybe_trace_id: Optional[str]) -> str:
-    return maybe_trace_id if (isinstance(maybe_trace_id, str) and maybe_trace_id.strip()) else str(uuid.uuid4())
+    def to_numpy(self, np: Any) -> Any:
+        return np.fromiter(
+            (x for chunk in self.chunks() for x in chunk), dtype=np.float64
+        )
+
+    def close(self) -> None:
+        pass
 
 
-def _calculate_mean(numbers: list[float]) -> float:
-    """Calculate mean (average)."""
-    return statistics.mean(numbers)
+class _ListSource(_NumberSource):
+    """Numbers passed inline as a JSON array."""
 
+    def __init__(self, numbers: list[Any]) -> None:
+        self.numbers = numbers
+        self.size_hint = len(numbers)
+        self._values: list[float] | None = None
 
-def _calculate_median(numbers: list[float]) -> float:
-    """Calculate median."""
-    return statistics.median(numbers)
+    def materialize(self) -> list[float]:
+        if self._values is None:
+            self._values = list(map(float, self.numbers))
+        return self._values
 
+    def chunks(self) -> Iterator[list[float]]:
+        values = self.materialize()
+        for i in range(0, len(values), CHUNK_SIZE):
+            yield values[i : i + CHUNK_SIZE]
 
-def _calculate_min(numbers: list[float]) -> float:
-    """Calculate minimum."""
-    return min(numbers)
+    def to_numpy(self, np: Any) -> Any:
+        # map(float) keeps the same acceptance rules as the pure-Python path
+        return np.fromiter(map(float, self.numbers), dtype=np.float64, count=len(self.numbers))
 
 
-def _calculate_max(numbers: list[float]) -> float:
-    """Calculate maximum."""
-    return max(numbers)
+class _BinarySource(_NumberSource):
+    """
+    Memory-mapped fixed-width little-endian values (raw float64 or ``.npy``).
 
+    Pages are faulted in as chunks are decoded; nothing is read up front.
+    """
 
-def _calculate_sum(numbers: list[float]) -> float:
-    """Calculate sum."""
-    return sum(numbers)
+    field = "numbers_path"
+
+    def __init__(self, path: Path, typecode: str, dtype: str, offset: int, count: int) -> None:
+        self.path = path
+        self.typecode = typecode
+        self.dtype = dtype
+        self.offset = offset
+        self.count = count
+        self.size_hint = count
+        self.itemsize = array.array(typecode).itemsize
+        self._file = open(path, "rb")
+        self._map = (
+            mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if count else None
+        )
+
+    def chunks(self) -> Iterator[list[float]]:
+        step = CHUNK_SIZE * self.itemsize
+        end = self.offset + self.count * self.itemsize
+        for pos in range(self.offset, end, step):
+            values = array.array(self.typecode)
+            values.frombytes(self._map[pos : min(pos + step, end)])
+            if sys.byteorder != "little":
+                values.byteswap()
+            yield values.tolist() if self.typecode in "df" else list(map(float, values))
+
+    def to_numpy(self, np: Any) -> Any:
+        arr = np.frombuffer(self._map, dtype=self.dtype, count=self.count, offset=self.offset)
+        return arr.astype(np.float64, copy=False)
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+
+class _TextSource(_NumberSource):
+    """Newline-delimited numbers; blank lines are skipped."""
+
+    field = "numbers_path"
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        # ~8 bytes per value is typical for decimal text
+        self.size_hint = path.stat().st_size // 8
+
+    def chunks(self) -> Iterator[list[float]]:
+        chunk: list[float] = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    chunk.append(float(line))
+                except ValueError:
+                    raise ValueError(f"line {line_no}: could not convert {line[:40]!r} to float")
+                if len(chunk) >= CHUNK_SIZE:
+                    yield chunk
+                    chunk = []
+        if chunk:
+            yield chunk
+
+
+def _read_npy_header(path: Path) -> tuple[str, int, int]:
+    """Parse a ``.npy`` header; returns (descr, data offset, element count)."""
+    with open(path, "rb") as f:
+        if f.read(6) != NPY_MAGIC:
+            raise SkillError(
+                "INVALID_ARGUMENT",
+                f"Not a .npy file: {path.name}",
+                {"field": "numbers_path"},
+            )
+        major = f.read(2)[0]
+        header_len_size = 2 if major == 1 else 4
+        header_len = int.from_bytes(f.read(header_len_size), "little")
+        try:
+            header = ast.literal_eval(f.read(header_len).decode("latin1"))
+            descr = header["descr"]
+            shape = header["shape"]
+        except (ValueError, SyntaxError, KeyError, TypeError):
+            raise SkillError(
+                "INVALID_ARGUMENT",
+                f"Malformed .npy header: {path.name}",
+                {"field": "numbers_path"},
+            )
+    count = 1
+    for dim in shape:
+        count *= dim
+    # Element order is irrelevant for these statistics, so any shape/order works
+    return descr, 6 + 2 + header_len_size + header_len, count
+
+
+def _open_number_file(path_value: Any, numbers_format: Any) -> _NumberSource:
+    """Open ``numbers_path`` as a chunked source according to its format."""
+    path = _resolve_under_root(path_value, "numbers_path")
+    if not path.is_file():
+        raise SkillError(
+            "NOT_FOUND",
+            f"numbers_path not found: {path_value}",
+            {"field": "numbers_path"},
+        )
+
+    fmt = numbers_format or "auto"
+    if fmt == "auto":
+        fmt = NUMBER_FILE_EXTENSIONS.get(path.suffix.lower(), "text")
+    if fmt not in SUPPORTED_NUMBER_FORMATS:
+        raise SkillError(
+            "INVALID_ARGUMENT",
+            f"Unsupported numbers_format: {fmt}. Supported: {sorted(SUPPORTED_NUMBER_FORMATS | {'auto'})}",
+            {"field": "numbers_format"},
+        )
+
+    if fmt == "text":
+        return _TextSource(path)
+
+    if fmt == "npy":
+        descr, offset, count = _read_npy_header(path)
+        if descr not in NPY_DTYPES:
+            raise SkillError(
+                "INVALID_ARGUMENT",
+                f"Unsupported .npy dtype: {descr}. Supported: {sorted(NPY_DTYPES)}",
+                {"field": "numbers_path"},
+            )
+        return _BinarySource(path, NPY_DTYPES[descr], descr, offset, count)
+
+    size = path.stat().st_size
+    if size % 8:
+        raise SkillError(
+            "INVALID_ARGUMENT",
+            f"Raw float64 file size ({size} bytes) is not a multiple of 8",
+            {"field": "numbers_path"},
+        )
+    return _BinarySource(path, "d", "<f8", 0, size // 8)
+
+
+def _compute_python(source: _NumberSource, ops: list[str], options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Pure-Python engine.
+
+    One chunked pass feeds the running statistics, the KLL sketch and the
+    top-k heap. Values are only materialized for exact order statistics
+    (a single sort for percentiles, otherwise quickselect for the median),
+    and the histogram takes a second streaming pass once min/max are known.
+    """
+    stats = _RunningStats(track_m2=bool(MOMENT_OPS.intersection(ops)))
+    sketch = _KLLSketch.for_error(options["sketch_error"]) if "approx_percentile" in ops else None
+    top: list[float] = []
+    for chunk in source.chunks():
+        stats.update(chunk)
+        if sketch is not None:
+            sketch.update(chunk)
+        if "top_k" in ops:
+            top = heapq.nlargest(options["k"], itertools.chain(top, chunk))
+
+    if stats.count == 0:
+        raise SkillError(
+            "INVALID_ARGUMENT",
+            f'Field "{source.field}" must contain at least one number',
+            {"field": source.field},
+        )
+
+    values = source.materialize() if ORDER_OPS.intersection(ops) else None
+    ordered = sorted(values) if "percentile" in ops else None
+
+    results: Dict[str, Any] = {}
+    for op in ops:
+        if op == "mean":
+            results["mean"] = stats.mean
+        elif op == "median":
+            results["median"] = _percentile_sorted(ordered, 50.0) if ordered else _median(values)
+        elif op == "min":
+            results["min"] = stats.minimum
+        elif op == "max":
+            results["max"] = stats.maximum
+        elif op == "sum":
+            results["sum"] = stats.total
+        elif op == "variance":
+            results["variance"] = stats.variance()
+        elif op == "stddev":
+            results["stddev"] = math.sqrt(stats.variance())
+        elif op == "percentile":
+            results["percentile"] = {
+                _format_p(p): _percentile_sorted(ordered, p) for p in options["percentiles"]
+            }
+        elif op == "histogram":
+            results["histogram"] = _histogram_python(
+                source.chunks(), stats.minimum, stats.maximum, options["bins"]
+            )
+        elif op == "top_k":
+            results["top_k"] = top
+        elif op == "approx_percentile":
+            qs = [p / 100.0 for p in options["percentiles"]]
+            estimates = sketch.quantiles(qs)
+            # The extremes are tracked exactly, so don't let the sketch blur them
+            estimates = [
+                stats.minimum if q == 0 else stats.maximum if q == 1 else v
+                for q, v in zip(qs, estimates)
+            ]
+            results["approx_percentile"] = {
+                "values": dict(zip(map(_format_p, options["percentiles"]), estimates)),
+                "rank_error": options["sketch_error"],
+                "exact": False,
+            }
+    return results
+
+
+def _compute_numpy(
+    np: Any, arr: Any, ops: list[str], options: Dict[str, Any], field: str = "numbers"
+) -> Dict[str, Any]:
+    """
+    NumPy engine: vectorized reductions, order statistics by selection.
+
+    With the whole array in memory, approximate percentiles are answered
+    exactly (trivially within the requested rank error).
+    """
+    n = arr.size
+    if n == 0:
+        raise SkillError(
+            "INVALID_ARGUMENT",
+            f'Field "{field}" must contain at least one number',
+            {"field": field},
+        )
+    results: Dict[str, Any] = {}
+    total = None
+    for op in ops:
+        if op in ("mean", "sum"):
+            if total is None:
+                total = float(arr.sum())
+            results[op] = total / n if op == "mean" else total
+        elif op == "median":
+            mid = n // 2
+            if n % 2:
+                results["median"] = float(np.partition(arr, mid)[mid])
+            else:
+                part = np.partition(arr, [mid - 1, mid])
+                results["median"] = float((part[mid - 1] + part[mid]) / 2)
+        elif op == "min":
+            results["min"] = float(arr.min())
+        elif op == "max":
+            results["max"] = float(arr.max())
+        elif op in ("variance", "stddev"):
+            variance = float(arr.var(ddof=1)) if n > 1 else 0.0
+            results[op] = variance if op == "variance" else math.sqrt(variance)
+        elif op in ("percentile", "approx_percentile"):
+            values = dict(
+                zip(
+                    map(_format_p, options["percentiles"]),
+                    np.percentile(arr, options["percentiles"]).tolist(),
+                )
+            )
+            if op == "percentile":
+                results["percentile"] = values
+            else:
+                results["approx_percentile"] = {
+                    "values": values,
+                    "rank_error": options["sketch_error"],
+                    "exact": True,
+                }
+        elif op == "histogram":
+            counts, edges = np.histogram(arr, bins=options["bins"])
+            results["histogram"] = {"edges": edges.tolist(), "counts": counts.tolist()}
+        elif op == "top_k":
+            k = min(options["k"], n)
+            top = np.partition(arr, n - k)[n - k :]
+            results["top_k"] = np.sort(top)[::-1].tolist()
+    return results
+
+
+def _compute(source: _NumberSource, ops: list[str], options: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Compute all requested operations.
+
+    Raises:
+        ValueError, TypeError: If the source contains non-numeric values
+        SkillError: If the source contains no values
+    """
+    np = _load_numpy() if source.size_hint >= NUMPY_MIN_SIZE else None
+    if np is not None:
+        return _compute_numpy(np, source.to_numpy(np), ops, options, source.field)
+    return _compute_python(source, ops, options)
 
 
 def _compare_values(compare: Dict[str, float]) -> Dict[str, Any]:
@@ -99,196 +697,79 @@ def _compare_values(compare: Dict[str, float]) -> Dict[str, Any]:
     }
 
 
-def main() -> int:
-    start = _now_ms()
-    trace_id: Optional[str] = None
+def handle(payload: Dict[str, Any]) -> Dict[str, Any]:
+    # Validate numbers (inline array or file reference, exactly one)
+    numbers = payload.get("numbers")
+    numbers_path = payload.get("numbers_path")
+    if numbers_path is not None and numbers is not None:
+        raise SkillError(
+            "INVALID_ARGUMENT",
+            'Fields "numbers" and "numbers_path" are mutually exclusive',
+            {"field": "numbers_path"},
+        )
 
-    try:
-        raw = _read_stdin_text()
-        if not raw.strip():
-            trace_id = _ensure_trace_id(None)
-            latency = _now_ms() - start
-            result = _make_result(
-                success=False,
-                trace_id=trace_id,
-                error={"code": "INVALID_ARGUMENT", "message": "Empty stdin"},
-                latency_ms=latency,
-            )
-            sys.stdout.write(json.dumps(result, ensure_ascii=False))
-            return 1
+    if numbers_path is None and (not isinstance(numbers, list) or len(numbers) == 0):
+        raise SkillError(
+            "INVALID_ARGUMENT",
+            'Field "numbers" is required and must be a non-empty array (or use "numbers_path")',
+            {"field": "numbers"},
+        )
 
-        try:
-            req = json.loads(raw)
-        except json.JSONDecodeError as e:
-            trace_id = _ensure_trace_id(None)
-            latency = _now_ms() - start
-            result = _make_result(
-                success=False,
-                trace_id=trace_id,
-                error={
-                    "code": "INVALID_JSON",
-                    "message": "Failed to parse stdin as JSON",
-                    "details": {"pos": e.pos, "lineno": e.lineno, "colno": e.colno},
-                },
-                latency_ms=latency,
-            )
-            sys.stdout.write(json.dumps(result, ensure_ascii=False))
-            return 2
-
-        if not isinstance(req, dict):
-            trace_id = _ensure_trace_id(None)
-            latency = _now_ms() - start
-            result = _make_result(
-                success=False,
-                trace_id=trace_id,
-                error={"code": "INVALID_ARGUMENT", "message": "stdin JSON must be an object"},
-                latency_ms=latency,
-            )
-            sys.stdout.write(json.dumps(result, ensure_ascii=False))
-            return 1
-
-        payload = req.get("input")
-        trace_id = _ensure_trace_id(_extract_trace_id_from_input(payload))
-
-        if not isinstance(payload, dict):
-            latency = _now_ms() - start
-            result = _make_result(
-                success=False,
-                trace_id=trace_id,
-                error={"code": "INVALID_ARGUMENT", "message": 'Missing or invalid "input" object'},
-                latency_ms=latency,
-            )
-            sys.stdout.write(json.dumps(result, ensure_ascii=False))
-            return 1
-
-        # Validate numbers
-        numbers = payload.get("numbers")
-        if not isinstance(numbers, list) or len(numbers) == 0:
-            latency = _now_ms() - start
-            result = _make_result(
-                success=False,
-                trace_id=trace_id,
-                error={
-                    "code": "INVALID_ARGUMENT",
-                    "message": 'Field "numbers" is required and must be a non-empty array',
-                    "details": {"field": "numbers"},
-                },
-                latency_ms=latency,
-            )
-            sys.stdout.write(json.dumps(result, ensure_ascii=False))
-            return 1
+    # Validate ops
+    ops = payload.get("ops")
+    if not isinstance(ops, list) or len(ops) == 0:
+        raise SkillError(
+            "INVALID_ARGUMENT",
+            'Field "ops" is required and must be a non-empty array',
+            {"field": "ops"},
+        )
 
-        # Convert to float and validate
-        try:
-            numbers_float = [float(n) for n in numbers]
-        except (ValueError, TypeError) as e:
-            latency = _now_ms() - start
-            result = _make_result(
-                success=False,
-                trace_id=trace_id,
-                error={
-                    "code": "INVALID_ARGUMENT",
-                    "message": 'Field "numbers" must contain only numeric values',
-                    "details": {"field": "numbers", "error": str(e)},
-                },
-                latency_ms=latency,
-            )
-            sys.stdout.write(json.dumps(result, ensure_ascii=False))
-            return 1
-
-        # Validate ops
-        ops = payload.get("ops")
-        if not isinstance(ops, list) or len(ops) == 0:
-            latency = _now_ms() - start
-            result = _make_result(
-                success=False,
-                trace_id=trace_id,
-                error={
-                    "code": "INVALID_ARGUMENT",
-                    "message": 'Field "ops" is required and must be a non-empty array',
-                    "details": {"field": "ops"},
-                },
-                latency_ms=latency,
-            )
-            sys.stdout.write(json.dumps(result, ensure_ascii=False))
-            return 1
-
-        # Supported operations
-        supported_ops = {"mean", "median", "min", "max", "sum"}
-        invalid_ops = [op for op in ops if op not in supported_ops]
-        if invalid_ops:
-            latency = _now_ms() - start
-            result = _make_result(
-                success=False,
-                trace_id=trace_id,
-                error={
-                    "code": "INVALID_ARGUMENT",
-                    "message": f'Unsupported operations: {invalid_ops}. Supported: {sorted(supported_ops)}',
-                    "details": {"field": "ops", "invalid_ops": invalid_ops},
-                },
-                latency_ms=latency,
-            )
-            sys.stdout.write(json.dumps(result, ensure_ascii=False))
-            return 1
-
-        # Perform calculations
-        results = {}
-        for op in ops:
-            if op == "mean":
-                results["mean"] = _calculate_mean(numbers_float)
-            elif op == "median":
-                results["median"] = _calculate_median(numbers_float)
-            elif op == "min":
-                results["min"] = _calculate_min(numbers_float)
-            elif op == "max":
-                results["max"] = _calculate_max(numbers_float)
-            elif op == "sum":
-                results["sum"] = _calculate_sum(numbers_float)
-
-        # Handle comparison if provided
-        comparison = None
-        compare = payload.get("compare")
-        if compare is not None:
-            if isinstance(compare, dict):
-                try:
-                    compare_float = {k: float(v) for k, v in compare.items()}
-                    comparison = _compare_values(compare_float)
-                except (ValueError, TypeError):
-                    # Invalid comparison values, skip
-                    pass
-
-        # Build response data
-        data: Dict[str, Any] = {"results": results}
-        if comparison:
-            data["comparison"] = comparison
-
-        latency = _now_ms() - start
-        result = _make_result(
-            success=True,
-            trace_id=trace_id,
-            data=data,
-            latency_ms=latency,
+    # Supported operations
+    invalid_ops = [op for op in ops if op not in SUPPORTED_OPS]
+    if invalid_ops:
+        raise SkillError(
+            "INVALID_ARGUMENT",
+            f'Unsupported operations: {invalid_ops}. Supported: {sorted(SUPPORTED_OPS)}',
+            {"field": "ops", "invalid_ops": invalid_ops},
         )
-        sys.stdout.write(json.dumps(result, ensure_ascii=False))
-        return 0
-
-    except Exception as e:
-        trace_id = _ensure_trace_id(trace_id)
-        latency = _now_ms() - start
-        result = _make_result(
-            success=False,
-            trace_id=trace_id,
-            error={
-                "code": "INTERNAL",
-                "message": "Unhandled error in calculator skill",
-                "details": {"exception": type(e).__name__, "reason": str(e)},
-            },
-            latency_ms=latency,
+
+    # Validate op parameters and open the number source
+    op_options = _parse_op_options(payload, ops)
+    if numbers_path is not None:
+        source = _open_number_file(numbers_path, payload.get("numbers_format"))
+    else:
+        source = _ListSource(numbers)
+
+    # Convert to float and perform all calculations
+    try:
+        results = _compute(source, ops, op_options)
+    except (ValueError, TypeError) as e:
+        raise SkillError(
+            "INVALID_ARGUMENT",
+            f'Field "{source.field}" must contain only numeric values',
+            {"field": source.field, "error": str(e)},
         )
-        sys.stdout.write(json.dumps(result, ensure_ascii=False))
-        return 3
+    finally:
+        source.close()
+
+    # Handle comparison if provided
+    comparison = None
+    compare = payload.get("compare")
+    if compare is not None:
+        if isinstance(compare, dict):
+            try:
+                compare_float = {k: float(v) for k, v in compare.items()}
+                comparison = _compare_values(compare_float)
+            except (ValueError, TypeError):
+                # Invalid comparison values, skip
+                pass
+
+    # Build response data
+    data: Dict[str, Any] = {"results": results}
+    if comparison:
+        data["comparison"] = comparison
+    return data
 
 
 if __name__ == "__main__":
-    raise SystemExit(main())
-
+    raise SystemExit(run(SKILL_ID, handle, VERSION))
@@ -0,0 +1,616 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import base64
+import contextlib
+import csv
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    fcntl = None  # type: ignore
+
+from openskill_sdk import SkillError, allowed_root, run
+
+
+SKILL_ID = "log_transform"
+VERSION = "0.1.0"
+
+DEFAULT_TIMESTAMP_REGEX = r"^(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?)"
+DEFAULT_LEVEL_REGEX = r"\b(TRACE|DEBUG|INFO|NOTICE|WARN|WARNING|ERROR|CRITICAL|FATAL)\b"
+
+# Fixed columns produced for text input (jsonl input keeps its own keys)
+TEXT_FIELDS = ["line", "timestamp", "level", "message"]
+
+SUPPORTED_INPUT_FORMATS = {"text", "jsonl"}
+SUPPORTED_OUTPUTS = {"stdout", "file"}
+SUPPORTED_OUTPUT_FORMATS = {"jsonl", "csv", "arrow", "parquet"}
+SUPPORTED_COMPRESSIONS = {"none", "gzip", "zstd"}
+SUPPORTED_MODES = {"full", "incremental"}
+
+# Incremental mode checkpoint state (stored under the allowed root)
+DEFAULT_STATE_FILE = ".log_transform_state.json"
+CHECKPOINT_VERSION = 1
+# Leading bytes hashed to detect a file rewritten under the same inode
+CHECKPOINT_HEAD_BYTES = 256
+
+# Rows per Arrow record batch when writing columnar output
+ARROW_BATCH_SIZE = 8192
+
+
+def _resolve_under_root(path: Any, field: str) -> Path:
+    """Resolve a relative path and ensure it stays under the allowed root."""
+    if not isinstance(path, str) or not path.strip():
+        raise SkillError(
+            "INVALID_ARGUMENT",
+            f'Field "{field}" is required and must be a non-empty string',
+            {"field": field},
+        )
+    if Path(path).is_absolute() or ".." in path:
+        raise SkillError(
+            "FORBIDDEN_PATH",
+            f"Absolute paths and path traversal are not allowed: {path}",
+            {"field": field},
+        )
+    root = allowed_root()
+    resolved = Path(path).resolve()
+    try:
+        resolved.relative_to(root)
+    except ValueError:
+        raise SkillError(
+            "FORBIDDEN_PATH",
+            f"Path is outside allowed root ({root}): {path}",
+            {"field": field},
+        )
+    return resolved
+
+
+def _compile_rules(rules: Any) -> Dict[str, Any]:
+    """Validate and compile transformation rules."""
+    if rules is None:
+        rules = {}
+    if not isinstance(rules, dict):
+        raise SkillError("INVALID_ARGUMENT", 'Field "rules" must be an object', {"field": "rules"})
+
+    try:
+        timestamp_re = re.compile(rules.get("timestamp_regex") or DEFAULT_TIMESTAMP_REGEX)
+        level_re = re.compile(rules.get("level_regex") or DEFAULT_LEVEL_REGEX)
+    except re.error as e:
+        raise SkillError(
+            "INVALID_ARGUMENT",
+            f"Invalid regular expression in rules: {e}",
+            {"field": "rules"},
+        )
+
+    level_map = rules.get("level_map") or {}
+    if not isinstance(level_map, dict):
+        raise SkillError(
+            "INVALID_ARGUMENT",
+            'Field "rules.level_map" must be an object',
+            {"field": "rules.level_map"},
+        )
+
+    return {
+        "timestamp_re": timestamp_re,
+        "level_re": level_re,
+        "level_map": {str(k).upper(): v for k, v in level_map.items()},
+    }
+
+
+def _parse_text_line(line_no: int, line: str, rules: Dict[str, Any]) -> Dict[str, Any]:
+    timestamp = None
+    message = line
+    m = rules["timestamp_re"].search(line)
+    if m:
+        timestamp = m.group(1) if m.groups() else m.group(0)
+        message = (line[: m.start()] + line[m.end():]).strip()
+
+    level = None
+    m = rules["level_re"].search(message)
+    if m:
+        level = m.group(1) if m.groups() else m.group(0)
+        level = rules["level_map"].get(level.upper(), level.upper())
+
+    return {"line": line_no, "timestamp": timestamp, "level": level, "message": message}
+
+
+def _parse_jsonl_line(line_no: int, line: str, rules: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        obj = json.loads(line)
+    except json.JSONDecodeError as e:
+        raise SkillError(
+            "INVALID_JSON",
+            f"Failed to parse line {line_no} as JSON",
+            {"line": line_no, "pos": e.pos},
+        )
+    if not isinstance(obj, dict):
+        obj = {"value": obj}
+    level = obj.get("level")
+    if isinstance(level, str):
+        obj["level"] = rules["level_map"].get(level.upper(), level)
+    return obj
+
+
+def _iter_records(
+    source: io.BufferedReader,
+    input_format: str,
+    rules: Dict[str, Any],
+    limit: int,
+    stats: Dict[str, Any],
+    follow: bool = False,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream records from a log file positioned at ``stats["offset"]``.
+
+    ``stats`` is updated as lines are consumed: ``offset`` is the file position
+    after the last consumed byte, ``carry`` the incomplete trailing line held
+    back in follow mode, and ``line`` the last line number. A line that would
+    exceed ``limit`` is left unconsumed so the next call starts on it.
+    """
+    parse = _parse_jsonl_line if input_format == "jsonl" else _parse_text_line
+    produced = 0
+    for raw_line in source:
+        if follow and not raw_line.endswith(b"\n"):
+            # Writer is mid-line: keep the fragment until the newline arrives
+            stats["carry"] += raw_line
+            stats["offset"] += len(raw_line)
+            stats["bytes_read"] += len(raw_line)
+            return
+        if limit and produced >= limit:
+            stats["truncated"] = 1
+            return
+        full_line = stats["carry"] + raw_line
+        stats["carry"] = b""
+        stats["offset"] += len(raw_line)
+        stats["bytes_read"] += len(raw_line)
+        stats["line"] += 1
+        line = full_line.decode("utf-8", errors="replace").rstrip("\r\n")
+        if not line.strip():
+            continue
+        yield parse(stats["line"], line, rules)
+        produced += 1
+
+
+def _open_compressed(path: Path, compression: str) -> io.TextIOWrapper:
+    """Open a writable (optionally compressed) text stream for the given path."""
+    if compression == "gzip":
+        raw = gzip.open(path, "wb")
+    elif compression == "zstd":
+        try:
+            import zstandard  # type: ignore
+        except ImportError:
+            raise SkillError(
+                "INVALID_ARGUMENT",
+                "zstd compression requires the zstandard package",
+                {"field": "compression"},
+            )
+        raw = zstandard.ZstdCompressor().stream_writer(open(path, "wb"), closefd=True)
+    else:
+        raw = open(path, "wb")
+    return io.TextIOWrapper(raw, encoding="utf-8", newline="")
+
+
+def _write_jsonl(records: Iterator[Dict[str, Any]], path: Path, compression: str) -> int:
+    count = 0
+    with _open_compressed(path, compression) as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write("\n")
+            count += 1
+    return count
+
+
+def _write_csv(
+    records: Iterator[Dict[str, Any]], path: Path, compression: str, input_format: str
+) -> int:
+    if input_format == "text":
+        # Fixed schema: stream straight through
+        fieldnames: List[str] = TEXT_FIELDS
+        rows: Any = records
+    else:
+        # Heterogeneous JSON objects: collect the key union first
+        rows = list(records)
+        fieldnames = []
+        seen = set()
+        for row in rows:
+            for key in row:
+                if key not in seen:
+                    seen.add(key)
+                    fieldnames.append(key)
+
+    count = 0
+    with _open_compressed(path, compression) as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow(
+                {
+                    k: json.dumps(v, ensure_ascii=False) if isinstance(v, (dict, list)) else v
+                    for k, v in row.items()
+                }
+            )
+            count += 1
+    return count
+
+
+def _write_arrow(
+    records: Iterator[Dict[str, Any]], path: Path, output_format: str, input_format: str
+) -> int:
+    try:
+        import pyarrow as pa  # type: ignore
+    except ImportError:
+        raise SkillError(
+            "INVALID_ARGUMENT",
+            f'output_format "{output_format}" requires the pyarrow package',
+            {"field": "output_format"},
+        )
+
+    if input_format == "text":
+        schema = pa.schema(
+            [
+                ("line", pa.int64()),
+                ("timestamp", pa.string()),
+                ("level", pa.string()),
+                ("message", pa.string()),
+            ]
+        )
+    else:
+        # Infer a single schema over all rows so batches never disagree
+        rows = list(records)
+        schema = pa.Table.from_pylist(rows).schema if rows else pa.schema([])
+        records = iter(rows)
+
+    if output_format == "parquet":
+        import pyarrow.parquet as pq  # type: ignore
+
+        writer = pq.ParquetWriter(str(path), schema)
+    else:
+        writer = pa.ipc.new_file(str(path), schema)
+
+    count = 0
+    try:
+        batch: List[Dict[str, Any]] = []
+        for record in records:
+            batch.append(record)
+            if len(batch) >= ARROW_BATCH_SIZE:
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+                count += len(batch)
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist(batch, schema=schema))
+            count += len(batch)
+    finally:
+        writer.close()
+    return count
+
+
+def _current_umask() -> int:
+    """
+    The process umask, read without changing it.
+
+    ``os.umask`` can only be read by setting it, which races with files
+    created by other threads (in-process skills share the host process).
+    """
+    try:
+        with open("/proc/self/status", encoding="ascii") as status:
+            for line in status:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    return 0o022
+
+
+def _write_file_sink(
+    records: Iterator[Dict[str, Any]],
+    output_path: Path,
+    display_path: str,
+    output_format: str,
+    compression: str,
+    input_format: str,
+) -> Dict[str, Any]:
+    """Write records to ``output_path`` atomically and return sink stats."""
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    # Write next to the destination, then rename, so readers never see partial files
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{output_path.name}.", dir=output_path.parent)
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    # mkstemp creates 0600 files; use the regular umask-derived mode instead
+    os.chmod(tmp_path, 0o666 & ~_current_umask())
+    try:
+        if output_format == "jsonl":
+            count = _write_jsonl(records, tmp_path, compression)
+        elif output_format == "csv":
+            count = _write_csv(records, tmp_path, compression, input_format)
+        else:
+            count = _write_arrow(records, tmp_path, output_format, input_format)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    return {
+        "path": display_path,
+        "format": output_format,
+        "compression": compression,
+        "records": count,
+        "bytes_written": output_path.stat().st_size,
+    }
+
+
+def _parse_options(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate input fields and return normalized options."""
+    input_format = payload.get("format") or "text"
+    if input_format not in SUPPORTED_INPUT_FORMATS:
+        raise SkillError(
+            "INVALID_ARGUMENT",
+            f"Unsupported format: {input_format}. Supported: {sorted(SUPPORTED_INPUT_FORMATS)}",
+            {"field": "format"},
+        )
+
+    output = payload.get("output") or "stdout"
+    if output not in SUPPORTED_OUTPUTS:
+        raise SkillError(
+            "INVALID_ARGUMENT",
+            f"Unsupported output: {output}. Supported: {sorted(SUPPORTED_OUTPUTS)}",
+            {"field": "output"},
+        )
+
+    limit = payload.get("limit", 200)
+    if limit is None:
+        limit = 0
+    if isinstance(limit, bool) or not isinstance(limit, int) or limit < 0:
+        raise SkillError(
+            "INVALID_ARGUMENT",
+            'Field "limit" must be a non-negative integer (0 means no limit)',
+            {"field": "limit"},
+        )
+
+    mode = payload.get("mode") or "full"
+    if mode not in SUPPORTED_MODES:
+        raise SkillError(
+            "INVALID_ARGUMENT",
+            f"Unsupported mode: {mode}. Supported: {sorted(SUPPORTED_MODES)}",
+            {"field": "mode"},
+        )
+
+    options: Dict[str, Any] = {
+        "input_path": _resolve_under_root(payload.get("input_path"), "input_path"),
+        "format": input_format,
+        "output": output,
+        "limit": limit,
+        "mode": mode,
+        "rules": _compile_rules(payload.get("rules")),
+    }
+
+    if mode == "incremental":
+        state_path = payload.get("state_path")
+        if state_path is None:
+            options["state_path"] = allowed_root() / DEFAULT_STATE_FILE
+        else:
+            options["state_path"] = _resolve_under_root(state_path, "state_path")
+
+    if output == "file":
+        output_format = payload.get("output_format") or "jsonl"
+        if output_format not in SUPPORTED_OUTPUT_FORMATS:
+            raise SkillError(
+                "INVALID_ARGUMENT",
+                f"Unsupported output_format: {output_format}. Supported: {sorted(SUPPORTED_OUTPUT_FORMATS)}",
+                {"field": "output_format"},
+            )
+        compression = payload.get("compression") or "none"
+        if compression not in SUPPORTED_COMPRESSIONS:
+            raise SkillError(
+                "INVALID_ARGUMENT",
+                f"Unsupported compression: {compression}. Supported: {sorted(SUPPORTED_COMPRESSIONS)}",
+                {"field": "compression"},
+            )
+        if output_format in ("arrow", "parquet") and compression != "none":
+            raise SkillError(
+                "INVALID_ARGUMENT",
+                f'compression is not supported for output_format "{output_format}"',
+                {"field": "compression"},
+            )
+        output_path = _resolve_under_root(payload.get("output_path"), "output_path")
+        if output_path == options["input_path"]:
+            raise SkillError(
+                "INVALID_ARGUMENT",
+                "output_path must differ from input_path",
+                {"field": "output_path"},
+            )
+        options.update(
+            output_format=output_format,
+            compression=compression,
+            output_path=output_path,
+            output_path_raw=payload["output_path"],
+        )
+
+    return options
+
+
+def _file_identity(source: io.BufferedReader) -> Dict[str, Any]:
+    """Identify the open file by device/inode plus a hash of its first bytes."""
+    st = os.fstat(source.fileno())
+    head = os.pread(source.fileno(), CHECKPOINT_HEAD_BYTES, 0)
+    return {
+        "dev": st.st_dev,
+        "inode": st.st_ino,
+        "size": st.st_size,
+        "head_len": len(head),
+        "head": hashlib.sha1(head).hexdigest(),
+    }
+
+
+def _resume_position(
+    source: io.BufferedReader, identity: Dict[str, Any], checkpoint: Dict[str, Any] | None
+) -> tuple[Dict[str, Any], Optional[str]]:
+    """
+    Decide where to resume reading.
+
+    Returns the starting cursor and the reason it was reset, if any:
+    ``rotated`` when the path now points at a different file (new inode or
+    rewritten head), ``truncated`` when the file shrank below the checkpoint.
+    """
+    fresh = {"offset": 0, "carry": b"", "line": 0}
+    if not checkpoint:
+        return fresh, None
+
+    if checkpoint.get("dev") != identity["dev"] or checkpoint.get("inode") != identity["inode"]:
+        return fresh, "rotated"
+
+    offset = int(checkpoint.get("offset", 0))
+    if identity["size"] < offset:
+        return fresh, "truncated"
+
+    # Same inode rewritten in place (e.g. copytruncate followed by new writes)
+    head_len = int(checkpoint.get("head_len", 0))
+    if head_len:
+        head = os.pread(source.fileno(), head_len, 0)
+        if hashlib.sha1(head).hexdigest() != checkpoint.get("head"):
+            return fresh, "rotated"
+
+    return {
+        "offset": offset,
+        "carry": base64.b64decode(checkpoint.get("carry", "")),
+        "line": int(checkpoint.get("line", 0)),
+    }, None
+
+
+@contextlib.contextmanager
+def _locked_state(state_path: Path) -> Iterator[Dict[str, Any]]:
+    """
+    Load the checkpoint state under an exclusive lock and yield it.
+
+    The lock is held for the whole transform so concurrent calls on the same
+    state file cannot hand out the same records twice. Callers persist
+    changes with ``_save_state`` before leaving the block.
+    """
+    state_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(state_path.with_name(state_path.name + ".lock"), "a+b") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        state: Dict[str, Any] = {"version": CHECKPOINT_VERSION, "files": {}}
+        if state_path.is_file():
+            try:
+                with open(state_path, "r", encoding="utf-8") as f:
+                    loaded = json.load(f)
+                if isinstance(loaded, dict) and loaded.get("version") == CHECKPOINT_VERSION:
+                    state = loaded
+            except (OSError, json.JSONDecodeError):
+                # A corrupt state file only costs a full re-read
+                pass
+        yield state
+
+
+def _save_state(state_path: Path, state: Dict[str, Any]) -> None:
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{state_path.name}.", dir=state_path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(tmp_name, state_path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def _emit(records: Iterator[Dict[str, Any]], options: Dict[str, Any]) -> Dict[str, Any]:
+    """Send records to the configured destination and return the response data."""
+    if options["output"] == "file":
+        sink = _write_file_sink(
+            records,
+            options["output_path"],
+            options["output_path_raw"],
+            options["output_format"],
+            options["compression"],
+            options["format"],
+        )
+        return {"output": sink, "count": sink["records"]}
+
+    collected = list(records)
+    return {"records": collected, "count": len(collected)}
+
+
+def _transform(options: Dict[str, Any]) -> Dict[str, Any]:
+    input_path: Path = options["input_path"]
+    if not input_path.is_file():
+        raise SkillError(
+            "NOT_FOUND",
+            f"Input file not found: {input_path}",
+            {"field": "input_path"},
+        )
+
+    if options["mode"] == "incremental":
+        return _transform_incremental(options)
+
+    stats: Dict[str, Any] = {"bytes_read": 0, "truncated": 0, "offset": 0, "carry": b"", "line": 0}
+    with open(input_path, "rb") as source:
+        records = _iter_records(
+            source, options["format"], options["rules"], options["limit"], stats
+        )
+        data = _emit(records, options)
+    data.update(bytes_read=stats["bytes_read"], truncated=bool(stats["truncated"]))
+    return data
+
+
+def _transform_incremental(options: Dict[str, Any]) -> Dict[str, Any]:
+    """Return only records appended since the last checkpoint for this file."""
+    input_path: Path = options["input_path"]
+    state_path: Path = options["state_path"]
+    key = str(input_path)
+
+    with _locked_state(state_path) as state:
+        with open(input_path, "rb") as source:
+            identity = _file_identity(source)
+            checkpoint = state["files"].get(key)
+            cursor, reset_reason = _resume_position(source, identity, checkpoint)
+            previous_offset = cursor["offset"]
+
+            stats: Dict[str, Any] = {"bytes_read": 0, "truncated": 0, **cursor}
+            source.seek(cursor["offset"])
+            records = _iter_records(
+                source, options["format"], options["rules"], options["limit"], stats, follow=True
+            )
+            data = _emit(records, options)
+
+        # Only advance once the records were delivered
+        state["files"][key] = {
+            "dev": identity["dev"],
+            "inode": identity["inode"],
+            "head_len": identity["head_len"],
+            "head": identity["head"],
+            "offset": stats["offset"],
+            "carry": base64.b64encode(stats["carry"]).decode("ascii"),
+            "line": stats["line"],
+            "updated_at": int(time.time()),
+        }
+        _save_state(state_path, state)
+
+    data.update(
+        bytes_read=stats["bytes_read"],
+        truncated=bool(stats["truncated"]),
+        checkpoint={
+            "previous_offset": previous_offset,
+            "offset": stats["offset"],
+            "pending_bytes": len(stats["carry"]),
+            "reset": reset_reason,
+        },
+    )
+    return data
+
+
+def handle(payload: Dict[str, Any]) -> Dict[str, Any]:
+    return _transform(_parse_options(payload))
+
+
+if __name__ == "__main__":
+    raise SystemExit(run(SKILL_ID, handle, VERSION))
@@ -0,0 +1,462 @@
+#!/usr/bin/env python3
+"""
+Shared runtime for skill_cli scripts.
+
+A skill implements ``handle(input) -> data`` (raising ``SkillError`` for
+expected failures) and hands it to ``run``::
+
+    from openskill_sdk import SkillError, run
+
+    def handle(payload):
+        ...
+        return {"answer": 42}
+
+    if __name__ == "__main__":
+        raise SystemExit(run("my_skill", handle, version="0.1.0"))
+
+The SDK builds the result envelope (trace_id, timing, error mapping) and
+provides every transport the host can use:
+
+- one-shot (no arguments): one request on stdin, one envelope on stdout;
+  large payloads may come and go through memfds the host passes in
+  (``OPENSKILL_INPUT_FD`` / ``OPENSKILL_OUTPUT_FD``)
+- ``--loop``: persistent worker speaking length-prefixed frames on
+  stdin/stdout, for pooled runners; frames are JSON or, when both sides
+  have it, msgpack (negotiated in the ready frame)
+- ``--forkserver``: like ``--loop``, but each request runs in a forked
+  child of the warm worker (isolation and per-request resource limits)
+- in-process: the host imports the module and calls ``invoke``
+
+Only the standard library is required; orjson and msgpack are used when
+installed.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import uuid
+from pathlib import Path
+from typing import Any, BinaryIO, Callable, Dict, Optional
+
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack  # type: ignore
+except ImportError:
+    msgpack = None
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-POSIX platforms
+    resource = None  # type: ignore
+
+Handler = Callable[[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+# Frame header: payload length, unsigned 32-bit big-endian
+FRAME_HEADER = struct.Struct(">I")
+
+# Exit codes of the one-shot transport
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_INVALID_JSON = 2
+EXIT_INTERNAL = 3
+
+# Allowed root for the request being handled (set by the host per call in
+# in-process mode; otherwise taken from the environment)
+_allowed_root_ctx: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "openskill_allowed_root", default=None
+)
+
+
+class SkillError(Exception):
+    """Error that maps directly onto a result envelope error."""
+
+    def __init__(self, code: str, message: str, details: Dict[str, Any] | None = None):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+        self.details = details
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode as UTF-8 JSON (orjson when available)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+        except TypeError:
+            pass
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: bytes | str | memoryview) -> Any:
+    """Decode JSON (orjson when available)."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _msgpack_default(obj: Any) -> Any:
+    # numpy scalars and arrays (orjson handles them natively)
+    if hasattr(obj, "tolist"):
+        return obj.tolist()
+    raise TypeError(f"Object of type {type(obj).__name__} is not msgpack serializable")
+
+
+def _msgpack_dumps(obj: Any) -> bytes:
+    return msgpack.packb(obj, use_bin_type=True, default=_msgpack_default)
+
+
+def _msgpack_loads(data: bytes) -> Any:
+    return msgpack.unpackb(data, raw=False)
+
+
+def allowed_root() -> Path:
+    """Allowed root as passed down by the host (defaults to ./data)."""
+    root = _allowed_root_ctx.get() or os.environ.get("OPENSKILL_ALLOWED_ROOT", "./data")
+    return Path(root).resolve()
+
+
+def _trace_id(request: Dict[str, Any], payload: Any) -> str:
+    candidates = [request.get("trace_id")]
+    if isinstance(payload, dict):
+        candidates += [payload.get("trace_id"), payload.get("_trace_id")]
+    for value in candidates:
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return str(uuid.uuid4())
+
+
+def _envelope(
+    skill_id: str,
+    version: str,
+    trace_id: str,
+    start: float,
+    data: Dict[str, Any] | None = None,
+    error: Dict[str, Any] | None = None,
+) -> Dict[str, Any]:
+    return {
+        "success": error is None,
+        "skill_id": skill_id,
+        "trace_id": trace_id,
+        "data": data if error is None else None,
+        "error": error,
+        "meta": {
+            "latency_ms": int((time.perf_counter() - start) * 1000),
+            "version": version,
+        },
+    }
+
+
+def invoke(
+    handle: Handler,
+    request: Any,
+    *,
+    skill_id: str,
+    version: str = "0.1.0",
+    allowed_root: str | None = None,
+) -> Dict[str, Any]:
+    """
+    Run ``handle`` on one decoded request and build its envelope.
+
+    Never raises: expected failures (``SkillError``) and unexpected
+    exceptions both become error envelopes.
+
+    Args:
+        handle: The skill's handler
+        request: Decoded request, ``{"input": {...}, "trace_id": ...}``
+        skill_id: Skill ID for the envelope
+        version: Skill version for the envelope
+        allowed_root: Overrides OPENSKILL_ALLOWED_ROOT for this call
+
+    Returns:
+        The result envelope
+    """
+    start = time.perf_counter()
+    if not isinstance(request, dict):
+        return _envelope(
+            skill_id, version, str(uuid.uuid4()), start,
+            error={"code": "INVALID_ARGUMENT", "message": "stdin JSON must be an object"},
+        )
+    payload = request.get("input")
+    trace_id = _trace_id(request, payload)
+    if not isinstance(payload, dict):
+        return _envelope(
+            skill_id, version, trace_id, start,
+            error={"code": "INVALID_ARGUMENT", "message": 'Missing or invalid "input" object'},
+        )
+
+    token = _allowed_root_ctx.set(allowed_root) if allowed_root else None
+    try:
+        data = handle(payload)
+    except SkillError as e:
+        error: Dict[str, Any] = {"code": e.code, "message": e.message}
+        if e.details is not None:
+            error["details"] = e.details
+        return _envelope(skill_id, version, trace_id, start, error=error)
+    except Exception as e:
+        return _envelope(
+            skill_id, version, trace_id, start,
+            error={
+                "code": "INTERNAL",
+                "message": f"Unhandled error in {skill_id} skill",
+                "details": {"exception": type(e).__name__, "reason": str(e)},
+            },
+        )
+    finally:
+        if token is not None:
+            _allowed_root_ctx.reset(token)
+    return _envelope(skill_id, version, trace_id, start, data=data if data is not None else {})
+
+
+def _read_input() -> bytes | mmap.mmap:
+    """The request: a read-only map of the host's input memfd, else stdin."""
+    fd = os.environ.get("OPENSKILL_INPUT_FD")
+    if fd is None:
+        return sys.stdin.buffer.read()
+    size = os.fstat(int(fd)).st_size
+    return mmap.mmap(int(fd), size, prot=mmap.PROT_READ) if size else b""
+
+
+def _write_output(body: bytes) -> None:
+    """Send the envelope: large ones into the host's output memfd, else stdout."""
+    fd = os.environ.get("OPENSKILL_OUTPUT_FD")
+    threshold = int(os.environ.get("OPENSKILL_HANDOFF_BYTES") or 0)
+    if fd is not None and threshold and len(body) >= threshold:
+        view = memoryview(body)
+        while view:
+            view = view[os.write(int(fd), view):]
+        return
+    sys.stdout.buffer.write(body)
+    sys.stdout.flush()
+
+
+def _run_once(handle: Handler, skill_id: str, version: str) -> int:
+    start = time.perf_counter()
+    raw = _read_input()
+    if isinstance(raw, bytes) and not raw.strip():
+        result = _envelope(
+            skill_id, version, str(uuid.uuid4()), start,
+            error={"code": "INVALID_ARGUMENT", "message": "Empty stdin"},
+        )
+        code = EXIT_FAILED
+    else:
+        try:
+            if isinstance(raw, mmap.mmap):
+                with memoryview(raw) as view:
+                    request = loads(view)
+                raw.close()
+            else:
+                request = loads(raw)
+        except json.JSONDecodeError as e:
+            result = _envelope(
+                skill_id, version, str(uuid.uuid4()), start,
+                error={
+                    "code": "INVALID_JSON",
+                    "message": "Failed to parse stdin as JSON",
+                    "details": {"pos": e.pos, "lineno": e.lineno, "colno": e.colno},
+                },
+            )
+            code = EXIT_INVALID_JSON
+        else:
+            result = invoke(handle, request, skill_id=skill_id, version=version)
+            code = EXIT_OK if result["success"] else EXIT_FAILED
+            if not result["success"] and result["error"]["code"] == "INTERNAL":
+                code = EXIT_INTERNAL
+    _write_output(dumps(result))
+    return code
+
+
+# ---------------------------------------------------------------------------
+# Framed transports
+
+
+def read_frame(stream: BinaryIO) -> Optional[bytes]:
+    """Read one length-prefixed frame; None on a clean EOF."""
+    header = stream.read(FRAME_HEADER.size)
+    if not header:
+        return None
+    if len(header) < FRAME_HEADER.size:
+        raise EOFError("Truncated frame header")
+    (length,) = FRAME_HEADER.unpack(header)
+    body = stream.read(length)
+    if len(body) < length:
+        raise EOFError("Truncated frame body")
+    return body
+
+
+def write_frame(stream: BinaryIO, body: bytes) -> None:
+    """Write one length-prefixed frame and flush it."""
+    stream.write(FRAME_HEADER.pack(len(body)))
+    stream.write(body)
+    stream.flush()
+
+
+def _claim_stdio() -> tuple[BinaryIO, BinaryIO]:
+    """
+    Take stdin/stdout for frames and point fd 1 at stderr, so a stray
+    ``print`` in the skill cannot corrupt the protocol.
+    """
+    frames_in = os.fdopen(os.dup(0), "rb")
+    frames_out = os.fdopen(os.dup(1), "wb")
+    os.dup2(2, 1)
+    sys.stdout = sys.stderr
+    return frames_in, frames_out
+
+
+def _limits_from_env() -> Dict[str, int]:
+    raw = os.environ.get("OPENSKILL_SKILL_LIMITS")
+    return loads(raw) if raw else {}
+
+
+def _apply_limits(limits: Dict[str, int]) -> None:
+    """Apply per-request rlimits (same semantics as the host's one-shot runner)."""
+    if resource is None or not limits:
+        return
+    if limits.get("max_rss_mb"):
+        size = limits["max_rss_mb"] * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (size, size))
+    if limits.get("max_cpu_seconds"):
+        seconds = limits["max_cpu_seconds"]
+        resource.setrlimit(resource.RLIMIT_CPU, (seconds, seconds + 1))
+    if limits.get("max_open_files"):
+        _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        count = limits["max_open_files"]
+        if hard != resource.RLIM_INFINITY:
+            count = min(count, hard)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (count, count))
+
+
+class _FrameCodec:
+    """Encoder/decoder pair for the frames after the ready frame."""
+
+    def __init__(self, name: str):
+        self.name = name
+        if name == "msgpack":
+            self.dumps, self.loads = _msgpack_dumps, _msgpack_loads
+        else:
+            self.dumps, self.loads = dumps, loads
+
+
+def _negotiate_format() -> _FrameCodec:
+    """
+    The first format in the host's OPENSKILL_WORKER_FORMATS (its order of
+    preference, JSON if unset) that this worker can speak.
+    """
+    offered = os.environ.get("OPENSKILL_WORKER_FORMATS") or "json"
+    for name in (part.strip() for part in offered.split(",")):
+        if name == "json" or (name == "msgpack" and msgpack is not None):
+            return _FrameCodec(name)
+    return _FrameCodec("json")
+
+
+def _handle_frame(handle: Handler, body: bytes, skill_id: str, version: str, frames: _FrameCodec) -> bytes:
+    start = time.perf_counter()
+    try:
+        request = frames.loads(body)
+    except ValueError as e:
+        # json.JSONDecodeError and msgpack's unpack errors are ValueErrors
+        result = _envelope(
+            skill_id, version, str(uuid.uuid4()), start,
+            error={
+                "code": "INVALID_JSON",
+                "message": "Failed to parse request frame",
+                "details": {"format": frames.name, "reason": str(e)},
+            },
+        )
+    else:
+        result = invoke(handle, request, skill_id=skill_id, version=version)
+    return frames.dumps(result)
+
+
+def _ready(frames_out: BinaryIO, skill_id: str, mode: str) -> _FrameCodec:
+    """Send the ready frame (always JSON) naming the format of later frames."""
+    frames = _negotiate_format()
+    write_frame(frames_out, dumps({
+        "ready": True, "skill_id": skill_id, "mode": mode, "pid": os.getpid(), "format": frames.name,
+    }))
+    return frames
+
+
+def _run_loop(handle: Handler, skill_id: str, version: str) -> int:
+    frames_in, frames_out = _claim_stdio()
+    frames = _ready(frames_out, skill_id, "loop")
+    while True:
+        body = read_frame(frames_in)
+        if body is None:
+            return EXIT_OK
+        write_frame(frames_out, _handle_frame(handle, body, skill_id, version, frames))
+
+
+def _run_forkserver(handle: Handler, skill_id: str, version: str) -> int:
+    """
+    Serve each request from a fresh fork of this warm process.
+
+    Every request gets two frames back: process info (exit code and
+    resource usage of the child) followed by the envelope.
+    """
+    frames_in, frames_out = _claim_stdio()
+    limits = _limits_from_env()
+    frames = _ready(frames_out, skill_id, "forkserver")
+    while True:
+        body = read_frame(frames_in)
+        if body is None:
+            return EXIT_OK
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            # Child: compute, write the envelope to the pipe, exit
+            code = EXIT_INTERNAL
+            try:
+                os.close(read_fd)
+                frames_in.close()
+                frames_out.close()
+                _apply_limits(limits)
+                result = _handle_frame(handle, body, skill_id, version, frames)
+                with os.fdopen(write_fd, "wb") as out:
+                    out.write(result)
+                code = EXIT_OK
+            finally:
+                os._exit(code)
+
+        os.close(write_fd)
+        with os.fdopen(read_fd, "rb") as pipe:
+            result = pipe.read()
+        _, status, usage = os.wait4(pid, 0)
+        returncode = os.waitstatus_to_exitcode(status)
+        info = {
+            "returncode": returncode,
+            "max_rss_kb": usage.ru_maxrss,
+            "user_cpu_s": usage.ru_utime,
+            "sys_cpu_s": usage.ru_stime,
+        }
+        write_frame(frames_out, frames.dumps(info))
+        write_frame(frames_out, result)
+
+
+def run(skill_id: str, handle: Handler, version: str = "0.1.0", argv: list[str] | None = None) -> int:
+    """
+    Entry point for a skill script; picks the transport from ``argv``.
+
+    Returns:
+        Process exit code
+    """
+    args = sys.argv[1:] if argv is None else argv
+    if "--loop" in args:
+        return _run_loop(handle, skill_id, version)
+    if "--forkserver" in args:
+        return _run_forkserver(handle, skill_id, version)
+    return _run_once(handle, skill_id, version)
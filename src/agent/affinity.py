@@ -0,0 +1,229 @@
+"""Conversation affinity: route each conversation to the worker that holds it."""
+
+import bisect
+import hashlib
+import hmac
+import logging
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional
+
+import httpx
+
+from ..config import config
+from ..metrics import AGENT_HANDOFFS
+from .models import Message
+
+logger = logging.getLogger(__name__)
+
+# Ring points per peer; more points even out the share of each peer
+RING_REPLICAS = 128
+# Peers that refused a connection are skipped for this long
+PEER_DOWN_SECONDS = 5.0
+# Ring successors asked for a conversation this peer does not hold
+HANDOFF_CANDIDATES = 2
+
+FORWARD_CONNECT_TIMEOUT = 2.0
+HANDOFF_TIMEOUT = httpx.Timeout(2.0)
+
+PEER_TOKEN_HEADER = "X-OpenSkill-Peer-Token"
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """
+    Consistent-hash ring with virtual nodes.
+
+    Adding or removing one of N peers only moves the keys on that peer's
+    arcs (about 1/N of them); every other key keeps its owner.
+    """
+
+    def __init__(self, peers: Iterable[str], replicas: int = RING_REPLICAS):
+        self.peers = list(dict.fromkeys(peers))
+        points = sorted((_hash(f"{peer}#{i}"), peer) for peer in self.peers for i in range(replicas))
+        self._hashes = [h for h, _ in points]
+        self._owners = [peer for _, peer in points]
+
+    def successors(self, key: str) -> List[str]:
+        """Distinct peers in ring order from the key's position; the first owns it."""
+        if not self._hashes:
+            return []
+        start = bisect.bisect(self._hashes, _hash(key))
+        seen: Dict[str, None] = {}
+        for i in range(len(self._owners)):
+            peer = self._owners[(start + i) % len(self._owners)]
+            if peer not in seen:
+                seen[peer] = None
+                if len(seen) == len(self.peers):
+                    break
+        return list(seen)
+
+
+class AffinityRouter:
+    """
+    Routes ``/agent/chat`` by ``conversation_id`` over a fixed set of peers.
+
+    Each peer is one agent process (a pre-fork worker's private socket, or
+    one host). The owner of a conversation is its first live successor on
+    the ring; other peers forward the request there, so a conversation's
+    history stays in one process's memory. Peers that refuse connections
+    are skipped for PEER_DOWN_SECONDS, and their conversations fall to the
+    next peer on the ring.
+
+    A conversation that moves is handed off: an owner missing a history
+    takes it from the peers that owned it before (its ring successors),
+    and a peer shutting down pushes its histories to their next owners.
+    """
+
+    def __init__(self, peers: List[str], self_peer: str, token: str):
+        self.ring = HashRing(peers)
+        self.self_peer = self_peer
+        self.token = token
+        self._down_until: Dict[str, float] = {}
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def _live(self, peer: str) -> bool:
+        return peer == self.self_peer or self._down_until.get(peer, 0.0) <= time.monotonic()
+
+    def mark_down(self, peer: str) -> None:
+        logger.warning(f"Agent peer {peer} is unreachable; skipping it for {PEER_DOWN_SECONDS:.0f}s")
+        self._down_until[peer] = time.monotonic() + PEER_DOWN_SECONDS
+
+    def owner(self, conversation_id: str) -> str:
+        """The live peer that owns a conversation."""
+        for peer in self.ring.successors(conversation_id):
+            if self._live(peer):
+                return peer
+        return self.self_peer
+
+    def new_conversation_id(self) -> str:
+        """A fresh ID owned by this peer, so the first turn needs no hop."""
+        conversation_id = f"conv-{uuid.uuid4()}"
+        # About len(peers) tries on average
+        for _ in range(16 * len(self.ring.peers)):
+            if self.owner(conversation_id) == self.self_peer:
+                break
+            conversation_id = f"conv-{uuid.uuid4()}"
+        return conversation_id
+
+    def is_peer(self, token: Optional[str]) -> bool:
+        return bool(token) and hmac.compare_digest(token, self.token)
+
+    def _client(self, peer: str) -> httpx.AsyncClient:
+        client = self._clients.get(peer)
+        if client is None:
+            headers = {PEER_TOKEN_HEADER: self.token}
+            if peer.startswith("unix:"):
+                client = httpx.AsyncClient(
+                    transport=httpx.AsyncHTTPTransport(uds=peer[len("unix:"):]),
+                    base_url="http://agent-peer",
+                    headers=headers,
+                )
+            else:
+                client = httpx.AsyncClient(base_url=peer, headers=headers)
+            self._clients[peer] = client
+        return client
+
+    async def forward_chat(self, peer: str, body: bytes, trace_id: str) -> httpx.Response:
+        """
+        Send a chat turn to its owner.
+
+        Raises:
+            httpx.ConnectError, httpx.ConnectTimeout: If the peer cannot be
+                reached (the turn was not sent)
+            httpx.TransportError: If the exchange failed after connecting
+                (the owner may have run the turn)
+        """
+        return await self._client(peer).post(
+            "/agent/chat",
+            content=body,
+            headers={"Content-Type": "application/json", "X-Trace-Id": trace_id},
+            timeout=httpx.Timeout(
+                config.agent_forward_timeout_ms / 1000, connect=FORWARD_CONNECT_TIMEOUT
+            ),
+        )
+
+    async def take_conversation(self, conversation_id: str) -> Optional[List[Message]]:
+        """Fetch (and remove) a conversation from the peers that owned it before."""
+        candidates = [p for p in self.ring.successors(conversation_id) if p != self.self_peer]
+        for peer in candidates[:HANDOFF_CANDIDATES]:
+            if not self._live(peer):
+                continue
+            try:
+                response = await self._client(peer).post(
+                    f"/agent/_peer/conversations/{conversation_id}/take", timeout=HANDOFF_TIMEOUT
+                )
+            except httpx.TransportError:
+                self.mark_down(peer)
+                continue
+            if response.status_code == 200:
+                AGENT_HANDOFFS.labels("in").inc()
+                logger.info(f"Took over conversation {conversation_id} from {peer}")
+                return [Message(**m) for m in response.json()["messages"]]
+        return None
+
+    async def hand_off_all(self, conversations: Dict[str, List[Message]]) -> int:
+        """
+        Push every conversation to its owner once this peer is gone.
+
+        Returns:
+            Number of conversations handed off
+        """
+        handed_off = 0
+        unreachable = set()
+        for conversation_id, messages in list(conversations.items()):
+            successors = [p for p in self.ring.successors(conversation_id) if p != self.self_peer]
+            target = next((p for p in successors if self._live(p) and p not in unreachable), None)
+            if target is None:
+                continue
+            try:
+                response = await self._client(target).put(
+                    f"/agent/_peer/conversations/{conversation_id}",
+                    json={"messages": [m.model_dump(exclude_none=True) for m in messages]},
+                    timeout=HANDOFF_TIMEOUT,
+                )
+            except httpx.TransportError:
+                unreachable.add(target)
+                continue
+            if response.status_code == 204:
+                handed_off += 1
+                AGENT_HANDOFFS.labels("out").inc()
+        return handed_off
+
+    async def close(self) -> None:
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+# Global router instance (None when affinity routing is off)
+_router: Optional[AffinityRouter] = None
+_router_checked = False
+
+
+def get_affinity_router() -> Optional[AffinityRouter]:
+    """
+    Get the process's affinity router.
+
+    Returns:
+        The router, or None unless OPENSKILL_AGENT_AFFINITY is on, at least
+        two peers are configured and this process is one of them
+    """
+    global _router, _router_checked
+    if not _router_checked:
+        _router_checked = True
+        peers = config.agent_peers
+        if config.agent_affinity and len(peers) > 1:
+            if config.agent_self not in peers:
+                logger.warning(
+                    f"OPENSKILL_AGENT_SELF ({config.agent_self}) is not in OPENSKILL_AGENT_PEERS; "
+                    "conversation affinity is off"
+                )
+            elif not config.agent_peer_token:
+                logger.warning("OPENSKILL_AGENT_PEER_TOKEN is not set; conversation affinity is off")
+            else:
+                _router = AffinityRouter(peers, config.agent_self, config.agent_peer_token)
+    return _router
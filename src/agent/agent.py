@@ -1,12 +1,18 @@
 """Agent Loop - manages conversation and tool calling."""
 
-import json
 import logging
 import time
 import uuid
 from typing import Dict, List, Optional
 
+from .. import codec
 from ..config import config
+from ..metrics import (
+    AGENT_TOKENS,
+    AGENT_TOOL_CALLS,
+    AGENT_VALIDATION_RETRIES,
+    LLM_LATENCY,
+)
 from .client import LLMClient, create_client
 from .models import AgentRequest, AgentResponse, Message, ToolCall
 from .tool_manager import ToolManager
@@ -73,12 +79,16 @@ class Agent:
                 if remaining_tokens <= 0:
                     logger.warning(f"No tokens remaining: {total_tokens}/{request.max_tokens}")
                     break
-                llm_response = self.llm_client.chat(
-                    messages=messages,
-                    tools=tools if iteration < request.max_tool_calls else None,
-                    max_tokens=remaining_tokens,
-                    temperature=request.temperature,
-                )
+                llm_start = time.perf_counter()
+                try:
+                    llm_response = self.llm_client.chat(
+                        messages=messages,
+                        tools=tools if iteration < request.max_tool_calls else None,
+                        max_tokens=remaining_tokens,
+                        temperature=request.temperature,
+                    )
+                finally:
+                    LLM_LATENCY.labels(request.provider).observe(time.perf_counter() - llm_start)
             except Exception as e:
                 logger.error(f"LLM API error: {e}", exc_info=True)
                 return AgentResponse(
@@ -120,6 +130,7 @@ class Agent:
             messages.append(assistant_msg)
 
             # Check if LLM wants to call tools
+            AGENT_TOOL_CALLS.observe(len(llm_response.tool_calls or ()))
             if llm_response.tool_calls:
                 tool_call_count += len(llm_response.tool_calls)
                 has_validation_error = False
@@ -131,6 +142,7 @@ class Agent:
                     if not validation_result.valid:
                         # Format error and feedback to LLM
                         validation_retries += 1
+                        AGENT_VALIDATION_RETRIES.labels(tool_call.name).inc()
                         if validation_retries > request.max_validation_retries:
                             logger.warning(
                                 f"Max validation retries reached for tool: {tool_call.name}"
@@ -159,9 +171,10 @@ class Agent:
                         break  # Break to retry with LLM
 
                     # Execute tool call
-                    logger.info(
-                        f"Executing tool: {tool_call.name} with args: {tool_call.arguments}"
-                    )
+                    if logger.isEnabledFor(logging.INFO):
+                        logger.info(
+                            "Executing tool: %s with args: %s", tool_call.name, tool_call.arguments
+                        )
 
                     # Use corrected arguments if available
                     arguments = (
@@ -175,20 +188,20 @@ class Agent:
                     )
 
                     # Record tool call
-                    tool_calls_made.append(
-                        {
-                            "tool": tool_call.name,
-                            "arguments": arguments,
-                            "validated": True,
-                            "result": tool_result,
-                        }
-                    )
+                    record = {
+                        "tool": tool_call.name,
+                        "arguments": arguments,
+                        "validated": True,
+                        "result": tool_result,
+                    }
+                    if validation_result.repairs:
+                        record["repairs"] = validation_result.repairs
+                    tool_calls_made.append(record)
 
                     # Add tool result to conversation
                     # Format tool result as JSON string for LLM
-                    result_content = json.dumps(
-                        tool_result.get("data") or tool_result.get("error", {}),
-                        ensure_ascii=False,
+                    result_content = codec.dumps_str(
+                        tool_result.get("data") or tool_result.get("error", {})
                     )
                     tool_result_msg = Message(
                         role="tool",
@@ -211,6 +224,7 @@ class Agent:
 
         # Save conversation
         self._save_conversation(conversation_id, messages)
+        AGENT_TOKENS.observe(total_tokens)
 
         # Build response
         final_response = messages[-1].content if messages else "No response generated"
@@ -245,6 +259,22 @@ class Agent:
             messages = messages[-max_messages:]
         self._conversations[conversation_id] = messages
 
+    def has_conversation(self, conversation_id: str) -> bool:
+        """Check whether this process holds a conversation's history."""
+        return conversation_id in self._conversations
+
+    def take_conversation(self, conversation_id: str) -> Optional[List[Message]]:
+        """Remove and return a conversation's history (handoff to another worker)."""
+        return self._conversations.pop(conversation_id, None)
+
+    def put_conversation(self, conversation_id: str, messages: List[Message]) -> None:
+        """Adopt a conversation handed off by another worker, unless it has moved on here."""
+        self._conversations.setdefault(conversation_id, messages)
+
+    def conversations(self) -> Dict[str, List[Message]]:
+        """Snapshot of every held conversation."""
+        return dict(self._conversations)
+
 
 # Global agent instance
 _agent: Optional[Agent] = None
@@ -4,12 +4,16 @@ import asyncio
 import logging
 import uuid
 from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
 
-from fastapi import APIRouter, HTTPException, Header
+import httpx
+from fastapi import APIRouter, Body, HTTPException, Header, Response
 
 from ..config import config
+from ..metrics import AGENT_ROUTED, registry as metrics_registry
+from .affinity import PEER_TOKEN_HEADER, get_affinity_router
 from .agent import get_agent
-from .models import AgentRequest, AgentResponse
+from .models import AgentRequest, AgentResponse, Message
 
 logger = logging.getLogger(__name__)
 
@@ -22,24 +26,81 @@ def get_executor() -> ThreadPoolExecutor:
     global _executor
     if _executor is None:
         max_workers = 10  # Configurable if needed
-        _executor = ThreadPoolExecutor(max_workers=max_workers)
+        _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="agent")
     return _executor
 
+
+# Agent chats waiting for a free executor thread (read at scrape time)
+metrics_registry.gauge(
+    "openskill_agent_executor_queue_depth",
+    "Agent chat requests waiting for an executor thread.",
+).set_function(lambda: _executor._work_queue.qsize() if _executor else 0)
+
 # Create router
 router = APIRouter(prefix="/agent", tags=["agent"])
 
 
+async def _route(request: AgentRequest, trace_id: str, from_peer: bool) -> Response | None:
+    """
+    Send the turn to the worker that owns its conversation.
+
+    Returns:
+        The owner's response, or None to handle the turn here
+    """
+    affinity = get_affinity_router()
+    if affinity is None:
+        return None
+    if request.conversation_id is None:
+        request.conversation_id = affinity.new_conversation_id()
+    elif not from_peer:
+        # A forwarded turn is always handled where it lands, so peers with
+        # different views of who is down cannot bounce it back and forth
+        while (owner := affinity.owner(request.conversation_id)) != affinity.self_peer:
+            try:
+                response = await affinity.forward_chat(owner, request.model_dump_json().encode(), trace_id)
+            except (httpx.ConnectError, httpx.ConnectTimeout):
+                # Never reached the owner; its conversations fall to the next peer
+                affinity.mark_down(owner)
+                continue
+            except httpx.TransportError as e:
+                # The owner may be running the turn; running it again elsewhere
+                # would repeat its tool calls and split the history
+                logger.warning(f"Forwarding conversation {request.conversation_id} to {owner} failed: {e!r}")
+                raise HTTPException(
+                    status_code=504 if isinstance(e, httpx.TimeoutException) else 502,
+                    detail=f"Conversation owner {owner} did not answer: {type(e).__name__}",
+                )
+            AGENT_ROUTED.labels("forwarded").inc()
+            return Response(
+                content=response.content,
+                status_code=response.status_code,
+                media_type=response.headers.get("content-type"),
+            )
+    AGENT_ROUTED.labels("local").inc()
+    agent = get_agent()
+    if not agent.has_conversation(request.conversation_id):
+        messages = await affinity.take_conversation(request.conversation_id)
+        if messages:
+            agent.put_conversation(request.conversation_id, messages)
+    return None
+
+
 @router.post("/chat", response_model=AgentResponse)
 async def chat(
     request: AgentRequest,
     x_trace_id: str | None = Header(None, alias="X-Trace-Id"),
+    peer_token: str | None = Header(None, alias=PEER_TOKEN_HEADER),
 ) -> AgentResponse:
     """
     Chat with agent - LLM autonomously calls tools.
 
+    With conversation affinity on, a turn for a conversation owned by
+    another worker is forwarded there (see ``affinity``).
+
     Args:
         request: AgentRequest
         x_trace_id: Optional trace ID from header
+        peer_token: Set by the worker that forwarded the turn
 
     Returns:
         AgentResponse
@@ -47,8 +108,10 @@ async def chat(
     trace_id = x_trace_id or str(uuid.uuid4())
 
     logger.info(
-        f"Agent chat request: conversation_id={request.conversation_id}, "
-        f"provider={request.provider}, trace_id={trace_id}"
+        "Agent chat request: conversation_id=%s, provider=%s, trace_id=%s",
+        request.conversation_id,
+        request.provider,
+        trace_id,
     )
 
     # Validate provider dynamically from config
@@ -73,6 +136,11 @@ async def chat(
                    f"Available providers: {', '.join(available_providers)}",
         )
 
+    affinity = get_affinity_router()
+    routed = await _route(request, trace_id, from_peer=bool(affinity and affinity.is_peer(peer_token)))
+    if routed is not None:
+        return routed
+
     # Get agent and chat
     # Run in thread pool to avoid blocking event loop
     agent = get_agent()
@@ -97,3 +165,46 @@ async def chat(
             detail=f"Agent error: {str(e)}",
         )
 
+
+async def hand_off_conversations() -> None:
+    """Push this worker's conversations to their next owners (on shutdown)."""
+    affinity = get_affinity_router()
+    if affinity is None:
+        return
+    conversations = get_agent().conversations()
+    if conversations:
+        count = await affinity.hand_off_all(conversations)
+        logger.info(f"Handed off {count}/{len(conversations)} conversations")
+    await affinity.close()
+
+
+def _require_peer(token: str | None) -> None:
+    """Conversation handoff is only for the other workers (404 otherwise)."""
+    affinity = get_affinity_router()
+    if affinity is None or not affinity.is_peer(token):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+
+@router.post("/_peer/conversations/{conversation_id}/take", include_in_schema=False)
+async def take_conversation(
+    conversation_id: str,
+    peer_token: str | None = Header(None, alias=PEER_TOKEN_HEADER),
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Hand a conversation's history over to the worker that now owns it."""
+    _require_peer(peer_token)
+    messages = get_agent().take_conversation(conversation_id)
+    if messages is None:
+        raise HTTPException(status_code=404, detail="Conversation not found")
+    return {"messages": [m.model_dump(exclude_none=True) for m in messages]}
+
+
+@router.put("/_peer/conversations/{conversation_id}", status_code=204, include_in_schema=False)
+async def put_conversation(
+    conversation_id: str,
+    messages: List[Message] = Body(..., embed=True),
+    peer_token: str | None = Header(None, alias=PEER_TOKEN_HEADER),
+) -> Response:
+    """Adopt a conversation from a worker that is shutting down."""
+    _require_peer(peer_token)
+    get_agent().put_conversation(conversation_id, messages)
+    return Response(status_code=204)
@@ -1,9 +1,11 @@
 """LLM Client - supports OpenAI and DashScope/Qwen."""
 
+import json
 import logging
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional
 
+from .. import codec
 from ..config import config
 from .models import LLMResponse, Message, ToolCall
 
@@ -132,10 +134,8 @@ class OpenAIClient(LLMClient):
 
     def _parse_arguments(self, arguments: str) -> Dict[str, Any]:
         """Parse JSON arguments string."""
-        import json
-
         try:
-            return json.loads(arguments)
+            return codec.loads(arguments)
         except json.JSONDecodeError as e:
             logger.error(f"Failed to parse tool arguments: {e}")
             return {}
@@ -270,13 +270,11 @@ class QwenClient(LLMClient):
 
     def _parse_arguments(self, arguments: Any) -> Dict[str, Any]:
         """Parse arguments (could be dict or JSON string)."""
-        import json
-
         if isinstance(arguments, dict):
             return arguments
         if isinstance(arguments, str):
             try:
-                return json.loads(arguments)
+                return codec.loads(arguments)
             except json.JSONDecodeError:
                 return {}
         return {}
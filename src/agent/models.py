@@ -58,6 +58,8 @@ class ValidationResult(BaseModel):
     valid: bool
     error_message: Optional[str] = None
     corrected_arguments: Optional[Dict[str, Any]] = None
+    # Deterministic fixes applied before validation passed ("<field>: <kind>")
+    repairs: Optional[List[str]] = None
 
 
 class AgentRequest(BaseModel):
@@ -2,18 +2,51 @@
 
 from typing import Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class CalculatorInput(BaseModel):
     """Input schema for calculator skill."""
 
-    numbers: List[float] = Field(..., description="List of numbers to calculate")
+    numbers: Optional[List[float]] = Field(
+        None, description="List of numbers to calculate (or use numbers_path for large inputs)"
+    )
+    numbers_path: Optional[str] = Field(
+        None,
+        description="File with numbers under ./data: raw float64 little-endian, .npy, or one number per line",
+    )
+    numbers_format: Optional[str] = Field(
+        None, description="Format of numbers_path: auto (by extension), f64, npy, text"
+    )
     ops: List[str] = Field(
         ...,
-        description="Operations to perform: mean, median, min, max, sum",
+        description=(
+            "Operations to perform: mean, median, min, max, sum, variance, stddev, "
+            "percentile, histogram, top_k, approx_percentile"
+        ),
     )
     compare: Optional[Dict[str, float]] = Field(
         None, description="Comparison values: {'a': 10, 'b': 12}"
     )
+    percentiles: Optional[List[float]] = Field(
+        None,
+        description="Percentiles (0-100) for percentile/approx_percentile, default [50, 90, 99]",
+    )
+    bins: Optional[int] = Field(
+        None, ge=1, le=10000, description="Number of equal-width bins for histogram (default 10)"
+    )
+    k: Optional[int] = Field(
+        None, ge=1, le=10000, description="Number of largest values returned by top_k (default 10)"
+    )
+    sketch_error: Optional[float] = Field(
+        None,
+        ge=0.0001,
+        le=0.5,
+        description="Maximum normalized rank error for approx_percentile (default 0.01)",
+    )
 
+    @model_validator(mode="after")
+    def _check_number_source(self) -> "CalculatorInput":
+        if (self.numbers is None) == (self.numbers_path is None):
+            raise ValueError("exactly one of numbers or numbers_path must be provided")
+        return self
@@ -15,9 +15,25 @@ class LogTransformInput(BaseModel):
     output: Optional[str] = Field(
         "stdout", description="Output destination: stdout, file"
     )
+    output_path: Optional[str] = Field(
+        None, description="Destination file when output=file (must be under ./data)"
+    )
+    output_format: Optional[str] = Field(
+        "jsonl", description="File output format: jsonl, csv, arrow, parquet (arrow/parquet need pyarrow)"
+    )
+    compression: Optional[str] = Field(
+        "none", description="Compression for jsonl/csv file output: none, gzip, zstd"
+    )
     rules: Optional[Dict[str, Any]] = Field(
         None,
         description="Transformation rules: timestamp_regex, level_map, etc.",
     )
-    limit: Optional[int] = Field(200, description="Maximum number of records to process")
-
+    mode: Optional[str] = Field(
+        "full",
+        description="Read mode: full (whole file), incremental (only records appended since the last call)",
+    )
+    state_path: Optional[str] = Field(
+        None,
+        description="Checkpoint state file for incremental mode (default: <allowed_root>/.log_transform_state.json)",
+    )
+    limit: Optional[int] = Field(200, description="Maximum number of records to process (0 = no limit)")
@@ -1,8 +1,11 @@
 """Tool Manager - converts skills to Function Calling schemas."""
 
 import logging
+import time
 from typing import Any, Dict, List, Optional
 
+from ..inflight import get_inflight
+from ..metrics import observe_skill_result
 from ..registry import get_registry
 from .schemas import SKILL_INPUT_SCHEMAS
 
@@ -15,6 +18,7 @@ class ToolManager:
     def __init__(self):
         self.registry = get_registry()
         self._tool_schemas: Optional[List[Dict[str, any]]] = None
+        self._tool_schemas_version = -1
 
     def get_available_tools(self) -> List[Dict[str, any]]:
         """
@@ -23,8 +27,11 @@ class ToolManager:
         Returns:
             List of tool schemas in Function Calling format
         """
-        if self._tool_schemas is None:
+        # Rebuild after the registry hot-reloaded
+        version = self.registry.version
+        if self._tool_schemas is None or self._tool_schemas_version != version:
             self._tool_schemas = self._build_tool_schemas()
+            self._tool_schemas_version = version
         return self._tool_schemas
 
     def _build_tool_schemas(self) -> List[Dict[str, any]]:
@@ -91,7 +98,7 @@ class ToolManager:
         descriptions = {
             "echo": "回显输入的文本，用于连通性验证",
             "file_search": "在允许目录（默认 ./data）下检索文件内容并返回命中片段",
-            "calculator": "数据处理和统计计算（均值、中位数、最小/最大、比较大小等）",
+            "calculator": "数据处理和统计计算（均值、中位数、最小/最大、方差/标准差、百分位数、直方图、Top-K、近似分位数、比较大小等）",
             "log_transform": "将日志文件转换为结构化记录（JSON/JSONL/CSV等）",
         }
 
@@ -129,16 +136,25 @@ class ToolManager:
                 "meta": {"latency_ms": 0, "version": "0.1.0"},
             }
 
+        start = time.perf_counter()
         try:
             # Get runner and invoke directly (avoid HTTP deadlock)
             factory = get_factory()
             runner = factory.get_runner(manifest)
             
-            result = runner.invoke(
-                skill_id=tool_name,
-                input_data=arguments,
-                trace_id=trace_id,
-                manifest=manifest,
+            with get_inflight().track(tool_name, trace_id, "agent") as task:
+                task.mark_running()
+                result = runner.invoke(
+                    skill_id=tool_name,
+                    input_data=arguments,
+                    trace_id=trace_id,
+                    manifest=manifest,
+                )
+            observe_skill_result(
+                tool_name,
+                result.success,
+                result.error.code.value if result.error else None,
+                time.perf_counter() - start,
             )
             
             # Convert NormalizedSkillResult to dict
@@ -158,6 +174,7 @@ class ToolManager:
                 },
             }
         except Exception as e:
+            observe_skill_result(tool_name, False, "INTERNAL", time.perf_counter() - start)
             logger.error(f"Failed to invoke tool {tool_name}: {e}", exc_info=True)
             return {
                 "success": False,
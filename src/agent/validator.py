@@ -1,22 +1,133 @@
 """Pydantic validator for tool call arguments."""
 
+import copy
 import logging
-from typing import Any, Dict
+import re
+from typing import Any, Dict, List, Optional, Tuple
 
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
+from .. import codec
+from ..metrics import AGENT_ARGUMENT_REPAIRS
 from .models import ToolCall, ValidationResult
 from .schemas import SKILL_INPUT_SCHEMAS
 
 logger = logging.getLogger(__name__)
 
+# Repair rounds per call; a repaired value can expose errors inside it
+# (e.g. the elements of a list that was sent as a JSON string)
+MAX_REPAIR_ROUNDS = 3
+
+# 1,000 / 12,345.5 (a lone "3,5" is ambiguous and left alone)
+_THOUSANDS = re.compile(r"^[+-]?\d{1,3}(,\d{3})+(\.\d+)?$")
+
+
+def _parse_number(value: str) -> Optional[float]:
+    """Parse a numeric string that lax validation rejects, or None."""
+    text = value.strip().replace("_", "")
+    if _THOUSANDS.match(text):
+        text = text.replace(",", "")
+    try:
+        return float(text)
+    except ValueError:
+        return None
+
+
+def _repair_value(error_type: str, value: Any) -> Tuple[bool, Any, str]:
+    """
+    Deterministic fix for one validation error.
+
+    Args:
+        error_type: Pydantic error type
+        value: The rejected input
+
+    Returns:
+        (repaired, new value, repair kind)
+    """
+    if error_type == "list_type":
+        if isinstance(value, str):
+            try:
+                parsed = codec.loads(value)
+            except Exception:
+                parsed = None
+            if isinstance(parsed, list):
+                return True, parsed, "json_list"
+        if not isinstance(value, (dict, list)):
+            return True, [value], "wrap_list"
+    elif error_type == "dict_type" and isinstance(value, str):
+        try:
+            parsed = codec.loads(value)
+        except Exception:
+            parsed = None
+        if isinstance(parsed, dict):
+            return True, parsed, "json_object"
+    elif error_type == "string_type":
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return True, str(value), "number_to_str"
+    elif error_type in ("int_parsing", "float_parsing") and isinstance(value, str):
+        number = _parse_number(value)
+        if number is not None:
+            if error_type == "float_parsing":
+                return True, number, "str_to_number"
+            # "12.7" for an integer is a different value, not a type slip
+            if number.is_integer():
+                return True, int(number), "str_to_int"
+    # Lax validation already takes 5.0 for an integer; int_from_float means
+    # a fractional value, which the LLM has to fix itself
+    return False, value, ""
+
+
+def _set_at(arguments: Any, loc: Tuple[Any, ...], value: Any) -> bool:
+    """Replace the value at a Pydantic error location; False if it is not there."""
+    if not loc:
+        return False
+    container = arguments
+    for key in loc[:-1]:
+        try:
+            container = container[key]
+        except (KeyError, IndexError, TypeError):
+            return False
+    try:
+        container[loc[-1]] = value
+    except (KeyError, IndexError, TypeError):
+        return False
+    return True
+
 
 class ToolCallValidator:
-    """Validates tool call arguments using Pydantic models."""
+    """
+    Validates tool call arguments using Pydantic models.
+
+    Validators are compiled once per tool (a cached ``TypeAdapter`` for the
+    tool's input schema). Arguments that fail with a common LLM slip (a
+    single value or a JSON string where a list is expected, a number for a
+    string, "1,000") are repaired deterministically
+    and validated again; only errors that survive the repair pass go back to
+    the LLM. Repaired values end up in ``corrected_arguments``.
+    """
+
+    def __init__(self):
+        self._adapters: Dict[str, TypeAdapter] = {}
+
+    def _adapter(self, tool_name: str) -> Optional[TypeAdapter]:
+        """Get the cached validator for a tool (None for unknown tools)."""
+        adapter = self._adapters.get(tool_name)
+        if adapter is None:
+            schema_class = SKILL_INPUT_SCHEMAS.get(tool_name)
+            if schema_class is None:
+                return None
+            adapter = TypeAdapter(schema_class)
+            self._adapters[tool_name] = adapter
+        return adapter
+
+    def warm(self) -> None:
+        """Build the validators of every known tool."""
+        for tool_name in SKILL_INPUT_SCHEMAS:
+            self._adapter(tool_name)
 
     def validate(self, tool_call: ToolCall) -> ValidationResult:
         """
-        Validate tool call arguments.
+        Validate tool call arguments, repairing common type slips.
 
         Args:
             tool_call: ToolCall object
@@ -24,28 +135,84 @@ class ToolCallValidator:
         Returns:
             ValidationResult
         """
-        schema_class = SKILL_INPUT_SCHEMAS.get(tool_call.name)
+        adapter = self._adapter(tool_call.name)
 
-        if not schema_class:
+        if not adapter:
             return ValidationResult(
                 valid=False,
                 error_message=f"Unknown tool: {tool_call.name}",
             )
 
         try:
-            # Validate arguments
-            validated_data = schema_class(**tool_call.arguments)
-            return ValidationResult(
-                valid=True,
-                corrected_arguments=validated_data.model_dump(exclude_none=True),
-            )
+            validated_data = adapter.validate_python(tool_call.arguments)
+            repairs: List[Tuple[str, str]] = []
         except ValidationError as e:
-            error_message = self._format_validation_error(e, tool_call.name)
-            return ValidationResult(
-                valid=False,
-                error_message=error_message,
+            validated_data, repairs = self._validate_repaired(adapter, tool_call.arguments, e)
+            if validated_data is None:
+                # Report what the LLM actually sent, not a half-repaired version
+                return ValidationResult(
+                    valid=False,
+                    error_message=self._format_validation_error(e, tool_call.name),
+                )
+            for _, kind in repairs:
+                AGENT_ARGUMENT_REPAIRS.labels(tool_call.name, kind).inc()
+            logger.info(
+                "Repaired tool call arguments for %s: %s",
+                tool_call.name,
+                ", ".join(f"{field} ({kind})" for field, kind in repairs),
             )
 
+        return ValidationResult(
+            valid=True,
+            corrected_arguments=validated_data.model_dump(exclude_none=True),
+            repairs=[f"{field}: {kind}" for field, kind in repairs] or None,
+        )
+
+    def _validate_repaired(
+        self, adapter: TypeAdapter, arguments: Any, error: ValidationError
+    ) -> Tuple[Any, List[Tuple[str, str]]]:
+        """
+        Repair the arguments and validate them again, a few rounds at most.
+
+        Args:
+            adapter: The tool's validator
+            arguments: Arguments as sent by the LLM (left unchanged)
+            error: ValidationError for them
+
+        Returns:
+            (validated model or None, repairs applied as (field, kind))
+        """
+        arguments = copy.deepcopy(arguments)
+        repairs: List[Tuple[str, str]] = []
+        for _ in range(MAX_REPAIR_ROUNDS):
+            round_repairs = self._repair(arguments, error)
+            if not round_repairs:
+                break
+            repairs.extend(round_repairs)
+            try:
+                return adapter.validate_python(arguments), repairs
+            except ValidationError as e:
+                error = e
+        return None, repairs
+
+    def _repair(self, arguments: Any, error: ValidationError) -> List[Tuple[str, str]]:
+        """
+        Apply a deterministic fix for each error in place.
+
+        Args:
+            arguments: Copy of the tool call arguments
+            error: ValidationError for them
+
+        Returns:
+            Repairs applied, as (field, kind)
+        """
+        repairs = []
+        for err in error.errors():
+            repaired, value, kind = _repair_value(err["type"], err.get("input"))
+            if repaired and _set_at(arguments, tuple(err["loc"]), value):
+                repairs.append((".".join(str(loc) for loc in err["loc"]), kind))
+        return repairs
+
     def _format_validation_error(
         self, error: ValidationError, tool_name: str
     ) -> str:
@@ -90,4 +257,3 @@ class ToolCallValidator:
 请修正参数后重试。"""
 
         return error_message
-
@@ -4,10 +4,15 @@ import logging
 import re
 import time
 import uuid
+from contextlib import asynccontextmanager
 
-from fastapi import FastAPI, Header, Request
-from fastapi.responses import JSONResponse
+from fastapi import Depends, FastAPI, Header, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+from pydantic import ValidationError
 
+from . import codec
 from .config import config
 from .models import (
     ErrorCode,
@@ -15,21 +20,55 @@ from .models import (
     NormalizedSkillResult,
     SkillInvokeRequest,
 )
-from .agent.api import router as agent_router
+from .debug import router as debug_router
+from .inflight import get_inflight
+from .metrics import (
+    CONTENT_TYPE_LATEST,
+    RUNNER_QUEUE_DEPTH,
+    SKILL_PHASE_LATENCY,
+    observe_skill_result,
+    registry as metrics_registry,
+)
 from .middleware import logging_middleware, trace_id_ctx
 from .registry import get_registry
 from .runners import get_factory
 from .utils import format_latency_ms, get_version, setup_logging
+from .warmup import warm_up
+from .watcher import start_watcher, stop_watcher
 
 # Setup logging
-setup_logging(debug=config.debug)
+setup_logging(
+    debug=config.debug,
+    log_format=config.log_format,
+    queue_size=config.log_queue_size,
+    sample=config.log_sample,
+)
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Warm up, then start and stop background services."""
+    if config.warmup:
+        # Runs before uvicorn accepts connections
+        await run_in_threadpool(warm_up)
+    start_watcher()
+    yield
+    stop_watcher()
+    if config.has_llm_config():
+        from .agent.api import hand_off_conversations
+
+        await hand_off_conversations()
+    # Stop pooled skill workers
+    get_factory().close()
+
+
 # Create FastAPI app
 app = FastAPI(
     title="OpenSkill Skill Host",
     description="Local Skill Host for executing skills via unified HTTP protocol",
     version=get_version(),
+    lifespan=lifespan,
     tags_metadata=[
         {
             "name": "skills",
@@ -46,7 +85,24 @@ app = FastAPI(
 app.middleware("http")(logging_middleware)
 
 # Include agent routes
-app.include_router(agent_router)
+# The agent subsystem (LLM clients, tool schemas) is only imported when an
+# LLM is configured; otherwise /agent/* answers from a stub.
+if config.has_llm_config():
+    from .agent.api import router as agent_router
+
+    app.include_router(agent_router)
+else:
+
+    @app.api_route("/agent/{path:path}", methods=["GET", "POST", "DELETE"], tags=["agent"], include_in_schema=False)
+    async def agent_unavailable(path: str):
+        """Agent endpoints without any LLM provider configured."""
+        return JSONResponse(
+            status_code=500,
+            content={"detail": "No LLM provider configured. Please configure at least one LLM API key."},
+        )
+
+# Admin-only debug routes (disabled unless OPENSKILL_ADMIN_TOKEN is set)
+app.include_router(debug_router)
 
 
 def _get_trace_id(x_trace_id: str | None = None) -> str:
@@ -79,12 +135,95 @@ async def health():
     }
 
 
-@app.post("/skills/{skill_id}:invoke", tags=["skills"])
+@app.get("/metrics", tags=["system"], response_class=PlainTextResponse)
+async def metrics():
+    """Metrics in Prometheus text exposition format."""
+    return PlainTextResponse(metrics_registry.render(), media_type=CONTENT_TYPE_LATEST)
+
+
+async def _invoke_body(request: Request) -> SkillInvokeRequest:
+    """
+    Decode the invoke request body as JSON or msgpack (by Content-Type).
+
+    Raises:
+        HTTPException: 415 if msgpack is requested but not installed
+        RequestValidationError: If the body cannot be decoded or validated
+    """
+    content_type = request.headers.get("content-type")
+    try:
+        body_codec = codec.get_codec(content_type) if codec.is_msgpack(content_type) else codec.JSON
+    except ValueError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    body = await request.body()
+    try:
+        payload = body_codec.loads(body)
+    except Exception as e:
+        raise RequestValidationError(
+            [
+                {
+                    "type": "json_invalid",
+                    "loc": ("body",),
+                    "msg": f"{body_codec.name} decode error",
+                    "input": {},
+                    "ctx": {"error": str(e)},
+                }
+            ]
+        )
+    try:
+        return SkillInvokeRequest.model_validate(payload)
+    except ValidationError as e:
+        raise RequestValidationError(
+            [{**error, "loc": ("body", *error["loc"])} for error in e.errors(include_url=False)]
+        )
+
+
+def _skill_response(result: NormalizedSkillResult, accept: str | None = None) -> Response:
+    """
+    Serialize a skill result with the codec negotiated from ``accept``.
+
+    Skips FastAPI's response-model validation and jsonable_encoder pass,
+    which walk the whole ``data`` tree a second time after the runner has
+    already parsed it. Only the small error/meta models are dumped via
+    pydantic; ``data`` is plain decoded JSON and goes to the codec unchanged.
+    """
+    response_codec = codec.negotiate(accept)
+    body = response_codec.dumps(
+        {
+            "success": result.success,
+            "skill_id": result.skill_id,
+            "trace_id": result.trace_id,
+            "data": result.data,
+            "error": result.error.model_dump(mode="json") if result.error else None,
+            "meta": result.meta.model_dump(mode="json") if result.meta else None,
+        }
+    )
+    return Response(content=body, media_type=response_codec.content_type)
+
+
+_INVOKE_BODY_SCHEMA = SkillInvokeRequest.model_json_schema()
+
+
+@app.post(
+    "/skills/{skill_id}:invoke",
+    tags=["skills"],
+    response_model=NormalizedSkillResult,
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                codec.JSON_CONTENT_TYPE: {"schema": _INVOKE_BODY_SCHEMA},
+                codec.MSGPACK_CONTENT_TYPE: {"schema": _INVOKE_BODY_SCHEMA},
+            },
+        }
+    },
+)
 async def invoke_skill(
     skill_id: str,
-    request: SkillInvokeRequest,
+    request: SkillInvokeRequest = Depends(_invoke_body),
     x_trace_id: str | None = Header(None, alias="X-Trace-Id"),
-) -> NormalizedSkillResult:
+    x_openskill_timings: str | None = Header(None, alias="X-OpenSkill-Timings"),
+    accept: str | None = Header(None),
+) -> Response:
     """
     Invoke a skill.
 
@@ -92,35 +231,38 @@ async def invoke_skill(
         skill_id: The skill ID
         request: The invocation request
         x_trace_id: Optional trace ID from header
+        x_openskill_timings: Set to "1" to include per-phase timings in meta
+        accept: ``application/msgpack`` for a msgpack response (JSON otherwise)
 
     Returns:
-        NormalizedSkillResult
+        NormalizedSkillResult, encoded as negotiated
     """
-    # Validate skill_id format (alphanumeric and hyphens only)
+    # Validate skill_id format (alphanumeric, underscores and hyphens only)
     import re
-    if not re.match(r"^[a-z0-9-]+$", skill_id):
+    if not re.match(r"^[a-z0-9_-]+$", skill_id):
         latency_ms = format_latency_ms(time.time())
-        return NormalizedSkillResult(
+        result = NormalizedSkillResult(
             success=False,
             skill_id=skill_id,
             trace_id=_get_trace_id(x_trace_id),
             data=None,
             error=ErrorDetail(
                 code=ErrorCode.INVALID_ARGUMENT,
-                message=f"Invalid skill_id format: {skill_id}. Only lowercase letters, numbers, and hyphens are allowed.",
+                message=f"Invalid skill_id format: {skill_id}. Only lowercase letters, numbers, underscores, and hyphens are allowed.",
             ),
             meta={"latency_ms": latency_ms, "version": get_version()},
         )
-    
+        return _skill_response(result, accept)
+
     start_time = time.time()
+    start_perf = time.perf_counter()
     trace_id = _get_trace_id(x_trace_id)
     # trace_id is already set in middleware, but ensure it's set here too for consistency
     trace_id_ctx.set(trace_id)
 
-    logger.info(
-        f"Invoking skill: skill_id={skill_id}",
-        extra={"trace_id": trace_id},
-    )
+    if logger.isEnabledFor(logging.INFO):
+        # Lazy %-args: the message is built on the log listener thread
+        logger.info("Invoking skill: skill_id=%s", skill_id, extra={"trace_id": trace_id})
 
     # Get registry and factory
     # Note: registry and factory are global singletons, get_registry() and get_factory() just return instances
@@ -146,7 +288,7 @@ async def invoke_skill(
             f"Skill not found: skill_id={skill_id}",
             extra={"trace_id": trace_id},
         )
-        return result
+        return _skill_response(result, accept)
 
     # Get runner
     try:
@@ -169,36 +311,55 @@ async def invoke_skill(
             extra={"trace_id": trace_id},
             exc_info=True,
         )
-        return result
+        return _skill_response(result, accept)
 
     # Invoke the skill
+    # Runners block on the child process, so keep them off the event loop
     result = None
-    try:
-        result = runner.invoke(
+    queued = True
+    queue_ns = 0
+    enqueued_ns = time.perf_counter_ns()
+
+    def _run():
+        nonlocal queued, queue_ns
+        queued = False
+        queue_ns = time.perf_counter_ns() - enqueued_ns
+        RUNNER_QUEUE_DEPTH.dec()
+        task.mark_running()
+        return runner.invoke(
             skill_id=skill_id,
             input_data=request.input,
             trace_id=trace_id,
             manifest=manifest,
         )
-    except Exception as e:
-        latency_ms = format_latency_ms(start_time)
-        result = NormalizedSkillResult(
-            success=False,
-            skill_id=skill_id,
-            trace_id=trace_id,
-            data=None,
-            error=ErrorDetail(
-                code=ErrorCode.INTERNAL,
-                message="Unexpected error during skill invocation",
-                details={"exception": type(e).__name__, "reason": str(e)},
-            ),
-            meta={"latency_ms": latency_ms, "version": get_version()},
-        )
-        logger.error(
-            f"Unexpected error invoking skill: skill_id={skill_id}, error={e}",
-            extra={"trace_id": trace_id},
-            exc_info=True,
-        )
+
+    with get_inflight().track(skill_id, trace_id, "http") as task:
+        RUNNER_QUEUE_DEPTH.inc()
+        try:
+            result = await run_in_threadpool(_run)
+        except Exception as e:
+            latency_ms = format_latency_ms(start_time)
+            result = NormalizedSkillResult(
+                success=False,
+                skill_id=skill_id,
+                trace_id=trace_id,
+                data=None,
+                error=ErrorDetail(
+                    code=ErrorCode.INTERNAL,
+                    message="Unexpected error during skill invocation",
+                    details={"exception": type(e).__name__, "reason": str(e)},
+                ),
+                meta={"latency_ms": latency_ms, "version": get_version()},
+            )
+            logger.error(
+                f"Unexpected error invoking skill: skill_id={skill_id}, error={e}",
+                extra={"trace_id": trace_id},
+                exc_info=True,
+            )
+        finally:
+            if queued:
+                # Cancelled before a worker thread picked it up
+                RUNNER_QUEUE_DEPTH.dec()
 
     # Ensure result is not None (safety check)
     if result is None:
@@ -219,15 +380,36 @@ async def invoke_skill(
             extra={"trace_id": trace_id},
         )
 
-    # Log the result
-    latency_ms = result.meta.latency_ms if result.meta else 0
-    logger.info(
-        f"Skill invocation completed: skill_id={skill_id}, success={result.success}, "
-        f"latency_ms={latency_ms}",
-        extra={"trace_id": trace_id, "skill_id": skill_id, "success": result.success},
+    observe_skill_result(
+        skill_id,
+        result.success,
+        result.error.code.value if result.error else None,
+        time.perf_counter() - start_perf,
     )
+    if not queued:
+        SKILL_PHASE_LATENCY.labels(skill_id, "queue").observe(queue_ns / 1e9)
+
+    # Phase timings are opt-in per request; runners always record them
+    if result.meta is not None:
+        if x_openskill_timings in ("1", "true", "yes"):
+            timings = dict(result.meta.timings or {})
+            timings["queue"] = round(queue_ns / 1e6, 3)
+            result.meta.timings = timings
+        else:
+            result.meta.timings = None
+
+    # Log the result
+    if logger.isEnabledFor(logging.INFO):
+        latency_ms = result.meta.latency_ms if result.meta else 0
+        logger.info(
+            "Skill invocation completed: skill_id=%s, success=%s, latency_ms=%s",
+            skill_id,
+            result.success,
+            latency_ms,
+            extra={"trace_id": trace_id, "skill_id": skill_id, "success": result.success},
+        )
 
-    return result
+    return _skill_response(result, accept)
 
 
 @app.exception_handler(Exception)
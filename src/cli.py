@@ -0,0 +1,104 @@
+"""Command-line tools for Skill Host: python -m src.cli <command>."""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+
+def _compile_manifests(args: argparse.Namespace) -> int:
+    from .registry import SkillRegistry
+
+    start = time.perf_counter()
+    registry = SkillRegistry(
+        Path(args.skills_dir) if args.skills_dir else None,
+        snapshot_path=Path(args.output) if args.output else None,
+    )
+    if args.check:
+        fresh = registry._load_snapshot()
+        print(f"{registry.snapshot_path}: {'fresh' if fresh else 'stale or missing'}")
+        return 0 if fresh else 1
+    try:
+        path = registry.compile_snapshot()
+    except Exception as e:
+        print(f"Failed to compile manifests: {e}", file=sys.stderr)
+        return 1
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"Wrote {len(registry.list_skills())} manifests to {path} ({elapsed_ms:.1f} ms)")
+    return 0
+
+
+def _serve(args: argparse.Namespace) -> int:
+    from .server import serve
+
+    return serve(args.host, args.port, args.workers, args.cpu_affinity)
+
+
+def _node(args: argparse.Namespace) -> int:
+    from .node import run_node
+
+    return run_node(args.listen, args.workers)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m src.cli", description="Skill Host command-line tools")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compile_parser = commands.add_parser(
+        "compile-manifests",
+        help="Validate skills/*.yaml and write a snapshot for fast worker start-up",
+    )
+    compile_parser.add_argument("--skills-dir", help="Manifest directory (default: ./skills)")
+    compile_parser.add_argument("-o", "--output", help="Snapshot path (default: <skills-dir>/.manifests.snapshot.json)")
+    compile_parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report whether the existing snapshot is fresh (exit 1 if not)",
+    )
+    compile_parser.set_defaults(handler=_compile_manifests)
+
+    serve_parser = commands.add_parser(
+        "serve",
+        help="Run N pre-forked uvicorn workers sharing one warmed-up parent",
+    )
+    serve_parser.add_argument("--host", default=os.getenv("OPENSKILL_HOST", "127.0.0.1"))
+    serve_parser.add_argument("--port", type=int, default=int(os.getenv("OPENSKILL_PORT", "8000")))
+    serve_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=int(os.getenv("OPENSKILL_WORKERS", "0")) or None,
+        help="Worker processes (default: number of CPUs)",
+    )
+    serve_parser.add_argument(
+        "--cpu-affinity",
+        default=os.getenv("OPENSKILL_CPU_AFFINITY", "none"),
+        help='Pin workers to CPUs: "none", "auto" (one CPU each) or a list like "0-3,8"',
+    )
+    serve_parser.set_defaults(handler=_serve)
+
+    node_parser = commands.add_parser(
+        "node",
+        help="Run a skill node that executes placement: remote skills for front-end hosts",
+    )
+    node_parser.add_argument(
+        "--listen",
+        default=os.getenv("OPENSKILL_NODE_LISTEN", "127.0.0.1:9300"),
+        help='Address to listen on: "host:port" or "unix:/path/to/socket"',
+    )
+    node_parser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=int(os.getenv("OPENSKILL_NODE_WORKERS", "0")) or os.cpu_count() or 1,
+        help="Concurrent skill invocations (default: number of CPUs)",
+    )
+    node_parser.set_defaults(handler=_node)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
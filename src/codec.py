@@ -0,0 +1,125 @@
+"""Serialization layer shared by the host, runners and agent."""
+
+import json
+from typing import Any, Callable, NamedTuple, Optional
+
+# orjson and msgpack are optional; JSON falls back to the stdlib
+try:
+    import orjson  # type: ignore
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack  # type: ignore
+except ImportError:
+    msgpack = None
+
+JSON_CONTENT_TYPE = "application/json"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+# Older clients still send the unregistered x- form
+MSGPACK_CONTENT_TYPES = (MSGPACK_CONTENT_TYPE, "application/x-msgpack")
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+if orjson is not None:
+    # numpy scalars/arrays appear in calculator results; int dict keys in
+    # Python-built payloads
+    _ORJSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+
+
+def dumps(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """
+    Encode ``obj`` as compact UTF-8 JSON.
+
+    Args:
+        obj: Object to encode
+        default: Called for objects the encoder does not support
+
+    Returns:
+        JSON bytes
+
+    Raises:
+        TypeError: If the object is not serializable
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default, option=_ORJSON_OPTIONS)
+        except TypeError:
+            # e.g. integers beyond 64 bits, which the stdlib handles
+            pass
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"), default=default).encode("utf-8")
+
+
+def dumps_str(obj: Any, default: Optional[Callable[[Any], Any]] = None) -> str:
+    """Like :func:`dumps` but returns ``str`` (for text protocols such as LLM messages)."""
+    return dumps(obj, default=default).decode("utf-8")
+
+
+def loads(data: bytes | str) -> Any:
+    """
+    Decode JSON from bytes or str.
+
+    Raises:
+        json.JSONDecodeError: If the input is not valid JSON (orjson's
+            error is a subclass)
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # The stdlib also accepts NaN/Infinity, which skills may emit
+            pass
+    return json.loads(data)
+
+
+def _msgpack_dumps(obj: Any) -> bytes:
+    return msgpack.packb(obj, use_bin_type=True)
+
+
+def _msgpack_loads(data: bytes) -> Any:
+    return msgpack.unpackb(data, raw=False)
+
+
+class Codec(NamedTuple):
+    """A wire format: name, MIME type and its encode/decode functions."""
+
+    name: str
+    content_type: str
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+JSON = Codec("json", JSON_CONTENT_TYPE, dumps, loads)
+MSGPACK: Optional[Codec] = (
+    Codec("msgpack", MSGPACK_CONTENT_TYPE, _msgpack_dumps, _msgpack_loads) if msgpack is not None else None
+)
+
+
+def is_msgpack(content_type: Optional[str]) -> bool:
+    """Whether a Content-Type/Accept value names msgpack."""
+    if not content_type:
+        return False
+    return any(t in content_type.lower() for t in MSGPACK_CONTENT_TYPES)
+
+
+def get_codec(name: str) -> Codec:
+    """
+    Look up a codec by name ("json", "msgpack") or MIME type.
+
+    Raises:
+        ValueError: If the format is unknown or its package is not installed
+    """
+    if name == "json" or name.lower().startswith(JSON_CONTENT_TYPE):
+        return JSON
+    if name == "msgpack" or is_msgpack(name):
+        if MSGPACK is None:
+            raise ValueError("msgpack is not installed")
+        return MSGPACK
+    raise ValueError(f"Unsupported format: {name}")
+
+
+def negotiate(accept: Optional[str]) -> Codec:
+    """Response codec for an Accept header: msgpack when asked for and available, else JSON."""
+    if MSGPACK is not None and is_msgpack(accept):
+        return MSGPACK
+    return JSON
@@ -2,8 +2,9 @@
 
 import logging
 import os
+import shutil
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +44,63 @@ class Config:
         except ValueError as e:
             raise ValueError(f"Invalid OPENSKILL_TIMEOUT_MS value: {timeout_ms_str}. {e}")
         self.debug: bool = os.getenv("OPENSKILL_DEBUG", "0") == "1"
+        # Pre-load registry, LLM SDKs and tool schemas before serving
+        self.warmup: bool = os.getenv("OPENSKILL_WARMUP", "1") == "1"
+
+        # Hot reload of skills/ and skill_cli/
+        self.watch_skills: bool = os.getenv("OPENSKILL_WATCH_SKILLS", "0") == "1"
+        self.watch_interval_ms: int = self._get_int("OPENSKILL_WATCH_INTERVAL_MS", 1000, minimum=50)
+
+        # Warm workers per skill for manifests with mode pool/forkserver
+        self.pool_size: int = self._get_int("OPENSKILL_POOL_SIZE", 2, minimum=1)
+
+        # HTTP skills: shared connection pool, default concurrency per endpoint
+        self.http_max_connections: int = self._get_int("OPENSKILL_HTTP_MAX_CONNECTIONS", 100, minimum=1)
+        self.http_pool_size: int = self._get_int("OPENSKILL_HTTP_POOL_SIZE", 10, minimum=1)
+
+        # Executables runtime: exec skills may launch besides those under
+        # OPENSKILL_CLI_DIR (comma-separated paths, or names looked up on PATH)
+        self.exec_allowlist: List[Path] = self._get_executables("OPENSKILL_EXEC_ALLOWLIST")
+
+        # Skill nodes for placement: remote skills (host:port or unix:/path)
+        self.nodes: List[str] = [n.strip() for n in os.getenv("OPENSKILL_NODES", "").split(",") if n.strip()]
+        self.node_heartbeat_ms: int = self._get_int("OPENSKILL_NODE_HEARTBEAT_MS", 1000, minimum=50)
+        self.node_retries: int = self._get_int("OPENSKILL_NODE_RETRIES", 1, minimum=0)
+        # Shared by nodes and front ends; a node requires it in the handshake
+        self.node_token: Optional[str] = os.getenv("OPENSKILL_NODE_TOKEN") or None
+
+        # Conversation affinity for /agent/chat across workers or hosts.
+        # `python -m src.cli serve` fills peers, self and token for its own
+        # workers; set them explicitly to route across hosts.
+        self.agent_affinity: bool = os.getenv("OPENSKILL_AGENT_AFFINITY", "1") == "1"
+        self.agent_peers: List[str] = [
+            p.strip().rstrip("/") for p in os.getenv("OPENSKILL_AGENT_PEERS", "").split(",") if p.strip()
+        ]
+        self.agent_self: Optional[str] = (os.getenv("OPENSKILL_AGENT_SELF") or "").rstrip("/") or None
+        self.agent_peer_token: Optional[str] = os.getenv("OPENSKILL_AGENT_PEER_TOKEN") or None
+        # A forwarded turn includes LLM calls and tool runs
+        self.agent_forward_timeout_ms: int = self._get_int(
+            "OPENSKILL_AGENT_FORWARD_TIMEOUT_MS", 300000, minimum=100
+        )
+
+        # Skill payloads at least this large go through memfds (0: always pipes)
+        self.handoff_bytes: int = self._get_int("OPENSKILL_HANDOFF_BYTES", 1024 * 1024, minimum=0)
+
+        # Slow-call recorder (/debug/slow)
+        self.slow_ms: int = self._get_int("OPENSKILL_SLOW_MS", 5000, minimum=0)
+        self.slow_percentile: float = self._get_float("OPENSKILL_SLOW_PERCENTILE", 99.0, 0.0, 100.0)
+        self.slow_buffer_size: int = self._get_int("OPENSKILL_SLOW_BUFFER", 100, minimum=1)
+
+        # Logging pipeline
+        self.log_format: str = os.getenv("OPENSKILL_LOG_FORMAT", "json").lower()
+        if self.log_format not in ("json", "text"):
+            raise ValueError(f"Invalid OPENSKILL_LOG_FORMAT value: {self.log_format}. Must be json or text")
+        self.log_queue_size: int = self._get_int("OPENSKILL_LOG_QUEUE_SIZE", 10000, minimum=1)
+        # Per-route sampling of sub-WARNING records, e.g. "/health=0,/skills/=0.1"
+        self.log_sample: str = os.getenv("OPENSKILL_LOG_SAMPLE", "")
+
+        # Token for /debug endpoints (disabled when unset)
+        self.admin_token: Optional[str] = os.getenv("OPENSKILL_ADMIN_TOKEN") or None
 
         # LLM API Configuration
         # OpenAI API
@@ -75,6 +133,45 @@ class Config:
         # Validate required paths exist
         self._validate()
 
+    @staticmethod
+    def _get_int(name: str, default: int, minimum: int = 0) -> int:
+        """Read an integer environment variable with a lower bound."""
+        raw = os.getenv(name, str(default))
+        try:
+            value = int(raw)
+        except ValueError:
+            raise ValueError(f"Invalid {name} value: {raw}. Must be an integer")
+        if value < minimum:
+            raise ValueError(f"Invalid {name} value: {raw}. Must be >= {minimum}")
+        return value
+
+    @staticmethod
+    def _get_float(name: str, default: float, minimum: float, maximum: float) -> float:
+        """Read a float environment variable within [minimum, maximum]."""
+        raw = os.getenv(name, str(default))
+        try:
+            value = float(raw)
+        except ValueError:
+            raise ValueError(f"Invalid {name} value: {raw}. Must be a number")
+        if not minimum <= value <= maximum:
+            raise ValueError(f"Invalid {name} value: {raw}. Must be between {minimum} and {maximum}")
+        return value
+
+    @staticmethod
+    def _get_executables(name: str) -> List[Path]:
+        """Read a comma-separated list of executables, resolved to real paths."""
+        executables = []
+        for item in os.getenv(name, "").split(","):
+            item = item.strip()
+            if not item:
+                continue
+            found = shutil.which(item) if os.sep not in item else item
+            if not found or not os.path.isfile(found):
+                logger.warning(f"{name}: executable not found, ignoring: {item}")
+                continue
+            executables.append(Path(found).resolve())
+        return executables
+
     def _validate(self) -> None:
         """Validate configuration values."""
         if not self.cli_dir.exists():
@@ -0,0 +1,122 @@
+"""Admin-only debug endpoints for live workers."""
+
+import hmac
+import logging
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import PlainTextResponse
+
+from .config import config
+from .inflight import get_inflight
+from .profiler import ProfilerBusyError, collapse, get_profiler
+from .registry import get_registry
+from .runners.remote import get_remote_runner
+from .slowlog import get_slow_recorder
+
+logger = logging.getLogger(__name__)
+
+# Upper bound for a single profile request
+MAX_PROFILE_SECONDS = 60
+
+
+def require_admin(x_admin_token: str | None = Header(None, alias="X-Admin-Token")) -> None:
+    """
+    Allow the request only with the configured admin token.
+
+    Debug endpoints are hidden (404) unless OPENSKILL_ADMIN_TOKEN is set.
+    """
+    if not config.admin_token:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, config.admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+
+# Create router
+router = APIRouter(prefix="/debug", tags=["debug"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: float = Query(5.0, gt=0, le=MAX_PROFILE_SECONDS),
+    interval_ms: float = Query(5.0, ge=1, le=1000),
+) -> PlainTextResponse:
+    """
+    Sample every thread of this worker and return collapsed stacks.
+
+    The output feeds flamegraph.pl or speedscope directly. The sampling
+    thread runs off the event loop, so the loop itself shows up in the
+    stacks like any other thread.
+
+    Args:
+        seconds: Profile duration
+        interval_ms: Sampling interval in milliseconds
+
+    Returns:
+        Collapsed stacks as text/plain
+    """
+    logger.info(f"Starting sampling profile: seconds={seconds}, interval_ms={interval_ms}")
+    try:
+        result = await run_in_threadpool(get_profiler().profile, seconds, interval_ms / 1000.0)
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return PlainTextResponse(
+        collapse(result["stacks"]),
+        headers={
+            "X-Profile-Samples": str(result["samples"]),
+            "X-Profile-Duration": str(result["duration_s"]),
+            "X-Profile-Pid": str(result["pid"]),
+        },
+    )
+
+
+@router.get("/tasks")
+async def tasks():
+    """In-flight skill invocations with their elapsed time."""
+    items = get_inflight().snapshot()
+    return {"count": len(items), "tasks": items}
+
+
+@router.get("/slow")
+async def slow_calls(
+    skill_id: str | None = Query(None, description="Only calls of this skill"),
+    limit: int | None = Query(None, ge=1, description="Maximum records to return"),
+):
+    """
+    Recorded slow invocations, newest first.
+
+    Each record holds the trace_id, the size-capped input, phase timings,
+    the stderr tail and the child's resource usage, enough to replay the
+    call offline.
+    """
+    recorder = get_slow_recorder()
+    records = recorder.snapshot(skill_id=skill_id, limit=limit)
+    return {
+        "count": len(records),
+        "threshold_ms": recorder.threshold_ms,
+        "percentile": recorder.percentile,
+        "records": records,
+    }
+
+
+@router.delete("/slow")
+async def clear_slow_calls():
+    """Clear the slow-call buffer."""
+    return {"cleared": get_slow_recorder().clear()}
+
+
+@router.post("/reload")
+async def reload_skills(full: bool = Query(False, description="Re-parse every manifest")):
+    """Re-scan skills/ and skill_cli/ now (same path as the file watcher)."""
+    registry = get_registry()
+    changed = await run_in_threadpool(registry.refresh, full)
+    return {"changed": sorted(changed), "version": registry.version, "skills": registry.list_skills()}
+
+
+@router.get("/nodes")
+async def nodes():
+    """Skill nodes as seen by this worker (placement: remote skills)."""
+    if not config.nodes:
+        return {"count": 0, "nodes": []}
+    items = await run_in_threadpool(get_remote_runner().status)
+    return {"count": len(items), "nodes": items}
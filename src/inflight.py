@@ -0,0 +1,92 @@
+"""Registry of in-flight skill invocations."""
+
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+
+class InflightTask:
+    """One skill invocation that has not finished yet."""
+
+    __slots__ = ("id", "skill_id", "trace_id", "source", "state", "started_ns", "thread")
+
+    def __init__(self, task_id: int, skill_id: str, trace_id: str, source: str):
+        self.id = task_id
+        self.skill_id = skill_id
+        self.trace_id = trace_id
+        self.source = source
+        self.state = "queued"
+        self.started_ns = time.perf_counter_ns()
+        self.thread: Optional[str] = None
+
+    def mark_running(self) -> None:
+        """Record that a worker thread picked the task up."""
+        self.state = "running"
+        self.thread = threading.current_thread().name
+
+    def to_dict(self, now_ns: int) -> Dict[str, object]:
+        return {
+            "id": self.id,
+            "skill_id": self.skill_id,
+            "trace_id": self.trace_id,
+            "source": self.source,
+            "state": self.state,
+            "thread": self.thread,
+            "elapsed_ms": round((now_ns - self.started_ns) / 1e6, 3),
+        }
+
+
+class InflightTracker:
+    """Thread-safe set of running invocations, for /debug/tasks."""
+
+    def __init__(self):
+        self._tasks: Dict[int, InflightTask] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def track(self, skill_id: str, trace_id: str, source: str) -> Iterator[InflightTask]:
+        """
+        Register an invocation for the duration of the ``with`` block.
+
+        Args:
+            skill_id: The skill ID
+            trace_id: The trace ID
+            source: Caller kind ("http" or "agent")
+
+        Yields:
+            InflightTask (call ``mark_running`` once a worker starts it)
+        """
+        task = InflightTask(next(self._ids), skill_id, trace_id, source)
+        with self._lock:
+            self._tasks[task.id] = task
+        try:
+            yield task
+        finally:
+            with self._lock:
+                self._tasks.pop(task.id, None)
+
+    def snapshot(self) -> List[Dict[str, object]]:
+        """In-flight invocations, longest-running first."""
+        now_ns = time.perf_counter_ns()
+        with self._lock:
+            tasks = list(self._tasks.values())
+        tasks.sort(key=lambda t: t.started_ns)
+        return [task.to_dict(now_ns) for task in tasks]
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+
+# Global tracker instance
+_tracker: Optional[InflightTracker] = None
+
+
+def get_inflight() -> InflightTracker:
+    """Get the global in-flight invocation tracker."""
+    global _tracker
+    if _tracker is None:
+        _tracker = InflightTracker()
+    return _tracker
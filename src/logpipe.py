@@ -0,0 +1,226 @@
+"""Non-blocking logging pipeline: bounded queue, background formatting, sampling."""
+
+import atexit
+import logging
+import queue
+import random
+import time
+from contextvars import ContextVar
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from . import codec
+from .metrics import LOG_RECORDS_DROPPED
+
+# Whether records below WARNING are kept for the current request
+_sampled_ctx: ContextVar[bool] = ContextVar("log_sampled", default=True)
+
+# Attributes every LogRecord has; anything else came from ``extra``
+_RECORD_ATTRS = frozenset(logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {
+    "message",
+    "asctime",
+    "trace_id",
+    "taskName",
+    "color_message",  # uvicorn's ANSI-colored duplicate of the message
+}
+
+# Loggers that bring their own handlers; routed through the pipeline instead
+THIRD_PARTY_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    One JSON object per line: ``ts``, ``level``, ``logger``, ``trace_id``,
+    ``message``, any ``extra`` fields, and ``exc_info`` when present.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(record.created))
+            + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "trace_id": getattr(record, "trace_id", None) or "-",
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = record.stack_info
+        return codec.dumps_str(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Drop records below WARNING for requests that were not sampled."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING or _sampled_ctx.get():
+            return True
+        LOG_RECORDS_DROPPED.labels("sampled").inc()
+        return False
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller.
+
+    Records are enqueued as-is and formatted on the listener thread; when
+    the bounded queue is full the record is dropped and counted.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener thread formats; the caller only pays for the enqueue
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            LOG_RECORDS_DROPPED.labels("queue_full").inc()
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Wait for room so stop() still flushes a full queue
+        self.queue.put(self._sentinel, timeout=1.0)
+
+
+def parse_sample_rates(spec: str) -> Dict[str, float]:
+    """
+    Parse ``OPENSKILL_LOG_SAMPLE``: comma-separated ``<path prefix>=<rate>``
+    pairs, e.g. ``"/health=0,/skills/=0.1,*=1"``.
+
+    Raises:
+        ValueError: If an entry is malformed or a rate is outside [0, 1]
+    """
+    rates: Dict[str, float] = {}
+    for item in spec.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        prefix, sep, raw = item.rpartition("=")
+        if not sep or not prefix:
+            raise ValueError(f"Invalid log sample entry: {item!r}. Expected <path prefix>=<rate>")
+        rate = float(raw)
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Invalid log sample rate for {prefix}: {raw}. Must be between 0 and 1")
+        rates[prefix.strip()] = rate
+    return rates
+
+
+class LogPipeline:
+    """A queue handler on the root logger feeding a background listener."""
+
+    def __init__(
+        self,
+        target: logging.Handler,
+        level: int,
+        queue_size: int = 10000,
+        sample_rates: Optional[Dict[str, float]] = None,
+    ):
+        self.target = target
+        self.queue_size = queue_size
+        self.sample_rates = dict(sample_rates or {})
+        # Longest prefix first; "*" is the default
+        self._prefixes = sorted((p for p in self.sample_rates if p != "*"), key=len, reverse=True)
+        self.handler = DroppingQueueHandler(queue.Queue(queue_size))
+        self.handler.setLevel(level)
+        self.handler.addFilter(SamplingFilter())
+        self.listener: Optional[QueueListener] = None
+
+    def start(self) -> None:
+        self.listener = _Listener(self.handler.queue, self.target, respect_handler_level=True)
+        self.listener.start()
+
+    def stop(self) -> None:
+        """Flush queued records and stop the listener thread."""
+        if self.listener is not None:
+            try:
+                self.listener.stop()
+            except queue.Full:
+                pass
+            self.listener = None
+
+    def restart_after_fork(self) -> None:
+        """Forked children do not inherit the listener thread; start a new one."""
+        self.handler.queue = queue.Queue(self.queue_size)
+        self.start()
+
+    def rate_for(self, path: str) -> float:
+        for prefix in self._prefixes:
+            if path.startswith(prefix):
+                return self.sample_rates[prefix]
+        return self.sample_rates.get("*", 1.0)
+
+    def sample_request(self, path: str) -> None:
+        """Decide once per request whether its sub-WARNING records are kept."""
+        if not self.sample_rates:
+            return
+        rate = self.rate_for(path)
+        _sampled_ctx.set(rate >= 1.0 or (rate > 0.0 and random.random() < rate))
+
+
+# Global pipeline instance
+_pipeline: Optional[LogPipeline] = None
+
+
+def install(
+    target: logging.Handler,
+    level: int,
+    queue_size: int = 10000,
+    sample_rates: Optional[Dict[str, float]] = None,
+) -> LogPipeline:
+    """
+    Route the root logger (and uvicorn's loggers) through a LogPipeline.
+
+    Args:
+        target: Handler doing the actual formatting and I/O
+        level: Minimum level
+        queue_size: Records buffered before new ones are dropped
+        sample_rates: Per-route rates for records below WARNING
+
+    Returns:
+        The installed pipeline
+    """
+    global _pipeline
+    if _pipeline is not None:
+        return _pipeline
+    _pipeline = LogPipeline(target, level, queue_size, sample_rates)
+    root = logging.getLogger()
+    root.handlers = [_pipeline.handler]
+    root.setLevel(level)
+    for name in THIRD_PARTY_LOGGERS:
+        third_party = logging.getLogger(name)
+        third_party.handlers = []
+        third_party.propagate = True
+    _pipeline.start()
+    atexit.register(_pipeline.stop)
+    return _pipeline
+
+
+def restart_after_fork() -> None:
+    """
+    Start a listener in a forked worker process.
+
+    Not an ``os.register_at_fork`` hook on purpose: subprocess children with
+    a ``preexec_fn`` run at-fork hooks too and must not start threads.
+    """
+    if _pipeline is not None:
+        _pipeline.restart_after_fork()
+
+
+def shutdown() -> None:
+    """Flush and stop the global pipeline (for exits that skip atexit)."""
+    if _pipeline is not None:
+        _pipeline.stop()
+
+
+def sample_request(path: str) -> None:
+    """Apply the per-route sampling decision for the current request."""
+    if _pipeline is not None:
+        _pipeline.sample_request(path)
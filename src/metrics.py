@@ -0,0 +1,418 @@
+"""In-process metrics registry with Prometheus text exposition."""
+
+import abc
+import bisect
+import math
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Default latency buckets in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Sizes for per-request counts (tokens, tool calls)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10)
+
+# Child peak memory in bytes (8 MiB .. 4 GiB)
+MEMORY_BUCKETS = tuple(float(2 ** n) for n in range(23, 33))
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(value)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric(abc.ABC):
+    """Base class for labelled metrics."""
+
+    type_name = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._children_lock = threading.Lock()
+        if not self.labelnames:
+            # Unlabelled metrics are exported from the start, even at zero
+            self._children[()] = self._new_child()
+
+    def labels(self, *values: str):
+        """
+        Get the child for a label combination.
+
+        Children are created once and cached, so the hot path is a dict
+        lookup followed by a per-child update.
+        """
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(
+                    f"{self.name} expects labels {self.labelnames}, got {values}"
+                )
+            with self._children_lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._new_child()
+                    self._children[key] = child
+        return child
+
+    @abc.abstractmethod
+    def _new_child(self):
+        """Create the value holder for one label combination."""
+
+    @abc.abstractmethod
+    def _samples(self) -> Iterable[str]:
+        """Exposition lines for every child."""
+
+    def render(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type_name}",
+        ]
+        lines.extend(self._samples())
+        return lines
+
+
+class _CounterChild:
+    __slots__ = ("_value", "_lock")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    type_name = "counter"
+
+    def _new_child(self) -> _CounterChild:
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        """Increment the unlabelled counter."""
+        self.labels().inc(amount)
+
+    def _samples(self) -> Iterable[str]:
+        for key, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+
+
+class _GaugeChild:
+    __slots__ = ("_value", "_lock", "_function")
+
+    def __init__(self):
+        self._value = 0.0
+        self._lock = threading.Lock()
+        self._function: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self._value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self._value -= amount
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        """Compute the value at scrape time instead of tracking it."""
+        self._function = function
+
+    @property
+    def value(self) -> float:
+        if self._function is not None:
+            try:
+                return float(self._function())
+            except Exception:
+                return math.nan
+        return self._value
+
+
+class Gauge(_Metric):
+    """Value that can go up and down."""
+
+    type_name = "gauge"
+
+    def _new_child(self) -> _GaugeChild:
+        return _GaugeChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.labels().inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.labels().dec(amount)
+
+    def set(self, value: float) -> None:
+        self.labels().set(value)
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self.labels().set_function(function)
+
+    def _samples(self) -> Iterable[str]:
+        for key, child in list(self._children.items()):
+            yield f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(child.value)}"
+
+
+class _HistogramChild:
+    __slots__ = ("_upper_bounds", "_counts", "_sum", "_lock")
+
+    def __init__(self, upper_bounds: Tuple[float, ...]):
+        self._upper_bounds = upper_bounds
+        # One slot per bucket plus the implicit +Inf bucket
+        self._counts = [0] * (len(upper_bounds) + 1)
+        self._sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self._upper_bounds, value)
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+
+    def snapshot(self) -> Tuple[List[int], float]:
+        with self._lock:
+            return list(self._counts), self._sum
+
+
+class Histogram(_Metric):
+    """Fixed-bucket histogram (cumulative buckets on exposition)."""
+
+    type_name = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.buckets = tuple(sorted(float(b) for b in buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> _HistogramChild:
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self.labels().observe(value)
+
+    def _samples(self) -> Iterable[str]:
+        for key, child in list(self._children.items()):
+            counts, total = child.snapshot()
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+            labels = _format_labels(self.labelnames, key)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class MetricsRegistry:
+    """Collection of metrics rendered together on /metrics."""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric) or existing.labelnames != metric.labelnames:
+                    raise ValueError(f"Metric {metric.name} already registered with a different shape")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format (0.0.4)."""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Content type for the text exposition format
+CONTENT_TYPE_LATEST = "text/plain; version=0.0.4; charset=utf-8"
+
+# Global metrics registry
+registry = MetricsRegistry()
+
+# Skill Host metrics
+SKILL_INVOCATIONS = registry.counter(
+    "openskill_skill_invocations_total",
+    "Skill invocations by skill and result code (OK or error code).",
+    ("skill_id", "code"),
+)
+SKILL_LATENCY = registry.histogram(
+    "openskill_skill_latency_seconds",
+    "End-to-end skill invocation latency.",
+    ("skill_id",),
+)
+SKILL_PHASE_LATENCY = registry.histogram(
+    "openskill_skill_phase_seconds",
+    "Skill invocation time by phase (queue, validate, serialize, spawn, execute, parse, build).",
+    ("skill_id", "phase"),
+)
+RUNNER_QUEUE_DEPTH = registry.gauge(
+    "openskill_runner_queue_depth",
+    "Skill invocations waiting for a worker thread to start running.",
+)
+SUBPROCESS_INFLIGHT = registry.gauge(
+    "openskill_subprocess_inflight",
+    "Skill subprocesses currently running.",
+)
+STDOUT_BYTES = registry.counter(
+    "openskill_skill_stdout_bytes_total",
+    "Size of skill stdout parsed by runners.",
+    ("skill_id",),
+)
+
+HANDOFF_BYTES = registry.counter(
+    "openskill_handoff_bytes_total",
+    "Skill payload bytes passed through memfds instead of pipes.",
+    ("direction",),
+)
+SKILL_CPU_SECONDS = registry.histogram(
+    "openskill_skill_cpu_seconds",
+    "User plus system CPU time of skill child processes.",
+    ("skill_id",),
+)
+SKILL_MAX_RSS = registry.histogram(
+    "openskill_skill_max_rss_bytes",
+    "Peak resident set size of skill child processes.",
+    ("skill_id",),
+    buckets=MEMORY_BUCKETS,
+)
+SKILL_LIMIT_EXCEEDED = registry.counter(
+    "openskill_skill_limit_exceeded_total",
+    "Skill invocations that failed on a manifest resource limit.",
+    ("skill_id", "resource"),
+)
+NODE_REQUESTS_INFLIGHT = registry.gauge(
+    "openskill_node_requests_in_flight",
+    "Skill invocations dispatched to a skill node and not yet answered.",
+    ("node",),
+)
+NODE_EJECTIONS = registry.counter(
+    "openskill_node_ejections_total",
+    "Skill nodes taken out of rotation after a lost connection or missed heartbeats.",
+    ("node",),
+)
+NODE_RETRIES = registry.counter(
+    "openskill_node_retries_total",
+    "Idempotent skill invocations retried on another node after a node failure.",
+    ("skill_id",),
+)
+
+# Agent metrics
+LLM_LATENCY = registry.histogram(
+    "openskill_llm_request_seconds",
+    "LLM API call latency.",
+    ("provider",),
+)
+AGENT_TOKENS = registry.histogram(
+    "openskill_agent_tokens_per_request",
+    "Total LLM tokens used per agent chat request.",
+    buckets=TOKEN_BUCKETS,
+)
+AGENT_TOOL_CALLS = registry.histogram(
+    "openskill_agent_tool_calls_per_turn",
+    "Tool calls requested by the LLM per turn.",
+    buckets=COUNT_BUCKETS,
+)
+AGENT_VALIDATION_RETRIES = registry.counter(
+    "openskill_agent_validation_retries_total",
+    "Tool call validation failures sent back to the LLM.",
+    ("tool",),
+)
+AGENT_ARGUMENT_REPAIRS = registry.counter(
+    "openskill_agent_argument_repairs_total",
+    "Tool call arguments repaired without a round trip to the LLM.",
+    ("tool", "kind"),
+)
+AGENT_ROUTED = registry.counter(
+    "openskill_agent_routed_total",
+    "Agent chat turns handled by the owning worker (local) or forwarded to it (forwarded).",
+    ("route",),
+)
+AGENT_HANDOFFS = registry.counter(
+    "openskill_agent_handoffs_total",
+    "Conversation histories moved between workers (in: taken over, out: pushed on shutdown).",
+    ("direction",),
+)
+LOG_RECORDS_DROPPED = registry.counter(
+    "openskill_log_records_dropped_total",
+    "Log records dropped by sampling or because the log queue was full.",
+    ("reason",),
+)
+
+
+def observe_skill_result(skill_id: str, success: bool, error_code: Optional[str], seconds: float) -> None:
+    """
+    Record one finished skill invocation.
+
+    Args:
+        skill_id: The skill ID
+        success: Whether the invocation succeeded
+        error_code: Error code when it failed
+        seconds: Wall-clock latency in seconds
+    """
+    code = "OK" if success else (error_code or "INTERNAL")
+    SKILL_INVOCATIONS.labels(skill_id, code).inc()
+    SKILL_LATENCY.labels(skill_id).observe(seconds)
+
+
+def observe_phases(skill_id: str, phases_ns: Dict[str, int]) -> None:
+    """
+    Record per-phase durations of one invocation.
+
+    Args:
+        skill_id: The skill ID
+        phases_ns: Phase name to duration in nanoseconds
+    """
+    for phase, ns in phases_ns.items():
+        SKILL_PHASE_LATENCY.labels(skill_id, phase).observe(ns / 1e9)
@@ -8,6 +8,8 @@ from contextvars import ContextVar
 
 from fastapi import Request, Response
 
+from .logpipe import sample_request
+
 logger = logging.getLogger(__name__)
 
 # Context variable for trace_id (imported from app.py pattern)
@@ -37,26 +39,33 @@ async def logging_middleware(request: Request, call_next: Callable) -> Response:
     trace_id = request.headers.get("X-Trace-Id") or str(uuid.uuid4())
     trace_id_ctx.set(trace_id)
     
-    # Record request body size (if available)
-    request_body_size = None
-    content_length = request.headers.get("content-length")
-    if content_length:
-        try:
-            request_body_size = int(content_length)
-        except ValueError:
-            pass
-
-    # Log request
-    logger.debug(
-        f"Request: {request.method} {request.url.path}",
-        extra={
-            "trace_id": trace_id,
-            "method": request.method,
-            "path": request.url.path,
-            "client": request.client.host if request.client else None,
-            "body_size": request_body_size,
-        },
-    )
+    # Per-route sampling decides whether this request's INFO/DEBUG records are kept
+    sample_request(request.url.path)
+
+    # Request/response records are DEBUG; skip building them otherwise
+    log_debug = logger.isEnabledFor(logging.DEBUG)
+    if log_debug:
+        # Record request body size (if available)
+        request_body_size = None
+        content_length = request.headers.get("content-length")
+        if content_length:
+            try:
+                request_body_size = int(content_length)
+            except ValueError:
+                pass
+
+        logger.debug(
+            "Request: %s %s",
+            request.method,
+            request.url.path,
+            extra={
+                "trace_id": trace_id,
+                "method": request.method,
+                "path": request.url.path,
+                "client": request.client.host if request.client else None,
+                "body_size": request_body_size,
+            },
+        )
 
     # Process request
     response = await call_next(request)
@@ -64,16 +73,18 @@ async def logging_middleware(request: Request, call_next: Callable) -> Response:
     # Calculate latency
     latency_ms = int((time.time() - start_time) * 1000)
 
-    # Log response
-    logger.debug(
-        f"Response: {response.status_code} ({latency_ms}ms)",
-        extra={
-            "trace_id": trace_id,
-            "status_code": response.status_code,
-            "latency_ms": latency_ms,
-            "path": request.url.path,
-        },
-    )
+    if log_debug:
+        logger.debug(
+            "Response: %s (%sms)",
+            response.status_code,
+            latency_ms,
+            extra={
+                "trace_id": trace_id,
+                "status_code": response.status_code,
+                "latency_ms": latency_ms,
+                "path": request.url.path,
+            },
+        )
 
     # Add latency and trace_id headers
     response.headers["X-Process-Time-Ms"] = str(latency_ms)
@@ -1,9 +1,9 @@
 """Data models for Skill Host."""
 
 from enum import Enum
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Literal, Optional, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class ErrorCode(str, Enum):
@@ -14,6 +14,7 @@ class ErrorCode(str, Enum):
     FORBIDDEN_PATH = "FORBIDDEN_PATH"
     NOT_FOUND = "NOT_FOUND"
     TIMEOUT = "TIMEOUT"
+    RESOURCE_EXHAUSTED = "RESOURCE_EXHAUSTED"
     INTERNAL = "INTERNAL"
 
 
@@ -31,6 +32,14 @@ class SkillMeta(BaseModel):
     latency_ms: int
     version: str = "0.1.0"
     truncated: Optional[bool] = None
+    timings: Optional[Dict[str, float]] = Field(
+        None,
+        description="Per-phase durations in milliseconds (only when requested via X-OpenSkill-Timings)",
+    )
+    resources: Optional[Dict[str, Union[int, float]]] = Field(
+        None,
+        description="Child process usage: max_rss_kb, user_cpu_s, sys_cpu_s",
+    )
 
 
 class NormalizedSkillResult(BaseModel):
@@ -71,6 +80,57 @@ class SkillManifest(BaseModel):
     entry: Optional[str] = None
     timeout_ms: Optional[int] = None
     allowed_root: Optional[str] = None
+    slow_threshold_ms: Optional[int] = None
+    max_rss_mb: Optional[int] = Field(None, gt=0, description="Address-space limit for the child (MB)")
+    max_cpu_seconds: Optional[int] = Field(None, gt=0, description="CPU time limit for the child (seconds)")
+    max_open_files: Optional[int] = Field(None, gt=0, description="Open file descriptor limit for the child")
+    mode: Literal["oneshot", "pool", "forkserver", "inprocess"] = Field(
+        "oneshot",
+        description="How python skills run: fresh process per call, warm worker pool, "
+        "fork per call from a warm worker, or inside the host process",
+    )
+    pool_size: Optional[int] = Field(
+        None,
+        gt=0,
+        description="Warm workers per skill (pool/forkserver modes); concurrent calls per endpoint (http)",
+    )
+    endpoint: Optional[str] = Field(
+        None,
+        pattern=r"^https?://",
+        description="URL the skill is POSTed to (type http)",
+    )
+
+    args: Optional[List[str]] = Field(
+        None,
+        description="argv template for runtime exec: {field} and {field:path} placeholders "
+        "are filled from the input, which is then not sent on stdin",
+    )
+    output_format: Literal["envelope", "json", "jsonl", "text"] = Field(
+        "envelope",
+        description="stdout of runtime exec skills: result envelope, a JSON value, "
+        "JSON lines or plain text",
+    )
+    ok_exit_codes: List[int] = Field(
+        default_factory=lambda: [0],
+        description="Exit codes counted as success when output_format is not envelope",
+    )
+
+    placement: Literal["local", "remote"] = Field(
+        "local",
+        description="remote: run on the skill nodes in OPENSKILL_NODES (local when none are set)",
+    )
+    idempotent: bool = Field(
+        False,
+        description="Safe to run twice: a call lost with its skill node is retried on another node",
+    )
+
+    @model_validator(mode="after")
+    def _check_endpoint(self) -> "SkillManifest":
+        if self.type == "http" and not self.endpoint:
+            raise ValueError("http skills need an endpoint")
+        if self.runtime == "exec" and not self.entry:
+            raise ValueError("exec skills need an entry (the executable)")
+        return self
 
     class Config:
         json_schema_extra = {
@@ -0,0 +1,238 @@
+"""Skill node daemon: runs skills for a front-end Skill Host over a socket."""
+
+import hmac
+import ipaddress
+import logging
+import os
+import signal
+import socket
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+from .config import config
+from .logpipe import shutdown as shutdown_logging
+from .models import ErrorCode, ErrorDetail, NormalizedSkillResult, SkillMeta
+from .registry import get_registry
+from .runners import get_factory
+from .runners.remote import parse_address, recv_frame, send_frame
+from .utils import setup_logging
+from .watcher import start_watcher, stop_watcher
+
+logger = logging.getLogger(__name__)
+
+# Seconds between stop checks while waiting for connections (a signal
+# delivered to another thread does not interrupt accept())
+ACCEPT_POLL_SECONDS = 1.0
+
+
+class SkillNode:
+    """
+    Serves the node protocol of ``RemoteRunner`` on one TCP or Unix socket.
+
+    Each front-end worker keeps one persistent connection and multiplexes
+    its calls over it. ``invoke`` requests run on a thread pool through the
+    node's own registry and runners (the node ignores ``placement``);
+    ``ping`` is answered straight from the connection's reader thread, so
+    heartbeats still get through while every worker thread is busy.
+
+    With a token set, a connection must open with a ``ping`` carrying it;
+    anything else gets an error reply and the connection is closed.
+    """
+
+    def __init__(self, address: str, workers: int, token: str | None = None):
+        self.address = address
+        self.workers = workers
+        self.token = token
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="skill-node")
+        self._active = 0
+        self._active_lock = threading.Lock()
+        self._listener: socket.socket | None = None
+        self._stopping = threading.Event()
+
+    def _bind(self) -> socket.socket:
+        family, target = parse_address(self.address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        if family == socket.AF_UNIX:
+            # A socket file left behind by a previous run
+            if os.path.exists(target):
+                os.unlink(target)
+        else:
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(target)
+        sock.listen(128)
+        sock.settimeout(ACCEPT_POLL_SECONDS)
+        return sock
+
+    def serve_forever(self) -> None:
+        """Accept front-end connections until stop() is called."""
+        registry = get_registry()
+        get_factory().warm(registry)
+        start_watcher()
+        self._listener = self._bind()
+        logger.info(
+            f"Skill node listening on {self.address}: workers={self.workers}, "
+            f"skills={len(registry.list_skills())}"
+        )
+        try:
+            while not self._stopping.is_set():
+                try:
+                    conn, peer = self._listener.accept()
+                except socket.timeout:
+                    continue
+                except OSError:
+                    if self._stopping.is_set():
+                        break
+                    raise
+                if conn.family != socket.AF_UNIX:
+                    conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+                threading.Thread(
+                    target=self._serve_connection, args=(conn, peer), name="skill-node-conn", daemon=True
+                ).start()
+        finally:
+            stop_watcher()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            get_factory().close()
+            family, target = parse_address(self.address)
+            if family == socket.AF_UNIX and os.path.exists(target):
+                os.unlink(target)
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._listener is not None:
+            try:
+                self._listener.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            self._listener.close()
+
+    def _serve_connection(self, conn: socket.socket, peer: Any) -> None:
+        send_lock = threading.Lock()
+        logger.info(f"Front end connected: {peer or 'unix socket'}")
+        authenticated = self.token is None
+        try:
+            while True:
+                message = recv_frame(conn)
+                if message is None:
+                    break
+                op = message.get("op")
+                if not authenticated:
+                    token = message.get("token")
+                    if op != "ping" or not isinstance(token, str) or not hmac.compare_digest(token, self.token):
+                        logger.warning(f"Refused front end {peer or 'unix socket'}: missing or wrong node token")
+                        self._reply(conn, send_lock, {"id": message.get("id"), "error": "Unauthorized"})
+                        break
+                    authenticated = True
+                if op == "invoke":
+                    with self._active_lock:
+                        self._active += 1
+                    self._executor.submit(self._invoke, conn, send_lock, message)
+                elif op == "ping":
+                    self._reply(conn, send_lock, {
+                        "id": message.get("id"),
+                        "ok": True,
+                        "pid": os.getpid(),
+                        "active": self._active,
+                        "workers": self.workers,
+                    })
+                else:
+                    self._reply(conn, send_lock, {"id": message.get("id"), "error": f"Unknown op: {op}"})
+        except (OSError, ValueError) as e:
+            logger.warning(f"Front-end connection dropped: {e}")
+        finally:
+            conn.close()
+
+    def _invoke(self, conn: socket.socket, send_lock: threading.Lock, message: Dict[str, Any]) -> None:
+        skill_id = message.get("skill_id", "")
+        trace_id = message.get("trace_id", "")
+        try:
+            manifest = get_registry().get_skill(skill_id)
+            if manifest is None:
+                result = NormalizedSkillResult(
+                    success=False,
+                    skill_id=skill_id,
+                    trace_id=trace_id,
+                    data=None,
+                    error=ErrorDetail(code=ErrorCode.NOT_FOUND, message=f"Skill not found on node: {skill_id}"),
+                    meta=SkillMeta(latency_ms=0),
+                )
+            else:
+                result = get_factory().get_runner(manifest).invoke(
+                    skill_id=skill_id,
+                    input_data=message.get("input") or {},
+                    trace_id=trace_id,
+                    manifest=manifest,
+                )
+            reply = {
+                "id": message.get("id"),
+                "result": {
+                    "success": result.success,
+                    "skill_id": result.skill_id,
+                    "trace_id": result.trace_id,
+                    "data": result.data,
+                    "error": result.error.model_dump(mode="json") if result.error else None,
+                    "meta": result.meta.model_dump(mode="json") if result.meta else None,
+                },
+            }
+        except Exception as e:
+            logger.error(f"Skill node failed to run {skill_id}: {e}", extra={"trace_id": trace_id}, exc_info=True)
+            reply = {"id": message.get("id"), "error": f"{type(e).__name__}: {e}"}
+        finally:
+            with self._active_lock:
+                self._active -= 1
+        self._reply(conn, send_lock, reply)
+
+    @staticmethod
+    def _reply(conn: socket.socket, send_lock: threading.Lock, reply: Dict[str, Any]) -> None:
+        try:
+            with send_lock:
+                send_frame(conn, reply)
+        except OSError:
+            # The front end went away; it fails or retries the call itself
+            pass
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def run_node(address: str, workers: int) -> int:
+    """
+    Run a skill node in the foreground until SIGTERM/SIGINT.
+
+    Args:
+        address: ``host:port`` or ``unix:/path`` to listen on
+        workers: Concurrent skill invocations
+
+    Returns:
+        Process exit code
+    """
+    setup_logging(
+        debug=config.debug,
+        log_format=config.log_format,
+        queue_size=config.log_queue_size,
+    )
+    family, target = parse_address(address)
+    if family != socket.AF_UNIX and not config.node_token and not _is_loopback(target[0]):
+        logger.error(
+            f"Refusing to listen on {address} without OPENSKILL_NODE_TOKEN: "
+            "anyone who can reach it could run any skill"
+        )
+        shutdown_logging()
+        return 2
+    # A node runs every skill itself, whatever its placement
+    config.nodes = []
+    node = SkillNode(address, workers, token=config.node_token)
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, lambda *_: node.stop())
+    try:
+        node.serve_forever()
+    finally:
+        logger.info("Skill node stopped")
+        shutdown_logging()
+    return 0
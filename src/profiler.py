@@ -0,0 +1,138 @@
+"""Low-overhead sampling profiler for live workers."""
+
+import collections
+import os
+import sys
+import threading
+import time
+from typing import Dict, Optional
+
+# Sampling interval bounds (seconds)
+DEFAULT_INTERVAL = 0.005
+MIN_INTERVAL = 0.001
+
+# Stack depth kept per sample. Stacks are walked from the leaf, so the
+# outermost frames beyond this are dropped and replaced by TRUNCATED_FRAME
+MAX_STACK_DEPTH = 128
+TRUNCATED_FRAME = "[truncated]"
+
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is running."""
+
+
+def _frame_label(code) -> str:
+    """Label for one frame: function name plus short file and first line."""
+    filename = code.co_filename
+    parts = filename.replace("\\", "/").rsplit("/", 2)
+    short = "/".join(parts[-2:]) if len(parts) > 1 else filename
+    return f"{code.co_name} ({short}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Statistical profiler over all threads of the current process.
+
+    A background thread wakes every ``interval`` seconds and walks the
+    current frame of every other thread via ``sys._current_frames()``. Only
+    code objects are touched, so the profiled threads are never paused
+    beyond the GIL hand-off, and overhead scales with the sampling rate
+    rather than with the amount of Python executed.
+
+    Results are collapsed stacks (``thread;outer;...;inner count``), the
+    input format of flamegraph.pl, speedscope and similar tools. Stacks
+    deeper than MAX_STACK_DEPTH keep their innermost frames under a
+    ``[truncated]`` root frame.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def profile(self, seconds: float, interval: float = DEFAULT_INTERVAL) -> Dict[str, object]:
+        """
+        Sample all threads for ``seconds`` and return collapsed stacks.
+
+        Blocks the calling thread for the duration of the profile.
+
+        Args:
+            seconds: Profile duration
+            interval: Time between samples
+
+        Returns:
+            Dictionary with ``stacks`` (collapsed stack -> sample count),
+            ``samples``, ``duration_s`` and ``interval_s``
+
+        Raises:
+            ProfilerBusyError: If another profile is already running
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+        try:
+            return self._sample(seconds, max(interval, MIN_INTERVAL))
+        finally:
+            self._lock.release()
+
+    def _sample(self, seconds: float, interval: float) -> Dict[str, object]:
+        stacks: collections.Counter = collections.Counter()
+        labels: Dict[object, str] = {}
+        own_ident = threading.get_ident()
+        samples = 0
+
+        start = time.perf_counter()
+        deadline = start + seconds
+        next_tick = start
+        while True:
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            names = {t.ident: t.name for t in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident == own_ident:
+                    continue
+                frames = []
+                while frame is not None and len(frames) < MAX_STACK_DEPTH:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = _frame_label(code)
+                    frames.append(label)
+                    frame = frame.f_back
+                if frame is not None:
+                    frames.append(TRUNCATED_FRAME)
+                frames.append(names.get(ident, f"thread-{ident}"))
+                frames.reverse()
+                stacks[";".join(frames)] += 1
+            samples += 1
+            next_tick += interval
+            delay = next_tick - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                # Fell behind (e.g. GIL contention); resynchronise
+                next_tick = time.perf_counter()
+
+        return {
+            "stacks": dict(stacks),
+            "samples": samples,
+            "duration_s": round(time.perf_counter() - start, 3),
+            "interval_s": interval,
+            "pid": os.getpid(),
+        }
+
+
+def collapse(stacks: Dict[str, int]) -> str:
+    """Render collapsed stacks, one ``stack count`` line each, hottest first."""
+    lines = [f"{stack} {count}" for stack, count in sorted(stacks.items(), key=lambda kv: -kv[1])]
+    return "\n".join(lines) + ("\n" if lines else "")
+
+
+# Global profiler instance
+_profiler: Optional[SamplingProfiler] = None
+
+
+def get_profiler() -> SamplingProfiler:
+    """Get the global sampling profiler."""
+    global _profiler
+    if _profiler is None:
+        _profiler = SamplingProfiler()
+    return _profiler
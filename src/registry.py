@@ -1,26 +1,77 @@
 """Skill Registry and Manifest Loader."""
 
+import hashlib
+import json
 import logging
+import os
+import tempfile
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Optional
+from types import MappingProxyType
+from typing import Callable, Dict, List, Mapping, Optional, Set, Tuple
 
 import yaml
 
+from . import codec
 from .config import config
 from .models import SkillManifest
+from .security import resolve_executable
 
 logger = logging.getLogger(__name__)
 
 
+# (mtime_ns, size) of a file; None when it is missing
+FileSignature = Optional[Tuple[int, int]]
+
+# Precompiled manifest snapshot (python -m src.cli compile-manifests)
+SNAPSHOT_NAME = ".manifests.snapshot.json"
+# Bump when the snapshot layout changes
+SNAPSHOT_FORMAT = 1
+
+# libyaml's C loader is several times faster than the pure-Python one
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+def _signature(path: Path) -> FileSignature:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _sha256(path: Path) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _schema_fingerprint() -> str:
+    """Changes whenever SkillManifest fields, types or constraints change."""
+    fields = sorted(
+        (name, repr(field.annotation), repr(field.default), repr(field.metadata))
+        for name, field in SkillManifest.model_fields.items()
+    )
+    return hashlib.sha256(repr(fields).encode("utf-8")).hexdigest()[:16]
+
+
 class SkillRegistry:
-    """Registry for managing skill manifests."""
+    """
+    Registry for managing skill manifests.
+
+    Manifests are published as an immutable mapping that is replaced in a
+    single reference assignment, so readers never observe a partially
+    loaded registry. ``refresh()`` re-parses only manifests whose file
+    changed and reports skills whose entry script changed, bumping
+    ``version`` and notifying listeners for both.
+    """
 
-    def __init__(self, skills_dir: Optional[Path] = None):
+    def __init__(self, skills_dir: Optional[Path] = None, snapshot_path: Optional[Path] = None):
         """
         Initialize the registry.
 
         Args:
             skills_dir: Directory containing skill manifest YAML files
+            snapshot_path: Precompiled snapshot (default: skills_dir/.manifests.snapshot.json)
         """
         if skills_dir is None:
             # Default to ./skills relative to project root
@@ -28,34 +79,229 @@ class SkillRegistry:
             skills_dir = project_root / "skills"
 
         self.skills_dir = Path(skills_dir)
-        self._manifests: Dict[str, SkillManifest] = {}
+        self.snapshot_path = Path(snapshot_path) if snapshot_path else self.skills_dir / SNAPSHOT_NAME
+        self._manifests: Mapping[str, SkillManifest] = MappingProxyType({})
+        # Manifest file -> (signature, manifest loaded from it)
+        self._sources: Dict[Path, Tuple[FileSignature, Optional[SkillManifest]]] = {}
+        # Skill ID -> signature of its entry script
+        self._scripts: Dict[str, FileSignature] = {}
+        self._listeners: List[Callable[[Set[str]], None]] = []
+        self._refresh_lock = threading.Lock()
+        self.version = 0
         self._load_all()
 
     def _load_all(self) -> None:
-        """Load all skill manifests from the skills directory."""
+        """Load all skill manifests, from the snapshot when it is fresh."""
+        if self._load_snapshot():
+            self.refresh()
+        else:
+            self.refresh(full=True)
+
+    def _load_snapshot(self) -> bool:
+        """
+        Seed the registry from the precompiled snapshot.
+
+        The snapshot is used only if it was built for the same manifest
+        schema and CLI directory and every YAML file still matches: same
+        mtime and size, or (after e.g. a fresh checkout) the same SHA-256.
+        Manifests were validated at compile time, so they are rebuilt
+        without running validation again.
+
+        Returns:
+            True if the snapshot was fresh and loaded
+        """
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                snapshot = codec.loads(f.read())
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable manifest snapshot {self.snapshot_path}: {e}")
+            return False
+
+        if (
+            snapshot.get("format") != SNAPSHOT_FORMAT
+            or snapshot.get("schema") != _schema_fingerprint()
+            or snapshot.get("cli_dir") != str(config.cli_dir)
+        ):
+            logger.info("Manifest snapshot was built for another version; parsing YAML")
+            return False
+
+        current = self._scan()
+        entries = {self.skills_dir / e["file"]: e for e in snapshot.get("files", [])}
+        if set(entries) != set(current):
+            logger.info("Manifest snapshot is stale (files added or removed); parsing YAML")
+            return False
+
+        sources: Dict[Path, Tuple[FileSignature, Optional[SkillManifest]]] = {}
+        for path, signature in current.items():
+            entry = entries[path]
+            if signature != (entry["mtime_ns"], entry["size"]):
+                if signature is None or signature[1] != entry["size"] or _sha256(path) != entry["sha256"]:
+                    logger.info(f"Manifest snapshot is stale ({path.name} changed); parsing YAML")
+                    return False
+            data = entry.get("manifest")
+            sources[path] = (signature, SkillManifest.model_construct(**data) if data else None)
+
+        self._sources = sources
+        logger.info(f"Loaded {len(sources)} skill manifests from snapshot {self.snapshot_path}")
+        return True
+
+    def compile_snapshot(self, output: Optional[Path] = None) -> Path:
+        """
+        Parse and validate every manifest and write the snapshot.
+
+        Args:
+            output: Snapshot path (default: ``self.snapshot_path``)
+
+        Returns:
+            Path of the written snapshot
+
+        Raises:
+            Exception: If any manifest fails to parse or validate
+        """
+        output = Path(output) if output else self.snapshot_path
+        files = []
+        for path, signature in self._scan().items():
+            manifest = self._load_manifest(path)
+            files.append({
+                "file": path.name,
+                "mtime_ns": signature[0] if signature else None,
+                "size": signature[1] if signature else None,
+                "sha256": _sha256(path),
+                "manifest": manifest.model_dump(exclude_unset=True) if manifest else None,
+            })
+        snapshot = {
+            "format": SNAPSHOT_FORMAT,
+            "schema": _schema_fingerprint(),
+            "cli_dir": str(config.cli_dir),
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "files": files,
+        }
+
+        # Atomic replace so a concurrently starting worker never reads half a file
+        output.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=output.name, suffix=".tmp", dir=output.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, ensure_ascii=False, indent=1)
+            os.replace(tmp_path, output)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+        return output
+
+    def _scan(self) -> Dict[Path, FileSignature]:
+        """Current manifest files and their signatures."""
         if not self.skills_dir.exists():
             logger.warning(
                 f"Skills directory does not exist: {self.skills_dir}"
             )
-            return
+            return {}
 
         if not self.skills_dir.is_dir():
             logger.warning(
                 f"Skills path is not a directory: {self.skills_dir}"
             )
-            return
+            return {}
+
+        return {path: _signature(path) for path in sorted(self.skills_dir.glob("*.yaml"))}
+
+    def refresh(self, full: bool = False) -> Set[str]:
+        """
+        Bring the registry in line with the files on disk.
+
+        Only manifests whose mtime/size changed are re-parsed. A manifest
+        that fails to parse keeps its previous version, so a bad edit never
+        makes a loaded skill disappear.
 
-        for yaml_file in self.skills_dir.glob("*.yaml"):
+        Args:
+            full: Re-parse every manifest regardless of signatures
+
+        Returns:
+            IDs of skills that were added, changed, removed, or whose entry
+            script changed
+        """
+        with self._refresh_lock:
+            current = self._scan()
+            sources = dict(self._sources)
+            changed: Set[str] = set()
+
+            for path in list(sources):
+                if path not in current:
+                    _, old = sources.pop(path)
+                    if old:
+                        changed.add(old.id)
+                        logger.info(f"Removed skill manifest: {old.id}")
+
+            for path, signature in current.items():
+                previous = sources.get(path)
+                if not full and previous and previous[0] == signature:
+                    continue
+                old = previous[1] if previous else None
+                try:
+                    manifest = self._load_manifest(path)
+                except Exception as e:
+                    logger.error(f"Failed to load manifest from {path}: {e}")
+                    # Keep serving the last good manifest (if any) and
+                    # don't retry until the file changes again
+                    sources[path] = (signature, old)
+                    continue
+                sources[path] = (signature, manifest)
+                if manifest != old:
+                    if old:
+                        changed.add(old.id)
+                    if manifest:
+                        changed.add(manifest.id)
+                        logger.info(f"Loaded skill manifest: {manifest.id}")
+
+            manifests = {m.id: m for _, m in sources.values() if m}
+
+            # Entry scripts: a changed script invalidates warm workers
+            scripts: Dict[str, FileSignature] = {}
+            for skill_id, manifest in manifests.items():
+                signature = _signature(self._entry_path(manifest))
+                scripts[skill_id] = signature
+                if skill_id in self._scripts and self._scripts[skill_id] != signature:
+                    changed.add(skill_id)
+                    logger.info(f"Skill script changed: {skill_id}")
+
+            self._sources = sources
+            self._scripts = scripts
+            if changed or full or self.version == 0:
+                # Single reference swap: readers see the old or the new map
+                self._manifests = MappingProxyType(manifests)
+                self.version += 1
+            listeners = list(self._listeners) if changed else []
+
+        for listener in listeners:
             try:
-                manifest = self._load_manifest(yaml_file)
-                if manifest:
-                    self._manifests[manifest.id] = manifest
-                    logger.info(f"Loaded skill manifest: {manifest.id}")
+                listener(changed)
             except Exception as e:
-                logger.error(
-                    f"Failed to load manifest from {yaml_file}: {e}",
-                    exc_info=True,
-                )
+                logger.error(f"Registry listener failed: {e}", exc_info=True)
+        return changed
+
+    def _entry_path(self, manifest: SkillManifest) -> Path:
+        """Resolve a manifest entry the way the runner does."""
+        if manifest.entry and manifest.runtime == "exec":
+            return resolve_executable(manifest.entry)
+        if manifest.entry:
+            return Path(manifest.entry).resolve()
+        return config.get_skill_script_path(manifest.id).resolve()
+
+    def add_listener(self, callback: Callable[[Set[str]], None]) -> None:
+        """
+        Register a callback invoked with the changed skill IDs after each
+        refresh that changed something.
+        """
+        self._listeners.append(callback)
+
+    def watch_paths(self) -> List[Path]:
+        """Directories holding manifests and entry scripts."""
+        paths = {self.skills_dir.resolve()}
+        for manifest in self._manifests.values():
+            paths.add(self._entry_path(manifest).parent)
+        return sorted(p for p in paths if p.is_dir())
 
     def _load_manifest(self, yaml_path: Path) -> Optional[SkillManifest]:
         """
@@ -78,7 +324,7 @@ class SkillRegistry:
             return None
 
         try:
-            data = yaml.safe_load(content)
+            data = yaml.load(content, Loader=_YAML_LOADER)
             if not data:
                 return None
 
@@ -88,11 +334,15 @@ class SkillRegistry:
             
             # Validate id format
             import re
-            if not re.match(r"^[a-z0-9-]+$", data["id"]):
-                raise ValueError(f"Invalid skill id format: {data['id']}. Only lowercase letters, numbers, and hyphens are allowed.")
-
-            # Set default entry path if not specified
-            if "entry" not in data or not data["entry"]:
+            if not re.match(r"^[a-z0-9_-]+$", data["id"]):
+                raise ValueError(f"Invalid skill id format: {data['id']}. Only lowercase letters, numbers, underscores, and hyphens are allowed.")
+
+            # Set default entry path if not specified (Python CLI skills only)
+            if (
+                data.get("type", "cli") == "cli"
+                and data.get("runtime", "python") == "python"
+                and not data.get("entry")
+            ):
                 data["entry"] = str(
                     config.cli_dir / f"{data['id']}.py"
                 )
@@ -127,9 +377,8 @@ class SkillRegistry:
         return list(self._manifests.keys())
 
     def reload(self) -> None:
-        """Reload all manifests from disk."""
-        self._manifests.clear()
-        self._load_all()
+        """Reload all manifests from disk (atomically replaces the registry)."""
+        self.refresh(full=True)
 
 
 # Global registry instance
@@ -1,9 +1,29 @@
 """Skill Runners - execution strategies for different skill types."""
 
-from .base import SkillRunner
-from .cli_python import CLIPythonRunner
+import logging
+import threading
 
-__all__ = ["SkillRunner", "CLIPythonRunner", "RunnerFactory"]
+from ..config import config
+from .base import PhaseTimer, SkillRunner
+from .cli_python import CLIPythonRunner
+from .exec import CLIExecRunner
+from .http import HTTPRunner
+from .pool import InProcessPythonRunner, PooledPythonRunner
+from .remote import RemoteRunner, get_remote_runner
+
+__all__ = [
+    "PhaseTimer",
+    "SkillRunner",
+    "CLIPythonRunner",
+    "CLIExecRunner",
+    "PooledPythonRunner",
+    "InProcessPythonRunner",
+    "HTTPRunner",
+    "RemoteRunner",
+    "RunnerFactory",
+]
+
+logger = logging.getLogger(__name__)
 
 
 class RunnerFactory:
@@ -11,6 +31,7 @@ class RunnerFactory:
 
     def __init__(self):
         self._runners: dict[str, SkillRunner] = {}
+        self._lock = threading.Lock()
 
     def get_runner(self, manifest) -> SkillRunner:
         """
@@ -25,15 +46,60 @@ class RunnerFactory:
         Raises:
             ValueError: If no runner is available for the manifest type/runtime
         """
-        # Create a key from type and runtime
-        key = f"{manifest.type}:{manifest.runtime}"
+        # Create a key from type, runtime and execution mode; one runner
+        # (and connection pool) serves every HTTP skill, one every remote skill
+        if manifest.placement == "remote" and config.nodes:
+            key = "remote"
+        elif manifest.type == "http":
+            key = "http"
+        else:
+            key = f"{manifest.type}:{manifest.runtime}:{manifest.mode}"
+
+        # Return cached runner or create new one; a runner owns worker pools,
+        # so a duplicate lost to a race would leak workers nothing can close
+        runner = self._runners.get(key)
+        if runner is None:
+            with self._lock:
+                runner = self._runners.get(key)
+                if runner is None:
+                    runner = self._runners[key] = self._create_runner(manifest)
+        return runner
+
+    def invalidate(self, skill_ids) -> None:
+        """
+        Tell every runner that these skills changed.
+
+        Registered as a SkillRegistry listener.
+
+        Args:
+            skill_ids: Iterable of changed skill IDs
+        """
+        for runner in list(self._runners.values()):
+            for skill_id in skill_ids:
+                runner.invalidate(skill_id)
 
-        # Return cached runner or create new one
-        if key not in self._runners:
-            runner = self._create_runner(manifest)
-            self._runners[key] = runner
+    def warm(self, registry) -> None:
+        """
+        Warm the runners of every registered skill (start pooled workers,
+        import in-process skills, open the HTTP client).
 
-        return self._runners[key]
+        Args:
+            registry: SkillRegistry
+        """
+        for skill_id in registry.list_skills():
+            manifest = registry.get_skill(skill_id)
+            if manifest is None:
+                continue
+            try:
+                self.get_runner(manifest).warm(manifest)
+            except Exception as e:
+                # Best effort: the skill's first call reports the real error
+                logger.warning(f"Failed to warm runner for {skill_id}: {e}")
+
+    def close(self) -> None:
+        """Shut down every runner's long-lived resources."""
+        for runner in list(self._runners.values()):
+            runner.close()
 
     def _create_runner(self, manifest) -> SkillRunner:
         """
@@ -48,18 +114,25 @@ class RunnerFactory:
         Raises:
             ValueError: If runner type/runtime is not supported
         """
+        if manifest.placement == "remote" and config.nodes:
+            return get_remote_runner()
+
         if manifest.type == "cli" and manifest.runtime == "python":
+            if manifest.mode in ("pool", "forkserver"):
+                return PooledPythonRunner()
+            if manifest.mode == "inprocess":
+                return InProcessPythonRunner()
             return CLIPythonRunner()
 
+        if manifest.type == "cli" and manifest.runtime == "exec":
+            return CLIExecRunner()
+
+        if manifest.type == "http":
+            return HTTPRunner()
+
         # Future extensions:
-        # elif manifest.type == "cli" and manifest.runtime == "exec":
-        #     return CLIExecRunner()
-        # elif manifest.type == "http":
-        #     return HTTPRunner()
         # elif manifest.type == "docker":
         #     return DockerRunner()
-        # elif manifest.type == "inproc":
-        #     return InProcRunner()
 
         raise ValueError(
             f"Unsupported runner type: {manifest.type}:{manifest.runtime}"
@@ -74,6 +147,9 @@ def get_factory() -> RunnerFactory:
     """Get the global runner factory instance."""
     global _factory
     if _factory is None:
+        from ..registry import get_registry
+
         _factory = RunnerFactory()
+        get_registry().add_listener(_factory.invalidate)
     return _factory
 
@@ -1,10 +1,44 @@
 """Base runner interface."""
 
+import time
 from abc import ABC, abstractmethod
+from typing import Dict
 
 from ..models import NormalizedSkillResult
 
 
+class PhaseTimer:
+    """
+    Monotonic stopwatch splitting one invocation into named phases.
+
+    Each ``mark(phase)`` charges the time since the previous mark (or since
+    construction) to ``phase``. Timestamps come from ``perf_counter_ns`` so
+    phases are immune to wall-clock adjustments.
+    """
+
+    __slots__ = ("_start_ns", "_last_ns", "phases")
+
+    def __init__(self):
+        self._start_ns = self._last_ns = time.perf_counter_ns()
+        self.phases: Dict[str, int] = {}
+
+    def mark(self, phase: str) -> None:
+        """Charge the time since the previous mark to ``phase``."""
+        now = time.perf_counter_ns()
+        self.phases[phase] = self.phases.get(phase, 0) + now - self._last_ns
+        self._last_ns = now
+
+    def elapsed_ms(self) -> int:
+        """Milliseconds since the timer started."""
+        return (time.perf_counter_ns() - self._start_ns) // 1_000_000
+
+    def as_ms(self) -> Dict[str, float]:
+        """Phase durations plus ``total`` in milliseconds."""
+        timings = {phase: round(ns / 1e6, 3) for phase, ns in self.phases.items()}
+        timings["total"] = round((time.perf_counter_ns() - self._start_ns) / 1e6, 3)
+        return timings
+
+
 class SkillRunner(ABC):
     """Abstract base class for skill runners."""
 
@@ -30,3 +64,26 @@ class SkillRunner(ABC):
         """
         pass
 
+    def invalidate(self, skill_id: str) -> None:
+        """
+        Drop any state cached for a skill (e.g. warm workers) after its
+        manifest or script changed. Stateless runners need not override.
+
+        Args:
+            skill_id: The skill ID
+        """
+
+    def warm(self, manifest) -> None:
+        """
+        Prepare for a skill's first call (e.g. start its workers).
+        Runners without warm state need not override.
+
+        Args:
+            manifest: SkillManifest for the skill
+        """
+
+    def close(self) -> None:
+        """
+        Release long-lived resources (worker processes) at shutdown.
+        Stateless runners need not override.
+        """
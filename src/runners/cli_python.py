@@ -1,14 +1,23 @@
 """CLI Python Runner - executes Python scripts as skills."""
 
-import json
 import logging
+import os
 import subprocess
 import sys
-import time
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
 
+from .. import codec
 from ..config import config
+from ..metrics import (
+    SKILL_CPU_SECONDS,
+    SKILL_LIMIT_EXCEEDED,
+    SKILL_MAX_RSS,
+    HANDOFF_BYTES,
+    STDOUT_BYTES,
+    SUBPROCESS_INFLIGHT,
+    observe_phases,
+)
 from ..models import (
     ErrorCode,
     ErrorDetail,
@@ -17,14 +26,87 @@ from ..models import (
     SkillMeta,
 )
 from ..security import SecurityError, ensure_within_allowed_root
-from .base import SkillRunner
+from ..slowlog import cap_input, get_slow_recorder, stderr_tail
+from . import handoff
+from .base import PhaseTimer, SkillRunner
+from .resources import build_preexec, limit_violation, rusage_dict
 
 logger = logging.getLogger(__name__)
 
+_ERROR_CODES = frozenset(code.value for code in ErrorCode)
+
 # Maximum output size (10MB)
 MAX_OUTPUT_SIZE = 10 * 1024 * 1024
 
 
+class _RusagePopen(subprocess.Popen):
+    """Popen that reaps the child with wait4() to keep its resource usage."""
+
+    rusage = None
+
+    def _try_wait(self, wait_flags):
+        if not hasattr(os, "wait4"):
+            return super()._try_wait(wait_flags)
+        try:
+            pid, sts, rusage = os.wait4(self.pid, wait_flags)
+        except ChildProcessError:
+            # Child already reaped elsewhere; status is unknown
+            return (self.pid, 0)
+        if pid == self.pid:
+            self.rusage = rusage
+        return (pid, sts)
+
+
+def _decode(output: bytes) -> str:
+    return output.decode("utf-8", errors="replace")
+
+
+def _preview(output: bytes | str, limit: int = 200) -> str:
+    """The first ``limit`` characters of skill output, for error details."""
+    if isinstance(output, bytes):
+        return _decode(output[:limit])
+    return output[:limit]
+
+
+def _passthrough_result(envelope: Dict[str, Any]) -> NormalizedSkillResult | None:
+    """
+    Build a result from a well-formed skill envelope without validating ``data``.
+
+    The payload was just decoded from JSON, so it needs no deep validation;
+    only the small top-level fields are checked. ``data`` is kept as-is (not
+    copied) so the response can serialize it straight back out.
+
+    Returns:
+        The result, or None if the envelope needs the validating path
+    """
+    success = envelope.get("success")
+    data = envelope.get("data")
+    error = envelope.get("error")
+    meta = envelope.get("meta")
+    if not isinstance(success, bool) or not (data is None or isinstance(data, dict)):
+        return None
+    if error is not None and not (
+        isinstance(error, dict)
+        and error.get("code") in _ERROR_CODES
+        and isinstance(error.get("message"), str)
+        and isinstance(error.get("details"), (dict, type(None)))
+    ):
+        return None
+    if meta is not None and not isinstance(meta, dict):
+        return None
+    try:
+        return NormalizedSkillResult.model_construct(
+            success=success,
+            skill_id=envelope["skill_id"],
+            trace_id=envelope["trace_id"],
+            data=data,
+            error=ErrorDetail(**error) if error is not None else None,
+            meta=SkillMeta(**meta) if meta is not None else None,
+        )
+    except Exception:
+        return None
+
+
 class CLIPythonRunner(SkillRunner):
     """Runner for executing Python CLI scripts."""
 
@@ -45,26 +127,83 @@ class CLIPythonRunner(SkillRunner):
             manifest: Optional SkillManifest (used for timeout override)
 
         Returns:
-            NormalizedSkillResult
+            NormalizedSkillResult (``meta.timings`` holds the phase breakdown)
         """
-        start_time = time.time()
+        timer = PhaseTimer()
+        process_info: Dict[str, Any] = {}
+        result = self._invoke(skill_id, input_data, trace_id, manifest, timer, process_info)
+        if "parse" in timer.phases:
+            timer.mark("build")
+        observe_phases(skill_id, timer.phases)
+        if result.meta is None:
+            result.meta = SkillMeta(latency_ms=timer.elapsed_ms())
+        timings = timer.as_ms()
+        result.meta.timings = timings
+        resources = rusage_dict(process_info.get("rusage"))
+        if resources:
+            result.meta.resources = resources
+            SKILL_CPU_SECONDS.labels(skill_id).observe(resources["user_cpu_s"] + resources["sys_cpu_s"])
+            SKILL_MAX_RSS.labels(skill_id).observe(resources["max_rss_kb"] * 1024)
 
-        # Determine script path
-        if manifest and manifest.entry:
-            script_path = Path(manifest.entry)
-        else:
-            script_path = config.get_skill_script_path(skill_id)
+        # Failures caused by a manifest resource limit get their own code
+        if not result.success and "returncode" in process_info:
+            violation = limit_violation(
+                manifest,
+                process_info["returncode"],
+                resources,
+                process_info.get("stderr"),
+                result.error.details if result.error else None,
+            )
+            if violation:
+                resource_name, message = violation
+                SKILL_LIMIT_EXCEEDED.labels(skill_id, resource_name).inc()
+                result.error = ErrorDetail(
+                    code=ErrorCode.RESOURCE_EXHAUSTED,
+                    message=message,
+                    details={"resource": resource_name, "exit_code": process_info["returncode"]},
+                )
 
-        # Resolve script path
-        script_path = script_path.resolve()
-        
-        # Validate script path is within skill_cli directory (security)
-        # Note: skill_cli is different from allowed_root (data directory)
-        cli_dir_resolved = config.cli_dir.resolve()
-        try:
-            script_path.relative_to(cli_dir_resolved)
-        except ValueError:
-            latency_ms = int((time.time() - start_time) * 1000)
+        def _snapshot() -> Dict[str, Any]:
+            return {
+                "trace_id": trace_id,
+                **cap_input(input_data),
+                "success": result.success,
+                "error_code": result.error.code.value if result.error else None,
+                "timings": timings,
+                "exit_code": process_info.get("returncode"),
+                "stderr_tail": stderr_tail(process_info.get("stderr")),
+                "rusage": resources,
+            }
+
+        get_slow_recorder().observe(
+            skill_id,
+            timings["total"],
+            _snapshot,
+            threshold_ms=manifest.slow_threshold_ms if manifest else None,
+        )
+        return result
+
+    def _invoke(
+        self,
+        skill_id: str,
+        input_data: dict,
+        trace_id: str,
+        manifest: SkillManifest | None,
+        timer: PhaseTimer,
+        process_info: Dict[str, Any],
+    ) -> NormalizedSkillResult:
+        """
+        Run the skill, marking phases on ``timer`` as they complete.
+
+        ``process_info`` receives the child's return code, stderr and
+        resource usage for the slow-call recorder.
+        """
+        script_path = self._script_path(skill_id, manifest)
+
+        # Validate the entry may be run (security)
+        forbidden = self._forbidden_reason(script_path)
+        if forbidden:
+            latency_ms = timer.elapsed_ms()
             return NormalizedSkillResult(
                 success=False,
                 skill_id=skill_id,
@@ -72,14 +211,14 @@ class CLIPythonRunner(SkillRunner):
                 data=None,
                 error=ErrorDetail(
                     code=ErrorCode.FORBIDDEN_PATH,
-                    message=f"Script path is outside skill_cli directory ({cli_dir_resolved}): {script_path}",
+                    message=forbidden,
                 ),
                 meta=SkillMeta(latency_ms=latency_ms),
             )
 
         # Check if script exists and is a file
         if not script_path.exists():
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = timer.elapsed_ms()
             return NormalizedSkillResult(
                 success=False,
                 skill_id=skill_id,
@@ -93,7 +232,7 @@ class CLIPythonRunner(SkillRunner):
             )
         
         if not script_path.is_file():
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = timer.elapsed_ms()
             return NormalizedSkillResult(
                 success=False,
                 skill_id=skill_id,
@@ -106,6 +245,8 @@ class CLIPythonRunner(SkillRunner):
                 meta=SkillMeta(latency_ms=latency_ms),
             )
 
+        timer.mark("validate")
+
         # Determine timeout
         timeout_ms = (
             manifest.timeout_ms if manifest and manifest.timeout_ms else config.timeout_ms
@@ -114,9 +255,9 @@ class CLIPythonRunner(SkillRunner):
 
         # Prepare input JSON
         try:
-            input_json = json.dumps({"input": input_data}, ensure_ascii=False)
+            input_json = codec.dumps({"input": input_data})
         except Exception as e:
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = timer.elapsed_ms()
             return NormalizedSkillResult(
                 success=False,
                 skill_id=skill_id,
@@ -130,18 +271,16 @@ class CLIPythonRunner(SkillRunner):
                 meta=SkillMeta(latency_ms=latency_ms),
             )
 
+        timer.mark("serialize")
+
         # Execute the script
+        SUBPROCESS_INFLIGHT.inc()
         try:
-            result = subprocess.run(
-                [sys.executable, str(script_path)],
-                input=input_json,
-                text=True,
-                capture_output=True,
-                timeout=timeout_seconds,
-                cwd=config.cli_dir.parent,  # Run from project root
+            result = self._execute(
+                script_path, input_data, input_json, manifest, timeout_seconds, timer, process_info
             )
         except subprocess.TimeoutExpired:
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = timer.elapsed_ms()
             return NormalizedSkillResult(
                 success=False,
                 skill_id=skill_id,
@@ -154,7 +293,7 @@ class CLIPythonRunner(SkillRunner):
                 meta=SkillMeta(latency_ms=latency_ms),
             )
         except Exception as e:
-            latency_ms = int((time.time() - start_time) * 1000)
+            latency_ms = timer.elapsed_ms()
             return NormalizedSkillResult(
                 success=False,
                 skill_id=skill_id,
@@ -167,19 +306,42 @@ class CLIPythonRunner(SkillRunner):
                 ),
                 meta=SkillMeta(latency_ms=latency_ms),
             )
+        finally:
+            SUBPROCESS_INFLIGHT.dec()
+            timer.mark("execute")
 
-        latency_ms = int((time.time() - start_time) * 1000)
+        return self._build_result(
+            skill_id, trace_id, result, manifest, timer, process_info.get("codec", codec.JSON)
+        )
+
+    def _build_result(
+        self,
+        skill_id: str,
+        trace_id: str,
+        result: subprocess.CompletedProcess,
+        manifest: SkillManifest | None,
+        timer: PhaseTimer,
+        output_codec: codec.Codec = codec.JSON,
+    ) -> NormalizedSkillResult:
+        """
+        Turn the skill's output (an envelope on stdout, JSON unless a pooled
+        worker negotiated another ``output_codec``) into a result.
+        """
+        latency_ms = timer.elapsed_ms()
+        STDOUT_BYTES.labels(skill_id).inc(len(result.stdout))
 
         # Log stderr for debugging (even on success)
-        if result.stderr:
+        if result.stderr and logger.isEnabledFor(logging.DEBUG):
             logger.debug(
-                f"Skill stderr output: {result.stderr[:500]}",
+                "Skill stderr output: %s",
+                result.stderr[:500],
                 extra={"skill_id": skill_id, "trace_id": trace_id},
             )
 
         # Parse output with size limit
-        output_text = result.stdout.strip()
-        if not output_text and result.stderr:
+        binary = output_codec is not codec.JSON
+        output_text = result.stdout if binary else result.stdout.strip()
+        if not output_text and result.stderr and not binary:
             # Try stderr if stdout is empty
             output_text = result.stderr.strip()
         
@@ -212,7 +374,7 @@ class CLIPythonRunner(SkillRunner):
                     message="Skill script produced no output",
                     details={
                         "exit_code": result.returncode,
-                        "stdout": result.stdout[:200] if result.stdout else None,
+                        "stdout": _preview(result.stdout) if result.stdout else None,
                         "stderr": result.stderr[:200] if result.stderr else None,
                     },
                 ),
@@ -221,8 +383,10 @@ class CLIPythonRunner(SkillRunner):
 
         # Try to parse JSON output
         try:
-            output_data = json.loads(output_text)
-        except json.JSONDecodeError as e:
+            output_data = output_codec.loads(output_text)
+            timer.mark("parse")
+        except ValueError as e:
+            # json.JSONDecodeError and msgpack's unpack errors are ValueErrors
             return NormalizedSkillResult(
                 success=False,
                 skill_id=skill_id,
@@ -230,11 +394,11 @@ class CLIPythonRunner(SkillRunner):
                 data=None,
                 error=ErrorDetail(
                     code=ErrorCode.INTERNAL,
-                    message="Failed to parse skill output as JSON",
+                    message=f"Failed to parse skill output as {output_codec.name if binary else 'JSON'}",
                     details={
                         "exit_code": result.returncode,
                         "json_error": str(e),
-                        "output_preview": output_text[:200],
+                        "output_preview": _preview(output_text),
                     },
                 ),
                 meta=SkillMeta(latency_ms=latency_ms),
@@ -249,6 +413,9 @@ class CLIPythonRunner(SkillRunner):
                 output_data["trace_id"] = trace_id
                 # Ensure skill_id matches
                 output_data["skill_id"] = skill_id
+                fast = _passthrough_result(output_data)
+                if fast is not None:
+                    return fast
                 try:
                     return NormalizedSkillResult(**output_data)
                 except Exception as e:
@@ -289,3 +456,164 @@ class CLIPythonRunner(SkillRunner):
                 meta=SkillMeta(latency_ms=latency_ms),
             )
 
+    @staticmethod
+    def _forbidden_reason(script_path: Path) -> str | None:
+        """Why the entry must not run, or None if it may."""
+        # Note: skill_cli is different from allowed_root (data directory)
+        cli_dir_resolved = config.cli_dir.resolve()
+        try:
+            script_path.relative_to(cli_dir_resolved)
+        except ValueError:
+            return f"Script path is outside skill_cli directory ({cli_dir_resolved}): {script_path}"
+        return None
+
+    @staticmethod
+    def _script_path(skill_id: str, manifest: SkillManifest | None) -> Path:
+        """Resolved script path: the manifest entry, else skill_cli/<id>.py."""
+        if manifest and manifest.entry:
+            return Path(manifest.entry).resolve()
+        return config.get_skill_script_path(skill_id).resolve()
+
+    def _execute(
+        self,
+        script_path: Path,
+        input_data: dict,
+        input_json: bytes,
+        manifest: SkillManifest | None,
+        timeout_seconds: float,
+        timer: PhaseTimer,
+        process_info: Dict[str, Any],
+    ) -> subprocess.CompletedProcess:
+        """
+        Run one request against the skill script and return its output.
+
+        One fresh interpreter per call; subclasses override this to reuse
+        workers. ``stdout`` holds the skill's JSON envelope (bytes).
+
+        Raises:
+            subprocess.TimeoutExpired: If the skill exceeds the timeout
+        """
+        return self._run_process(
+            [sys.executable, str(script_path)],
+            input_json,
+            timeout_seconds,
+            self._build_env(manifest),
+            timer,
+            process_info,
+            preexec_fn=build_preexec(manifest),
+        )
+
+    def _run_process(
+        self,
+        argv: List[str],
+        input_json: bytes,
+        timeout_seconds: float,
+        env: Dict[str, str],
+        timer: PhaseTimer,
+        process_info: Dict[str, Any],
+        preexec_fn=None,
+        handoff_enabled: bool = True,
+        posix_spawn: bool = False,
+    ) -> subprocess.CompletedProcess:
+        """
+        Spawn the skill and collect its output.
+
+        Equivalent to ``subprocess.run(..., capture_output=True)`` but split
+        so that process creation (fork/exec) is timed as its own ``spawn``
+        phase, separate from interpreter start-up and skill execution.
+
+        Payloads of at least ``OPENSKILL_HANDOFF_BYTES`` travel through
+        memfds instead of the pipes (see ``handoff``): the input is written
+        once into a sealed memfd the child maps, and the child may return a
+        large envelope through an output memfd.
+
+        With ``posix_spawn`` (for children that need no pre-exec setup),
+        Popen is allowed to use posix_spawn() instead of fork()+exec(): no
+        close_fds sweep (descriptors are non-inheritable by default, PEP
+        446), no memfd handoff, and no chdir when the host already runs
+        from the project root. A ``preexec_fn`` (resource limits) still
+        forces fork()+exec().
+
+        Raises:
+            subprocess.TimeoutExpired: If the skill exceeds the timeout
+        """
+        handoff_fds: List[int] = []
+        output_fd = None
+        try:
+            if handoff_enabled and handoff.SUPPORTED and config.handoff_bytes:
+                output_fd = handoff.output_fd()
+                handoff_fds.append(output_fd)
+                env[handoff.OUTPUT_FD_ENV] = str(output_fd)
+                env[handoff.THRESHOLD_ENV] = str(config.handoff_bytes)
+                if len(input_json) >= config.handoff_bytes:
+                    input_fd = handoff.input_fd(input_json)
+                    handoff_fds.append(input_fd)
+                    env[handoff.INPUT_FD_ENV] = str(input_fd)
+                    HANDOFF_BYTES.labels("input").inc(len(input_json))
+                    input_json = b""
+
+            cwd = config.cli_dir.parent  # Run from project root
+            spawn = posix_spawn and preexec_fn is None and not handoff_fds
+            process = _RusagePopen(
+                argv,
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                cwd=None if spawn and Path.cwd() == cwd else cwd,
+                env=env,
+                preexec_fn=preexec_fn,
+                pass_fds=handoff_fds,
+                close_fds=not spawn,
+            )
+            timer.mark("spawn")
+            with process:
+                try:
+                    stdout, stderr = process.communicate(input_json, timeout=timeout_seconds)
+                except subprocess.TimeoutExpired:
+                    process.kill()
+                    _, stderr = process.communicate()
+                    process_info.update(
+                        returncode=process.returncode, stderr=_decode(stderr), rusage=process.rusage
+                    )
+                    raise
+            if output_fd is not None and not stdout:
+                stdout = handoff.read_output(output_fd)
+                if stdout:
+                    HANDOFF_BYTES.labels("output").inc(len(stdout))
+        finally:
+            for fd in handoff_fds:
+                os.close(fd)
+        stderr = _decode(stderr)
+        process_info.update(returncode=process.returncode, stderr=stderr, rusage=process.rusage)
+        return subprocess.CompletedProcess(argv, process.returncode, stdout, stderr)
+
+    def _build_env(self, manifest: SkillManifest | None) -> Dict[str, str]:
+        """
+        Build the child environment.
+
+        Skills that read or write files resolve paths against
+        OPENSKILL_ALLOWED_ROOT. A manifest ``allowed_root`` (relative to the
+        project root) may narrow the global root but never widen it.
+
+        Args:
+            manifest: Optional SkillManifest
+
+        Returns:
+            Environment mapping for the child process
+        """
+        env = dict(os.environ)
+        env["OPENSKILL_ALLOWED_ROOT"] = str(self._allowed_root(manifest))
+        return env
+
+    @staticmethod
+    def _allowed_root(manifest: SkillManifest | None) -> Path:
+        """The global allowed root, narrowed by the manifest if it asks to."""
+        allowed_root = config.allowed_root
+        if manifest and manifest.allowed_root:
+            narrowed = (config.cli_dir.parent / manifest.allowed_root).resolve()
+            try:
+                narrowed.relative_to(allowed_root)
+                allowed_root = narrowed
+            except ValueError:
+                pass
+        return allowed_root
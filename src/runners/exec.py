@@ -0,0 +1,242 @@
+"""CLI Exec Runner - launches allow-listed native executables as skills."""
+
+import logging
+import re
+import subprocess
+from pathlib import Path
+from typing import Any, Dict, List
+
+from .. import codec
+from ..metrics import STDOUT_BYTES
+from ..models import (
+    ErrorCode,
+    ErrorDetail,
+    NormalizedSkillResult,
+    SkillManifest,
+    SkillMeta,
+)
+from ..security import SecurityError, is_allowed_executable, resolve_executable
+from ..slowlog import stderr_tail
+from .base import PhaseTimer
+from .cli_python import MAX_OUTPUT_SIZE, CLIPythonRunner, _preview
+from .resources import build_preexec
+
+logger = logging.getLogger(__name__)
+
+# {field} or {field:path}; {{ and }} are literal braces
+_PLACEHOLDER = re.compile(r"\{\{|\}\}|\{([A-Za-z_][A-Za-z0-9_]*)(?::(path))?\}")
+
+
+def _render_value(name: str, value: Any, conversion: str | None, allowed_root: Path) -> str:
+    if conversion == "path":
+        if not isinstance(value, str) or not value:
+            raise ValueError(f'Field "{name}" must be a non-empty path string')
+        if Path(value).is_absolute():
+            raise SecurityError(f'Field "{name}": absolute paths are not allowed: {value}')
+        resolved = (allowed_root / value).resolve()
+        if not resolved.is_relative_to(allowed_root):
+            raise SecurityError(f'Field "{name}": path is outside allowed root ({allowed_root}): {value}')
+        return str(resolved)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, (str, int, float)):
+        return str(value)
+    raise ValueError(f'Field "{name}" must be a string, number or boolean')
+
+
+def render_args(template: List[str], input_data: Dict[str, Any], allowed_root: Path) -> List[str]:
+    """
+    Fill an argv template from the skill input.
+
+    A token that is exactly ``{field}`` expands to one argument per item
+    when the field is a list. ``{field:path}`` resolves a relative path
+    inside ``allowed_root``. Values are never passed through a shell, but a
+    value that would start a new option (leading ``-``) is rejected unless
+    the template has a ``--`` before it.
+
+    Args:
+        template: Manifest ``args``
+        input_data: Skill input
+        allowed_root: Root for ``:path`` placeholders
+
+    Returns:
+        The arguments (without the executable)
+
+    Raises:
+        ValueError: If a field is missing or has an unsupported type
+        SecurityError: If a path escapes ``allowed_root`` or a value looks
+            like an option
+    """
+    argv: List[str] = []
+    options_ended = False
+
+    def _lookup(name: str) -> Any:
+        if name not in input_data or input_data[name] is None:
+            raise ValueError(f'Field "{name}" is required')
+        return input_data[name]
+
+    def _checked(token: str, arg: str) -> str:
+        if not options_ended and arg.startswith("-") and not token.startswith("-"):
+            raise SecurityError(f'Argument must not start with "-" (add "--" before it in args): {arg}')
+        return arg
+
+    for token in template:
+        whole = _PLACEHOLDER.fullmatch(token)
+        if whole and whole.group(1):
+            name, conversion = whole.group(1), whole.group(2)
+            value = _lookup(name)
+            for item in value if isinstance(value, list) else [value]:
+                argv.append(_checked(token, _render_value(name, item, conversion, allowed_root)))
+        else:
+            def _substitute(match: re.Match) -> str:
+                if match.group(0) in ("{{", "}}"):
+                    return match.group(0)[0]
+                name = match.group(1)
+                return _render_value(name, _lookup(name), match.group(2), allowed_root)
+
+            argv.append(_checked(token, _PLACEHOLDER.sub(_substitute, token)))
+        if token == "--":
+            options_ended = True
+    return argv
+
+
+class CLIExecRunner(CLIPythonRunner):
+    """
+    Runner for native executables (manifest ``runtime: exec``).
+
+    ``entry`` is the executable (a path, or a name looked up on PATH); it
+    must live under OPENSKILL_CLI_DIR or be listed in
+    OPENSKILL_EXEC_ALLOWLIST. Without ``args`` the executable follows the
+    same stdin/stdout JSON contract as Python skills. With ``args`` the
+    input fills the argv template instead of stdin, and ``output_format``
+    says how to read stdout. Timeout, output cap, cwd and resource limits
+    behave as for Python skills; children without resource limits are
+    started with posix_spawn() where available.
+    """
+
+    def _script_path(self, skill_id: str, manifest: SkillManifest | None) -> Path:
+        if manifest and manifest.entry:
+            return resolve_executable(manifest.entry)
+        return super()._script_path(skill_id, manifest)
+
+    @staticmethod
+    def _forbidden_reason(script_path: Path) -> str | None:
+        if is_allowed_executable(script_path):
+            return None
+        return f"Executable is not allow-listed (OPENSKILL_EXEC_ALLOWLIST): {script_path}"
+
+    def _invoke(
+        self,
+        skill_id: str,
+        input_data: dict,
+        trace_id: str,
+        manifest: SkillManifest | None,
+        timer: PhaseTimer,
+        process_info: Dict[str, Any],
+    ) -> NormalizedSkillResult:
+        # Reject input the argv template cannot take before spawning anything
+        if manifest is not None and manifest.args is not None:
+            try:
+                render_args(manifest.args, input_data, self._allowed_root(manifest))
+            except (ValueError, SecurityError) as e:
+                return NormalizedSkillResult(
+                    success=False,
+                    skill_id=skill_id,
+                    trace_id=trace_id,
+                    data=None,
+                    error=ErrorDetail(
+                        code=ErrorCode.FORBIDDEN_PATH
+                        if isinstance(e, SecurityError)
+                        else ErrorCode.INVALID_ARGUMENT,
+                        message=str(e),
+                    ),
+                    meta=SkillMeta(latency_ms=timer.elapsed_ms()),
+                )
+        return super()._invoke(skill_id, input_data, trace_id, manifest, timer, process_info)
+
+    def _execute(
+        self,
+        script_path: Path,
+        input_data: dict,
+        input_json: bytes,
+        manifest: SkillManifest | None,
+        timeout_seconds: float,
+        timer: PhaseTimer,
+        process_info: Dict[str, Any],
+    ) -> subprocess.CompletedProcess:
+        argv = [str(script_path)]
+        stdin = input_json
+        if manifest is not None and manifest.args is not None:
+            argv += render_args(manifest.args, input_data, self._allowed_root(manifest))
+            stdin = b""
+        return self._run_process(
+            argv,
+            stdin,
+            timeout_seconds,
+            self._build_env(manifest),
+            timer,
+            process_info,
+            preexec_fn=build_preexec(manifest),
+            handoff_enabled=False,  # native tools don't speak the SDK's memfd protocol
+            posix_spawn=True,
+        )
+
+    def _build_result(
+        self,
+        skill_id: str,
+        trace_id: str,
+        result: subprocess.CompletedProcess,
+        manifest: SkillManifest | None,
+        timer: PhaseTimer,
+    ) -> NormalizedSkillResult:
+        output_format = manifest.output_format if manifest else "envelope"
+        if output_format == "envelope":
+            return super()._build_result(skill_id, trace_id, result, manifest, timer)
+
+        STDOUT_BYTES.labels(skill_id).inc(len(result.stdout))
+        stdout = result.stdout
+
+        def _failure(message: str, details: Dict[str, Any]) -> NormalizedSkillResult:
+            return NormalizedSkillResult(
+                success=False,
+                skill_id=skill_id,
+                trace_id=trace_id,
+                data=None,
+                error=ErrorDetail(code=ErrorCode.INTERNAL, message=message, details=details),
+                meta=SkillMeta(latency_ms=timer.elapsed_ms()),
+            )
+
+        if len(stdout) > MAX_OUTPUT_SIZE:
+            return _failure(
+                f"Skill output too large ({len(stdout)} bytes, max {MAX_OUTPUT_SIZE} bytes)",
+                {"exit_code": result.returncode},
+            )
+        if result.returncode not in (manifest.ok_exit_codes if manifest else [0]):
+            return _failure(
+                f"Skill executable exited with code {result.returncode}",
+                {"exit_code": result.returncode, "stderr": stderr_tail(result.stderr)},
+            )
+
+        try:
+            if output_format == "text":
+                data = {"stdout": stdout.decode("utf-8", errors="replace")}
+            elif output_format == "jsonl":
+                data = {"records": [codec.loads(line) for line in stdout.splitlines() if line.strip()]}
+            else:
+                value = codec.loads(stdout) if stdout.strip() else None
+                data = value if isinstance(value, dict) else {"output": value}
+        except ValueError as e:
+            return _failure(
+                "Failed to parse skill output as JSON",
+                {"exit_code": result.returncode, "json_error": str(e), "output_preview": _preview(stdout)},
+            )
+        timer.mark("parse")
+
+        return NormalizedSkillResult(
+            success=True,
+            skill_id=skill_id,
+            trace_id=trace_id,
+            data=data,
+            error=None,
+            meta=SkillMeta(latency_ms=timer.elapsed_ms()),
+        )
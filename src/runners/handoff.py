@@ -0,0 +1,58 @@
+"""Large-payload handoff to skill processes through anonymous memory files (memfd)."""
+
+import os
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+# memfd_create and file sealing are Linux-only; elsewhere payloads use the pipes
+SUPPORTED = hasattr(os, "memfd_create") and hasattr(fcntl, "F_ADD_SEALS")
+
+# Environment variables read by openskill_sdk in the child
+INPUT_FD_ENV = "OPENSKILL_INPUT_FD"
+OUTPUT_FD_ENV = "OPENSKILL_OUTPUT_FD"
+THRESHOLD_ENV = "OPENSKILL_HANDOFF_BYTES"
+
+
+def _write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def input_fd(data: bytes) -> int:
+    """
+    Put ``data`` into a sealed memfd the child can only map read-only.
+
+    One write into page cache replaces the pipe handoff, which
+    ``Popen.communicate`` performs in PIPE_BUF-sized writes that each wait
+    for the child to drain the pipe.
+
+    Returns:
+        The descriptor (close-on-exec; pass it with ``Popen(pass_fds=...)``)
+    """
+    fd = os.memfd_create("openskill-input", os.MFD_CLOEXEC | os.MFD_ALLOW_SEALING)
+    try:
+        _write_all(fd, data)
+        fcntl.fcntl(
+            fd,
+            fcntl.F_ADD_SEALS,
+            fcntl.F_SEAL_SHRINK | fcntl.F_SEAL_GROW | fcntl.F_SEAL_WRITE | fcntl.F_SEAL_SEAL,
+        )
+    except BaseException:
+        os.close(fd)
+        raise
+    return fd
+
+
+def output_fd() -> int:
+    """An empty memfd the child may write a large result envelope into."""
+    return os.memfd_create("openskill-output", os.MFD_CLOEXEC)
+
+
+def read_output(fd: int) -> bytes:
+    """Everything the child wrote to an output memfd (empty if it used stdout)."""
+    size = os.fstat(fd).st_size
+    return os.pread(fd, size, 0) if size else b""
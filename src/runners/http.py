@@ -0,0 +1,283 @@
+"""HTTP Runner - invokes skills served by separate HTTP services."""
+
+import importlib.util
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from .. import codec
+from ..config import config
+from ..metrics import observe_phases
+from ..models import (
+    ErrorCode,
+    ErrorDetail,
+    NormalizedSkillResult,
+    SkillManifest,
+    SkillMeta,
+)
+from ..slowlog import cap_input, get_slow_recorder
+from .base import PhaseTimer, SkillRunner
+from .cli_python import _passthrough_result, _preview
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional h2 package; HTTP/1.1 keep-alive otherwise
+HTTP2 = importlib.util.find_spec("h2") is not None
+
+# Error codes for failed responses that carry no result envelope
+_STATUS_ERRORS = {
+    400: ErrorCode.INVALID_ARGUMENT,
+    404: ErrorCode.NOT_FOUND,
+    408: ErrorCode.TIMEOUT,
+    413: ErrorCode.RESOURCE_EXHAUSTED,
+    422: ErrorCode.INVALID_ARGUMENT,
+    429: ErrorCode.RESOURCE_EXHAUSTED,
+    503: ErrorCode.RESOURCE_EXHAUSTED,
+    504: ErrorCode.TIMEOUT,
+}
+
+
+class HTTPRunner(SkillRunner):
+    """
+    Runner for skills served over HTTP (manifest ``type: http``).
+
+    Each call POSTs ``{"input": {...}, "trace_id": ...}`` to the manifest
+    ``endpoint``. All HTTP skills share one httpx client (keep-alive, HTTP/2
+    when h2 is installed). At most ``pool_size`` calls per endpoint are in
+    flight; further callers wait for a slot, and the wait counts against
+    ``timeout_ms``.
+
+    A response carrying a result envelope (``success`` field) is used as
+    the result; any other JSON body of a 2xx response becomes ``data``.
+    """
+
+    def __init__(self):
+        self._client: Optional[httpx.Client] = None
+        # A client inherited through fork() would share the parent's sockets
+        self._client_pid: Optional[int] = None
+        self._slots: Dict[str, Tuple[int, threading.BoundedSemaphore]] = {}
+        self._lock = threading.Lock()
+
+    def _get_client(self) -> httpx.Client:
+        with self._lock:
+            if self._client is None or self._client_pid != os.getpid():
+                self._client = httpx.Client(
+                    http2=HTTP2,
+                    limits=httpx.Limits(
+                        max_connections=config.http_max_connections,
+                        max_keepalive_connections=config.http_max_connections,
+                    ),
+                    headers={"Content-Type": codec.JSON_CONTENT_TYPE, "Accept": codec.JSON_CONTENT_TYPE},
+                )
+                self._client_pid = os.getpid()
+            return self._client
+
+    def _slot(self, endpoint: str, size: int) -> threading.BoundedSemaphore:
+        """Concurrency limit for an endpoint (replaced when its size changes)."""
+        with self._lock:
+            entry = self._slots.get(endpoint)
+            if entry is None or entry[0] != size:
+                entry = (size, threading.BoundedSemaphore(size))
+                self._slots[endpoint] = entry
+            return entry[1]
+
+    def invoke(
+        self,
+        skill_id: str,
+        input_data: dict,
+        trace_id: str,
+        manifest: SkillManifest | None = None,
+    ) -> NormalizedSkillResult:
+        """
+        Call an HTTP skill.
+
+        Args:
+            skill_id: The skill ID
+            input_data: The input data dictionary
+            trace_id: The trace ID (also sent as ``X-Trace-Id``)
+            manifest: SkillManifest with ``endpoint``
+
+        Returns:
+            NormalizedSkillResult (``meta.timings`` holds the phase breakdown)
+        """
+        timer = PhaseTimer()
+        response_info: Dict[str, Any] = {}
+        result = self._invoke(skill_id, input_data, trace_id, manifest, timer, response_info)
+        if "parse" in timer.phases:
+            timer.mark("build")
+        observe_phases(skill_id, timer.phases)
+        if result.meta is None:
+            result.meta = SkillMeta(latency_ms=timer.elapsed_ms())
+        timings = timer.as_ms()
+        result.meta.timings = timings
+
+        def _snapshot() -> Dict[str, Any]:
+            return {
+                "trace_id": trace_id,
+                **cap_input(input_data),
+                "success": result.success,
+                "error_code": result.error.code.value if result.error else None,
+                "timings": timings,
+                "endpoint": manifest.endpoint if manifest else None,
+                "status_code": response_info.get("status_code"),
+            }
+
+        get_slow_recorder().observe(
+            skill_id,
+            timings["total"],
+            _snapshot,
+            threshold_ms=manifest.slow_threshold_ms if manifest else None,
+        )
+        return result
+
+    def _invoke(
+        self,
+        skill_id: str,
+        input_data: dict,
+        trace_id: str,
+        manifest: SkillManifest | None,
+        timer: PhaseTimer,
+        response_info: Dict[str, Any],
+    ) -> NormalizedSkillResult:
+        if manifest is None or not manifest.endpoint:
+            return self._error(
+                skill_id, trace_id, timer, ErrorCode.INVALID_ARGUMENT,
+                f"Skill {skill_id} has no endpoint",
+            )
+        endpoint = manifest.endpoint
+        timer.mark("validate")
+
+        timeout_ms = manifest.timeout_ms or config.timeout_ms
+        deadline = time.monotonic() + timeout_ms / 1000.0
+
+        try:
+            body = codec.dumps({"input": input_data, "trace_id": trace_id})
+        except Exception as e:
+            return self._error(
+                skill_id, trace_id, timer, ErrorCode.INVALID_ARGUMENT,
+                "Failed to serialize input to JSON",
+                {"exception": type(e).__name__, "reason": str(e)},
+            )
+        timer.mark("serialize")
+
+        slot = self._slot(endpoint, manifest.pool_size or config.http_pool_size)
+        if not slot.acquire(timeout=max(deadline - time.monotonic(), 0.0)):
+            timer.mark("queue")
+            return self._error(
+                skill_id, trace_id, timer, ErrorCode.TIMEOUT,
+                f"No free connection to the skill service within {timeout_ms}ms",
+                {"endpoint": endpoint},
+            )
+        timer.mark("queue")
+        try:
+            # Connect, write, read and pool waits are each bounded by what
+            # is left of the skill's timeout
+            remaining = max(deadline - time.monotonic(), 0.001)
+            response = self._get_client().post(
+                endpoint,
+                content=body,
+                headers={"X-Trace-Id": trace_id},
+                timeout=httpx.Timeout(remaining),
+            )
+        except httpx.TimeoutException:
+            return self._error(
+                skill_id, trace_id, timer, ErrorCode.TIMEOUT,
+                f"Skill service timed out after {timeout_ms}ms",
+                {"endpoint": endpoint},
+            )
+        except httpx.HTTPError as e:
+            return self._error(
+                skill_id, trace_id, timer, ErrorCode.INTERNAL,
+                "Failed to call skill service",
+                {"endpoint": endpoint, "exception": type(e).__name__, "reason": str(e)},
+            )
+        finally:
+            slot.release()
+            timer.mark("execute")
+
+        response_info["status_code"] = response.status_code
+        return self._normalize(skill_id, trace_id, response, timer)
+
+    def _normalize(
+        self,
+        skill_id: str,
+        trace_id: str,
+        response: httpx.Response,
+        timer: PhaseTimer,
+    ) -> NormalizedSkillResult:
+        """Turn a skill service response into a NormalizedSkillResult."""
+        status = response.status_code
+        content = response.content
+        output: Any = None
+        parsed = False
+        if content.strip():
+            try:
+                output = codec.loads(content)
+                parsed = True
+                timer.mark("parse")
+            except ValueError:
+                pass
+
+        if isinstance(output, dict) and "success" in output:
+            output["trace_id"] = trace_id
+            output["skill_id"] = skill_id
+            fast = _passthrough_result(output)
+            if fast is not None:
+                return fast
+            try:
+                return NormalizedSkillResult(**output)
+            except Exception as e:
+                logger.warning(f"Failed to parse skill service response as NormalizedSkillResult: {e}")
+                # Fall through to wrap it
+
+        if not response.is_success:
+            return self._error(
+                skill_id, trace_id, timer, _STATUS_ERRORS.get(status, ErrorCode.INTERNAL),
+                f"Skill service returned HTTP {status}",
+                {"status_code": status, "body_preview": _preview(content)},
+            )
+        if content.strip() and not parsed:
+            return self._error(
+                skill_id, trace_id, timer, ErrorCode.INTERNAL,
+                "Failed to parse skill service response as JSON",
+                {"status_code": status, "body_preview": _preview(content)},
+            )
+        return NormalizedSkillResult(
+            success=True,
+            skill_id=skill_id,
+            trace_id=trace_id,
+            data=output if isinstance(output, dict) else ({"output": output} if parsed else {}),
+            error=None,
+            meta=SkillMeta(latency_ms=timer.elapsed_ms()),
+        )
+
+    @staticmethod
+    def _error(
+        skill_id: str,
+        trace_id: str,
+        timer: PhaseTimer,
+        code: ErrorCode,
+        message: str,
+        details: Dict[str, Any] | None = None,
+    ) -> NormalizedSkillResult:
+        return NormalizedSkillResult(
+            success=False,
+            skill_id=skill_id,
+            trace_id=trace_id,
+            data=None,
+            error=ErrorDetail(code=code, message=message, details=details),
+            meta=SkillMeta(latency_ms=timer.elapsed_ms()),
+        )
+
+    def warm(self, manifest: SkillManifest) -> None:
+        self._get_client()
+
+    def close(self) -> None:
+        with self._lock:
+            client, self._client = self._client, None
+        if client is not None and self._client_pid == os.getpid():
+            client.close()
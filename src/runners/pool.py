@@ -0,0 +1,517 @@
+"""Warm runners for openskill_sdk skills: worker pools, fork servers, in-process calls."""
+
+import importlib.util
+import logging
+import os
+import select
+import signal
+import struct
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+from .. import codec
+from ..config import config
+from ..models import SkillManifest
+from .base import PhaseTimer
+from .cli_python import CLIPythonRunner
+
+logger = logging.getLogger(__name__)
+
+# Must match openskill_sdk.FRAME_HEADER (payload length, u32 big-endian)
+FRAME_HEADER = struct.Struct(">I")
+
+# Seconds a new worker has to import the skill and send its ready frame
+READY_TIMEOUT_SECONDS = 10.0
+
+# Seconds an idle worker gets to exit after its stdin is closed
+CLOSE_GRACE_SECONDS = 1.0
+
+# Seconds to wait for the exit status of a worker that died mid-request
+EXIT_STATUS_SECONDS = 0.5
+
+# stderr kept per worker for the current request (its tail goes to
+# limit detection and the slow-call recorder)
+STDERR_BUFFER_BYTES = 16 * 1024
+
+LIMIT_FIELDS = ("max_rss_mb", "max_cpu_seconds", "max_open_files")
+
+
+def _limits(manifest: SkillManifest | None) -> Dict[str, int]:
+    """The manifest's resource limits that are set."""
+    if manifest is None:
+        return {}
+    return {name: getattr(manifest, name) for name in LIMIT_FIELDS if getattr(manifest, name)}
+
+
+class _Worker:
+    """
+    One SDK worker process (``--loop`` or ``--forkserver``) speaking frames.
+
+    stderr is a non-blocking pipe drained while a request waits for its
+    reply and once more after it; the worker writes stderr before the reply,
+    so the bounded buffer holds the request's stderr tail.
+    """
+
+    def __init__(self, argv: List[str], env: Dict[str, str], mode: str):
+        self.argv = argv
+        self.mode = mode
+        # Format of the frames after the ready frame (named in it)
+        self.codec = codec.JSON
+        self._stderr = bytearray()
+        # Own session so a timeout can kill the worker and its fork children
+        self.process = subprocess.Popen(
+            argv,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            bufsize=0,
+            cwd=config.cli_dir.parent,  # Run from project root
+            env=env,
+            start_new_session=True,
+        )
+        # Writes and reads both poll against the request deadline
+        os.set_blocking(self.process.stdin.fileno(), False)
+        os.set_blocking(self.process.stderr.fileno(), False)
+        try:
+            ready = codec.loads(self._read_frame(time.monotonic() + READY_TIMEOUT_SECONDS))
+            if not (isinstance(ready, dict) and ready.get("ready")):
+                raise RuntimeError(f"Unexpected handshake from skill worker: {ready!r}")
+            # Workers from before format negotiation speak JSON
+            self.codec = codec.get_codec(ready.get("format") or "json")
+        except subprocess.TimeoutExpired:
+            self.kill()
+            raise RuntimeError(
+                f"Skill worker did not become ready within {READY_TIMEOUT_SECONDS}s "
+                "(is the script built on openskill_sdk?)"
+            )
+        except BaseException:
+            self.kill()
+            raise
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def request(self, body: bytes, deadline: float) -> Tuple[bytes, Optional[Dict[str, Any]]]:
+        """
+        Send one request frame and read the reply.
+
+        Returns:
+            (envelope bytes, fork-server process info or None)
+
+        Raises:
+            subprocess.TimeoutExpired: If no reply arrives before ``deadline``
+            EOFError: If the worker exited mid-request
+        """
+        # Anything written while idle belongs to earlier requests
+        self._drain_stderr()
+        self._stderr.clear()
+        try:
+            self._write(FRAME_HEADER.pack(len(body)) + body, deadline)
+            info = None
+            if self.mode == "forkserver":
+                info = self.codec.loads(self._read_frame(deadline))
+            return self._read_frame(deadline), info
+        finally:
+            self._drain_stderr()
+
+    def stderr_text(self) -> str:
+        """stderr of the last request (its last STDERR_BUFFER_BYTES)."""
+        return self._stderr.decode("utf-8", errors="replace")
+
+    def exit_status(self) -> Optional[int]:
+        """Return code of a worker that died, or None if it is still running."""
+        try:
+            return self.process.wait(EXIT_STATUS_SECONDS)
+        except subprocess.TimeoutExpired:
+            return None
+
+    def _drain_stderr(self) -> None:
+        stream = self.process.stderr
+        if stream is None or stream.closed:
+            return
+        while True:
+            try:
+                chunk = os.read(stream.fileno(), 1 << 16)
+            except (BlockingIOError, OSError):
+                break
+            if not chunk:
+                break
+            self._stderr += chunk
+        if len(self._stderr) > STDERR_BUFFER_BYTES:
+            del self._stderr[:-STDERR_BUFFER_BYTES]
+
+    def _write(self, data: bytes, deadline: float) -> None:
+        fd = self.process.stdin.fileno()
+        err_fd = self.process.stderr.fileno()
+        poller = select.poll()
+        poller.register(fd, select.POLLOUT)
+        poller.register(err_fd, select.POLLIN)
+        view = memoryview(data)
+        while view:
+            try:
+                view = view[os.write(fd, view):]
+                continue
+            except BlockingIOError:
+                pass
+            except BrokenPipeError:
+                raise EOFError(f"Skill worker exited (code {self.process.poll()})")
+            # A worker that stopped reading (wedged, or stuck on a full
+            # stderr pipe) must not hold the call past its timeout
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(self.argv, remaining)
+            events = dict(poller.poll(remaining * 1000))
+            if err_fd in events:
+                self._drain_stderr()
+                if events[err_fd] & (select.POLLHUP | select.POLLERR):
+                    poller.unregister(err_fd)
+
+    def _read_frame(self, deadline: float) -> bytes:
+        (length,) = FRAME_HEADER.unpack(self._read_exact(FRAME_HEADER.size, deadline))
+        return self._read_exact(length, deadline)
+
+    def _read_exact(self, size: int, deadline: float) -> bytes:
+        fd = self.process.stdout.fileno()
+        err_fd = self.process.stderr.fileno()
+        poller = select.poll()
+        poller.register(fd, select.POLLIN)
+        # A worker blocked on a full stderr pipe would never reply
+        poller.register(err_fd, select.POLLIN)
+        chunks = []
+        while size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise subprocess.TimeoutExpired(self.argv, remaining)
+            events = dict(poller.poll(remaining * 1000))
+            if err_fd in events:
+                self._drain_stderr()
+                if events[err_fd] & (select.POLLHUP | select.POLLERR):
+                    poller.unregister(err_fd)
+            if fd not in events:
+                continue
+            chunk = os.read(fd, min(size, 1 << 20))
+            if not chunk:
+                raise EOFError(f"Skill worker exited (code {self.process.poll()})")
+            chunks.append(chunk)
+            size -= len(chunk)
+        return b"".join(chunks)
+
+    def close(self) -> None:
+        """Close stdin (the worker exits on EOF); kill it if it lingers."""
+        try:
+            self.process.stdin.close()
+            self.process.wait(CLOSE_GRACE_SECONDS)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+        finally:
+            self.process.stdout.close()
+            self.process.stderr.close()
+
+    def kill(self) -> None:
+        try:
+            os.killpg(self.process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            pass
+        self.process.wait()
+        for stream in (self.process.stdin, self.process.stdout, self.process.stderr):
+            try:
+                stream.close()
+            except OSError:
+                pass
+
+
+class _PoolClosed(RuntimeError):
+    """The pool was closed (its skill reloaded) before a worker was taken."""
+
+
+class _WorkerPool:
+    """Up to ``size`` workers for one skill; callers wait for a free one."""
+
+    def __init__(
+        self, argv: List[str], env: Dict[str, str], mode: str, size: int, manifest: SkillManifest
+    ):
+        self.argv = argv
+        self.env = env
+        self.mode = mode
+        self.size = size
+        # The manifest argv/env were built from
+        self.manifest = manifest
+        # Pools are not shared across fork(); see PooledPythonRunner._pool
+        self.owner_pid = os.getpid()
+        self._idle: List[_Worker] = []
+        self._count = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def acquire(self, deadline: float) -> _Worker:
+        """
+        Take an idle worker, or start one if the pool is not full.
+
+        Raises:
+            subprocess.TimeoutExpired: If no worker frees up before ``deadline``
+            _PoolClosed: If the pool is closed first
+        """
+        with self._cond:
+            while True:
+                if self._closed:
+                    raise _PoolClosed("Worker pool is closed")
+                if self._idle:
+                    return self._idle.pop()
+                if self._count < self.size:
+                    self._count += 1
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise subprocess.TimeoutExpired(self.argv, remaining)
+                self._cond.wait(remaining)
+        try:
+            return _Worker(self.argv, self.env, self.mode)
+        except BaseException:
+            with self._cond:
+                self._count -= 1
+                self._cond.notify()
+            raise
+
+    def release(self, worker: _Worker, healthy: bool) -> None:
+        """Return a worker; unhealthy ones (timed out, crashed) are killed."""
+        with self._cond:
+            if healthy and not self._closed and worker.alive():
+                self._idle.append(worker)
+                self._cond.notify()
+                return
+            self._count -= 1
+            self._cond.notify()
+        if healthy:
+            worker.close()
+        else:
+            worker.kill()
+
+    def warm(self) -> None:
+        """Start workers until the pool is full."""
+        deadline = time.monotonic() + READY_TIMEOUT_SECONDS
+        workers = []
+        try:
+            with self._cond:
+                missing = self.size - self._count
+            for _ in range(missing):
+                workers.append(self.acquire(deadline))
+        finally:
+            for worker in workers:
+                self.release(worker, True)
+
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._count -= len(idle)
+            # Waiting callers move on to the replacement pool
+            self._cond.notify_all()
+        for worker in idle:
+            worker.close()
+
+
+class PooledPythonRunner(CLIPythonRunner):
+    """
+    Runs openskill_sdk skills in warm worker processes.
+
+    Manifest ``mode: pool`` keeps workers in ``--loop`` mode (one interpreter
+    serves many requests); ``mode: forkserver`` forks a fresh child per
+    request from the warm worker, so requests are isolated and resource
+    limits apply per request. ``pool`` manifests that set limits use the
+    fork server. At most ``pool_size`` requests per skill run at once;
+    further callers wait, and the wait counts against the timeout.
+    """
+
+    def __init__(self):
+        self._pools: Dict[str, _WorkerPool] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, skill_id: str, script_path: Path, manifest: SkillManifest) -> _WorkerPool:
+        stale = None
+        with self._lock:
+            pool = self._pools.get(skill_id)
+            if pool is not None and pool.owner_pid != os.getpid():
+                # Inherited through fork(): those workers belong to the parent
+                pool = None
+            elif pool is not None and pool.manifest != manifest:
+                # Built from another version of the manifest by a call that
+                # raced a reload; callers always carry the newest one, so
+                # this settles as soon as those calls are done
+                stale, pool = pool, None
+            if pool is None:
+                limits = _limits(manifest)
+                mode = "forkserver" if manifest.mode == "forkserver" or limits else "loop"
+                env = self._build_env(manifest)
+                # Formats the worker may pick for its frames, preferred first
+                env["OPENSKILL_WORKER_FORMATS"] = "msgpack,json" if codec.MSGPACK is not None else "json"
+                if limits:
+                    env["OPENSKILL_SKILL_LIMITS"] = codec.dumps_str(limits)
+                pool = _WorkerPool(
+                    [sys.executable, str(script_path), f"--{mode}"],
+                    env,
+                    mode,
+                    manifest.pool_size or config.pool_size,
+                    manifest,
+                )
+                self._pools[skill_id] = pool
+                logger.info(f"Worker pool for {skill_id}: mode={mode}, size={pool.size}")
+        if stale is not None:
+            stale.close()
+        return pool
+
+    def _execute(
+        self,
+        script_path: Path,
+        input_data: dict,
+        input_json: bytes,
+        manifest: SkillManifest | None,
+        timeout_seconds: float,
+        timer: PhaseTimer,
+        process_info: Dict[str, Any],
+    ) -> subprocess.CompletedProcess:
+        if manifest is None:
+            return super()._execute(
+                script_path, input_data, input_json, manifest, timeout_seconds, timer, process_info
+            )
+        deadline = time.monotonic() + timeout_seconds
+        while True:
+            pool = self._pool(manifest.id, script_path, manifest)
+            try:
+                worker = pool.acquire(deadline)
+                break
+            except _PoolClosed:
+                # Invalidated while we waited; the next pool is a fresh one
+                continue
+        # Waiting for (or starting) a worker
+        timer.mark("spawn")
+        healthy = False
+        if worker.codec is not codec.JSON:
+            input_json = worker.codec.dumps({"input": input_data})
+        process_info["codec"] = worker.codec
+        try:
+            envelope, info = worker.request(input_json, deadline)
+            healthy = True
+        except EOFError:
+            # Exit status and stderr let a crash be attributed to a limit
+            process_info["returncode"] = worker.exit_status()
+            raise
+        finally:
+            process_info["stderr"] = worker.stderr_text()
+            pool.release(worker, healthy)
+
+        returncode = 0
+        if info is not None:
+            returncode = info["returncode"]
+            process_info.update(
+                returncode=returncode,
+                rusage=SimpleNamespace(
+                    ru_maxrss=info["max_rss_kb"],
+                    ru_utime=info["user_cpu_s"],
+                    ru_stime=info["sys_cpu_s"],
+                ),
+            )
+        return subprocess.CompletedProcess(worker.argv, returncode, envelope, process_info["stderr"])
+
+    def warm(self, manifest: SkillManifest) -> None:
+        script_path = self._script_path(manifest.id, manifest)
+        if script_path.is_file() and script_path.is_relative_to(config.cli_dir.resolve()):
+            self._pool(manifest.id, script_path, manifest).warm()
+
+    def invalidate(self, skill_id: str) -> None:
+        with self._lock:
+            pool = self._pools.pop(skill_id, None)
+        if pool is not None and pool.owner_pid == os.getpid():
+            pool.close()
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._pools = self._pools, {}
+        for pool in pools.values():
+            if pool.owner_pid == os.getpid():
+                pool.close()
+
+
+class InProcessPythonRunner(CLIPythonRunner):
+    """
+    Calls an openskill_sdk skill's ``handle`` inside the host process
+    (manifest ``mode: inprocess``).
+
+    No process start and no pipes, but also no isolation: the timeout is
+    not enforced and a crashing or blocking skill takes the host with it.
+    Meant for small, trusted, pure-Python skills. Manifests with resource
+    limits run as one-shot processes instead.
+    """
+
+    def __init__(self):
+        self._modules: Dict[str, ModuleType] = {}
+        self._sdk: Optional[ModuleType] = None
+        self._lock = threading.Lock()
+
+    def _load(self, skill_id: str, script_path: Path) -> Tuple[ModuleType, ModuleType]:
+        """
+        Import a skill script (cached) and the SDK that runs its ``handle``.
+
+        Raises:
+            ImportError: If openskill_sdk cannot be imported from OPENSKILL_CLI_DIR
+            RuntimeError: If the script does not define ``handle()``
+        """
+        with self._lock:
+            if self._sdk is None:
+                # Skills import openskill_sdk as a top-level module
+                cli_dir = str(config.cli_dir.resolve())
+                if cli_dir not in sys.path:
+                    sys.path.append(cli_dir)
+                self._sdk = importlib.import_module("openskill_sdk")
+            module = self._modules.get(skill_id)
+            if module is None or module.__file__ != str(script_path):
+                spec = importlib.util.spec_from_file_location(f"openskill_skill_{skill_id}", script_path)
+                module = importlib.util.module_from_spec(spec)
+                spec.loader.exec_module(module)
+                if not callable(getattr(module, "handle", None)):
+                    raise RuntimeError(
+                        f"{script_path.name} does not define handle(); "
+                        "in-process mode needs a skill built on openskill_sdk"
+                    )
+                self._modules[skill_id] = module
+            return module, self._sdk
+
+    def _execute(
+        self,
+        script_path: Path,
+        input_data: dict,
+        input_json: bytes,
+        manifest: SkillManifest | None,
+        timeout_seconds: float,
+        timer: PhaseTimer,
+        process_info: Dict[str, Any],
+    ) -> subprocess.CompletedProcess:
+        if manifest is None or _limits(manifest):
+            return super()._execute(
+                script_path, input_data, input_json, manifest, timeout_seconds, timer, process_info
+            )
+        # Import failures come back as INTERNAL ("Failed to execute skill script")
+        module, sdk = self._load(manifest.id, script_path)
+        timer.mark("spawn")
+        envelope = sdk.invoke(
+            module.handle,
+            {"input": input_data},
+            skill_id=manifest.id,
+            version=getattr(module, "VERSION", "0.1.0"),
+            allowed_root=str(self._allowed_root(manifest)),
+        )
+        # Same output contract as a process, so results take the same path
+        return subprocess.CompletedProcess([str(script_path)], 0, codec.dumps(envelope), "")
+
+    def warm(self, manifest: SkillManifest) -> None:
+        script_path = self._script_path(manifest.id, manifest)
+        if script_path.is_file() and script_path.is_relative_to(config.cli_dir.resolve()):
+            self._load(manifest.id, script_path)
+
+    def invalidate(self, skill_id: str) -> None:
+        with self._lock:
+            self._modules.pop(skill_id, None)
@@ -0,0 +1,625 @@
+"""Remote Runner - dispatches skill invocations to skill-node daemons."""
+
+import itertools
+import logging
+import os
+import select
+import socket
+import struct
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeout
+from typing import Any, Dict, List, Optional, Set
+
+from .. import codec
+from ..config import config
+from ..metrics import NODE_EJECTIONS, NODE_REQUESTS_INFLIGHT, NODE_RETRIES, observe_phases
+from ..models import (
+    ErrorCode,
+    ErrorDetail,
+    NormalizedSkillResult,
+    SkillManifest,
+    SkillMeta,
+)
+from ..slowlog import cap_input, get_slow_recorder
+from .base import PhaseTimer, SkillRunner
+from .cli_python import _passthrough_result
+
+logger = logging.getLogger(__name__)
+
+# Node protocol: every message is one frame (payload length, u32
+# big-endian) holding a JSON object with an ``id`` echoed by the reply.
+# The first message on a connection is a ``ping`` handshake, carrying the
+# node token when the node requires one
+FRAME_HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 256 * 1024 * 1024
+
+# Heartbeat pings a node may leave unanswered before it is ejected
+HEARTBEAT_MISSES = 3
+CONNECT_TIMEOUT_SECONDS = 2.0
+# Slack on top of the skill timeout, which the node enforces itself
+REPLY_GRACE_SECONDS = 2.0
+
+
+class NodeUnavailable(Exception):
+    """A node connection failed before it returned a reply."""
+
+    def __init__(self, message: str, sent: bool):
+        super().__init__(message)
+        # Whether the request may already have reached the node
+        self.sent = sent
+
+
+def parse_address(address: str):
+    """
+    Parse a node address: ``host:port`` or ``unix:/path/to/socket``.
+
+    Returns:
+        (socket family, address for connect/bind)
+    """
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[len("unix:"):]
+    host, sep, port = address.rpartition(":")
+    if not sep or not port.isdigit():
+        raise ValueError(f"Invalid node address (expected host:port or unix:/path): {address}")
+    host = host.strip("[]") or "127.0.0.1"
+    return (socket.AF_INET6 if ":" in host else socket.AF_INET), (host, int(port))
+
+
+def send_frame(sock: socket.socket, message: Dict[str, Any]) -> None:
+    body = codec.dumps(message)
+    sock.sendall(FRAME_HEADER.pack(len(body)) + body)
+
+
+def _send_until(sock: socket.socket, data: bytes, deadline: Optional[float]) -> int:
+    """
+    Write ``data`` without blocking past ``deadline`` (None: one attempt).
+
+    The socket stays in blocking mode for its reader thread; each write is
+    made non-blocking with MSG_DONTWAIT and waits on POLLOUT in between.
+
+    Returns:
+        Bytes written; less than ``len(data)`` if the deadline passed
+    """
+    view = memoryview(data)
+    poller = select.poll()
+    poller.register(sock, select.POLLOUT)
+    while view:
+        try:
+            view = view[sock.send(view, socket.MSG_DONTWAIT):]
+            continue
+        except BlockingIOError:
+            pass
+        remaining = deadline - time.monotonic() if deadline is not None else 0
+        if remaining <= 0:
+            break
+        poller.poll(remaining * 1000)
+    return len(data) - len(view)
+
+
+def recv_frame(sock: socket.socket) -> Optional[Dict[str, Any]]:
+    """Read one message; None on a clean EOF between frames."""
+    header = _recv_exact(sock, FRAME_HEADER.size, eof_ok=True)
+    if header is None:
+        return None
+    (length,) = FRAME_HEADER.unpack(header)
+    if length > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame too large ({length} bytes)")
+    return codec.loads(_recv_exact(sock, length))
+
+
+def _recv_exact(sock: socket.socket, size: int, eof_ok: bool = False) -> Optional[bytes]:
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    while view:
+        received = sock.recv_into(view)
+        if not received:
+            if eof_ok and len(view) == size:
+                return None
+            raise ConnectionError("Connection closed mid-frame")
+        view = view[received:]
+    return bytes(buffer)
+
+
+class _Node:
+    """One skill node: a persistent connection multiplexing many calls."""
+
+    def __init__(self, address: str):
+        self.address = address
+        self.healthy = False
+        self.outstanding = 0
+        self.completed = 0
+        self.ejections = 0
+        self.last_seen = 0.0
+        # Heartbeat pings sent since the last reply to one
+        self.unanswered = 0
+        # A connect() is running on the node's connect thread
+        self.connecting = False
+        self.info: Dict[str, Any] = {}
+        self._sock: Optional[socket.socket] = None
+        self._pending: Dict[int, Future] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+
+    @property
+    def connected(self) -> bool:
+        return self._sock is not None
+
+    def connect(self) -> None:
+        """
+        Open the connection and wait for a ping reply before taking calls
+        (a stopped or wedged process may still accept TCP connections).
+        The handshake ping carries OPENSKILL_NODE_TOKEN when it is set.
+
+        Raises:
+            OSError: If the node is unreachable or does not answer in time
+        """
+        family, target = parse_address(self.address)
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            sock.settimeout(CONNECT_TIMEOUT_SECONDS)
+            sock.connect(target)
+            sock.settimeout(None)
+            if family != socket.AF_UNIX:
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except OSError:
+            sock.close()
+            raise
+        with self._lock:
+            self._sock = sock
+            self.last_seen = time.monotonic()
+            self.unanswered = 0
+        threading.Thread(
+            target=self._read_loop, args=(sock,), name=f"skill-node-{self.address}", daemon=True
+        ).start()
+        handshake = {"op": "ping"}
+        if config.node_token:
+            handshake["token"] = config.node_token
+        try:
+            deadline = time.monotonic() + CONNECT_TIMEOUT_SECONDS
+            reply = self.send(handshake, deadline).result(timeout=CONNECT_TIMEOUT_SECONDS)
+        except (FutureTimeout, NodeUnavailable) as e:
+            self.eject("did not answer the handshake")
+            raise ConnectionError(f"Skill node {self.address} did not answer the handshake") from e
+        if not reply.get("ok"):
+            self.eject("refused the handshake")
+            raise ConnectionError(
+                f"Skill node {self.address} refused the handshake: {reply.get('error', 'no reason given')}"
+            )
+        self.update_info(reply)
+        with self._lock:
+            self.healthy = self._sock is sock
+        logger.info(f"Connected to skill node {self.address}")
+
+    def send(self, message: Dict[str, Any], deadline: Optional[float] = None) -> Future:
+        """
+        Send a request; the returned future resolves to the reply.
+
+        Waiting for the connection (other senders) and for the node to read
+        the frame both stop at ``deadline``; with None the send is only
+        tried once, without waiting. A frame cut off by the deadline leaves
+        the stream unusable, so the node is ejected.
+
+        Raises:
+            NodeUnavailable: If the node is down, the write failed or the
+                deadline passed
+        """
+        future: Future = Future()
+        with self._lock:
+            sock = self._sock
+            if sock is None:
+                raise NodeUnavailable(f"Skill node {self.address} is not connected", sent=False)
+            call_id = next(self._ids)
+            self._pending[call_id] = future
+        future.call_id = call_id
+        body = codec.dumps({**message, "id": call_id})
+        frame = FRAME_HEADER.pack(len(body)) + body
+        if deadline is None:
+            acquired = self._send_lock.acquire(blocking=False)
+        else:
+            acquired = self._send_lock.acquire(timeout=max(deadline - time.monotonic(), 0))
+        if not acquired:
+            self._forget(call_id)
+            raise NodeUnavailable(f"Skill node {self.address} is still being sent another request", sent=False)
+        try:
+            written = _send_until(sock, frame, deadline)
+        except OSError as e:
+            self._forget(call_id)
+            self.eject(f"write failed: {e}")
+            raise NodeUnavailable(f"Skill node {self.address}: {e}", sent=True) from e
+        finally:
+            self._send_lock.release()
+        if written < len(frame):
+            self._forget(call_id)
+            if written:
+                self.eject("stopped reading requests")
+            raise NodeUnavailable(f"Skill node {self.address} is not reading requests", sent=False)
+        return future
+
+    def _forget(self, call_id: int) -> None:
+        with self._lock:
+            self._pending.pop(call_id, None)
+
+    def _read_loop(self, sock: socket.socket) -> None:
+        try:
+            while True:
+                reply = recv_frame(sock)
+                if reply is None:
+                    raise ConnectionError("closed by node")
+                with self._lock:
+                    self.last_seen = time.monotonic()
+                    future = self._pending.pop(reply.get("id"), None)
+                if future is not None:
+                    future.set_result(reply)
+        except Exception as e:
+            if self._sock is sock:
+                self.eject(f"connection lost: {e}")
+
+    def ping(self) -> None:
+        """
+        Send a heartbeat; its reply resets ``unanswered``.
+
+        Never waits: a ping that cannot go out at once (another request is
+        being written, or the node is not reading) counts as unanswered.
+
+        Raises:
+            NodeUnavailable: If the node is down or the write failed
+        """
+        with self._lock:
+            self.unanswered += 1
+        self.send({"op": "ping"}).add_done_callback(self._on_pong)
+
+    def _on_pong(self, future: Future) -> None:
+        if future.exception() is None:
+            with self._lock:
+                self.unanswered = 0
+            self.update_info(future.result())
+
+    def update_info(self, reply: Dict[str, Any]) -> None:
+        """Keep the node's self-reported state from a ping reply."""
+        self.info = {key: reply[key] for key in ("pid", "active", "workers") if key in reply}
+
+    def eject(self, reason: str) -> None:
+        """Mark the node down and fail every call waiting on it."""
+        with self._lock:
+            sock, self._sock = self._sock, None
+            was_healthy, self.healthy = self.healthy, False
+            pending, self._pending = self._pending, {}
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            sock.close()
+        if was_healthy:
+            self.ejections += 1
+            NODE_EJECTIONS.labels(self.address).inc()
+            logger.warning(f"Ejected skill node {self.address}: {reason}")
+        for future in pending.values():
+            future.set_exception(NodeUnavailable(f"Skill node {self.address} {reason}", sent=True))
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "address": self.address,
+            "healthy": self.healthy,
+            "outstanding": self.outstanding,
+            "completed": self.completed,
+            "ejections": self.ejections,
+            "last_seen_ms_ago": round((time.monotonic() - self.last_seen) * 1000) if self.last_seen else None,
+            **self.info,
+        }
+
+
+class RemoteRunner(SkillRunner):
+    """
+    Runner that sends ``placement: remote`` skills to skill nodes.
+
+    Nodes are listed in OPENSKILL_NODES and run ``python -m src.cli node``
+    with the same skills/ and skill_cli/; they look the skill up in their
+    own registry. Each call goes to the healthy node with the fewest
+    outstanding requests. A background thread pings every node each
+    OPENSKILL_NODE_HEARTBEAT_MS; a node that leaves HEARTBEAT_MISSES pings
+    unanswered, or whose connection drops, is ejected. Connecting (and
+    reconnecting an ejected node) runs on a thread per node, so a node that
+    hangs in its handshake delays neither calls nor the other heartbeats.
+    Writes to a node stop at the call's deadline and heartbeat pings never
+    wait, so a node that stops reading is ejected rather than wedging the
+    callers and the heartbeat thread.
+
+    A call whose request never reached a node moves on to the next node.
+    A call lost after it was sent is retried (up to OPENSKILL_NODE_RETRIES
+    times, on other nodes) only for skills marked ``idempotent``.
+    """
+
+    def __init__(self, addresses: Optional[List[str]] = None):
+        self._addresses = list(addresses if addresses is not None else config.nodes)
+        self._nodes: List[_Node] = []
+        self._pid: Optional[int] = None
+        self._rr = itertools.count()
+        self._lock = threading.Lock()
+        # Notified whenever a connect attempt finishes
+        self._connected = threading.Condition(self._lock)
+        self._stop = threading.Event()
+
+    def _ensure_started(self) -> List[_Node]:
+        with self._lock:
+            # Connections and the heartbeat thread do not survive fork()
+            if self._pid == os.getpid():
+                return self._nodes
+            nodes = self._nodes = [_Node(address) for address in self._addresses]
+            self._pid = os.getpid()
+            stop = self._stop = threading.Event()
+        for node in nodes:
+            self._connect_async(node, stop, initial=True)
+        threading.Thread(
+            target=self._heartbeat_loop, args=(nodes, stop), name="skill-node-heartbeat", daemon=True
+        ).start()
+        return nodes
+
+    def _connect_async(self, node: _Node, stop: threading.Event, initial: bool = False) -> None:
+        """Start connecting a node on its own thread, unless already under way."""
+        with self._lock:
+            if node.connecting or node.connected:
+                return
+            node.connecting = True
+        threading.Thread(
+            target=self._connect, args=(node, stop, initial), name=f"skill-node-connect-{node.address}", daemon=True
+        ).start()
+
+    def _connect(self, node: _Node, stop: threading.Event, initial: bool) -> None:
+        try:
+            node.connect()
+            if stop.is_set():
+                node.eject("runner closed")
+        except OSError as e:
+            if initial:
+                logger.warning(f"Skill node {node.address} is unreachable: {e}")
+        finally:
+            with self._connected:
+                node.connecting = False
+                self._connected.notify_all()
+
+    def _heartbeat_loop(self, nodes: List[_Node], stop: threading.Event) -> None:
+        while not stop.wait(config.node_heartbeat_ms / 1000.0):
+            for node in nodes:
+                if not node.connected:
+                    self._connect_async(node, stop)
+                    continue
+                if node.unanswered >= HEARTBEAT_MISSES:
+                    node.eject(f"left {HEARTBEAT_MISSES} heartbeats unanswered")
+                    continue
+                try:
+                    node.ping()
+                except NodeUnavailable:
+                    pass
+
+    def _pick(self, exclude: Set[str]) -> Optional[_Node]:
+        """
+        Healthy node with the fewest outstanding calls (ties rotate).
+
+        With none healthy, waits for nodes that are still connecting (the
+        first calls after start or fork).
+        """
+        nodes = self._ensure_started()
+        deadline = None
+        with self._connected:
+            while True:
+                start = next(self._rr) % len(nodes) if nodes else 0
+                candidates = [
+                    node for node in nodes[start:] + nodes[:start]
+                    if node.healthy and node.address not in exclude
+                ]
+                if candidates:
+                    break
+                if not any(node.connecting and node.address not in exclude for node in nodes):
+                    return None
+                if deadline is None:
+                    # TCP connect plus handshake
+                    deadline = time.monotonic() + 2 * CONNECT_TIMEOUT_SECONDS
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._connected.wait(remaining)
+            node = min(candidates, key=lambda n: n.outstanding)
+            node.outstanding += 1
+        NODE_REQUESTS_INFLIGHT.labels(node.address).inc()
+        return node
+
+    def _done(self, node: _Node, completed: bool) -> None:
+        with self._lock:
+            node.outstanding -= 1
+            if completed:
+                node.completed += 1
+        NODE_REQUESTS_INFLIGHT.labels(node.address).dec()
+
+    def invoke(
+        self,
+        skill_id: str,
+        input_data: dict,
+        trace_id: str,
+        manifest: SkillManifest | None = None,
+    ) -> NormalizedSkillResult:
+        """
+        Run a skill on a skill node.
+
+        Args:
+            skill_id: The skill ID
+            input_data: The input data dictionary
+            trace_id: The trace ID
+            manifest: SkillManifest (``idempotent`` allows retries)
+
+        Returns:
+            NormalizedSkillResult from the node (``meta.timings`` holds the
+            front end's phase breakdown)
+        """
+        timer = PhaseTimer()
+        call_info: Dict[str, Any] = {"nodes": []}
+        result = self._invoke(skill_id, input_data, trace_id, manifest, timer, call_info)
+        observe_phases(skill_id, timer.phases)
+        if result.meta is None:
+            result.meta = SkillMeta(latency_ms=timer.elapsed_ms())
+        timings = timer.as_ms()
+        # Keep the node's own breakdown next to the front end's
+        node_timings = result.meta.timings or {}
+        result.meta.timings = {**timings, **{f"node_{phase}": ms for phase, ms in node_timings.items()}}
+
+        def _snapshot() -> Dict[str, Any]:
+            return {
+                "trace_id": trace_id,
+                **cap_input(input_data),
+                "success": result.success,
+                "error_code": result.error.code.value if result.error else None,
+                "timings": timings,
+                "nodes": call_info["nodes"],
+            }
+
+        get_slow_recorder().observe(
+            skill_id,
+            timings["total"],
+            _snapshot,
+            threshold_ms=manifest.slow_threshold_ms if manifest else None,
+        )
+        return result
+
+    def _invoke(
+        self,
+        skill_id: str,
+        input_data: dict,
+        trace_id: str,
+        manifest: SkillManifest | None,
+        timer: PhaseTimer,
+        call_info: Dict[str, Any],
+    ) -> NormalizedSkillResult:
+        timeout_ms = (manifest.timeout_ms if manifest else None) or config.timeout_ms
+        deadline = time.monotonic() + timeout_ms / 1000.0 + REPLY_GRACE_SECONDS
+        idempotent = bool(manifest and manifest.idempotent)
+        message = {"op": "invoke", "skill_id": skill_id, "input": input_data, "trace_id": trace_id}
+        timer.mark("validate")
+
+        tried: Set[str] = set()
+        retries = 0
+        while True:
+            node = self._pick(tried)
+            timer.mark("queue")
+            if node is None:
+                return self._error(
+                    skill_id, trace_id, timer, ErrorCode.RESOURCE_EXHAUSTED,
+                    "No healthy skill node available",
+                    {"nodes": len(self._nodes), "tried": sorted(tried)},
+                )
+            tried.add(node.address)
+            call_info["nodes"].append(node.address)
+            completed = False
+            try:
+                future = node.send(message, deadline)
+                try:
+                    reply = future.result(timeout=max(deadline - time.monotonic(), 0.001))
+                except FutureTimeout:
+                    node._forget(future.call_id)
+                    timer.mark("execute")
+                    return self._error(
+                        skill_id, trace_id, timer, ErrorCode.TIMEOUT,
+                        f"Skill node {node.address} did not reply within {timeout_ms}ms",
+                        {"node": node.address},
+                    )
+                completed = True
+            except NodeUnavailable as e:
+                timer.mark("execute")
+                if time.monotonic() >= deadline:
+                    return self._error(
+                        skill_id, trace_id, timer, ErrorCode.TIMEOUT,
+                        f"Skill node {node.address} did not take the request within {timeout_ms}ms: {e}",
+                        {"node": node.address},
+                    )
+                if e.sent:
+                    if not idempotent or retries >= config.node_retries:
+                        return self._error(
+                            skill_id, trace_id, timer, ErrorCode.INTERNAL,
+                            f"{e}" if idempotent else f"{e}; not retried (skill is not idempotent)",
+                            {"node": node.address, "retries": retries},
+                        )
+                    retries += 1
+                    NODE_RETRIES.labels(skill_id).inc()
+                logger.info(f"Retrying {skill_id} on another skill node: {e}")
+                continue
+            finally:
+                self._done(node, completed)
+            timer.mark("execute")
+            return self._normalize(skill_id, trace_id, node, reply, timer)
+
+    def _normalize(
+        self,
+        skill_id: str,
+        trace_id: str,
+        node: _Node,
+        reply: Dict[str, Any],
+        timer: PhaseTimer,
+    ) -> NormalizedSkillResult:
+        output = reply.get("result")
+        if not isinstance(output, dict):
+            return self._error(
+                skill_id, trace_id, timer, ErrorCode.INTERNAL,
+                f"Skill node {node.address} failed: {reply.get('error', 'malformed reply')}",
+                {"node": node.address},
+            )
+        output["trace_id"] = trace_id
+        output["skill_id"] = skill_id
+        try:
+            result = _passthrough_result(output) or NormalizedSkillResult(**output)
+        except Exception as e:
+            return self._error(
+                skill_id, trace_id, timer, ErrorCode.INTERNAL,
+                f"Failed to parse skill node reply as NormalizedSkillResult: {e}",
+                {"node": node.address},
+            )
+        timer.mark("parse")
+        return result
+
+    @staticmethod
+    def _error(
+        skill_id: str,
+        trace_id: str,
+        timer: PhaseTimer,
+        code: ErrorCode,
+        message: str,
+        details: Dict[str, Any] | None = None,
+    ) -> NormalizedSkillResult:
+        return NormalizedSkillResult(
+            success=False,
+            skill_id=skill_id,
+            trace_id=trace_id,
+            data=None,
+            error=ErrorDetail(code=code, message=message, details=details),
+            meta=SkillMeta(latency_ms=timer.elapsed_ms()),
+        )
+
+    def status(self) -> List[Dict[str, Any]]:
+        """Per-node state for /debug/nodes."""
+        return [node.status() for node in self._ensure_started()]
+
+    def warm(self, manifest: SkillManifest) -> None:
+        self._ensure_started()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._pid != os.getpid():
+                return
+            self._stop.set()
+            nodes, self._nodes, self._pid = self._nodes, [], None
+        for node in nodes:
+            node.healthy = False  # a shutdown, not a failure: no ejection logged
+            node.eject("runner closed")
+
+
+# Global remote runner instance
+_remote_runner: Optional[RemoteRunner] = None
+
+
+def get_remote_runner() -> RemoteRunner:
+    """Get the global remote runner (one connection per node per process)."""
+    global _remote_runner
+    if _remote_runner is None:
+        _remote_runner = RemoteRunner()
+    return _remote_runner
@@ -0,0 +1,127 @@
+"""Per-invocation resource limits and usage accounting for child processes."""
+
+import logging
+import signal
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore[assignment]
+
+logger = logging.getLogger(__name__)
+
+_warned_unsupported = False
+
+# Exit statuses of a child killed by SIGSEGV/SIGBUS/SIGABRT
+_ALLOC_CRASH_CODES = frozenset(-sig for sig in (signal.SIGSEGV, signal.SIGBUS, signal.SIGABRT))
+
+
+def build_preexec(manifest) -> Optional[Callable[[], None]]:
+    """
+    Build a pre-exec hook applying the manifest's rlimits to the child.
+
+    ``max_rss_mb`` is enforced as RLIMIT_AS: Linux does not enforce
+    RLIMIT_RSS, so capping the address space is the closest hard limit.
+    ``max_cpu_seconds`` sets RLIMIT_CPU with a one-second gap between the
+    soft limit (SIGXCPU) and the hard limit (SIGKILL).
+
+    Args:
+        manifest: SkillManifest (or None)
+
+    Returns:
+        Callable for ``Popen(preexec_fn=...)``, or None when no limit is set
+        (keeping the faster spawn path that skips the hook)
+    """
+    global _warned_unsupported
+    if manifest is None:
+        return None
+    limits: List[Tuple[int, Tuple[int, int]]] = []
+    wanted = manifest.max_rss_mb or manifest.max_cpu_seconds or manifest.max_open_files
+    if not wanted:
+        return None
+    if resource is None:
+        if not _warned_unsupported:
+            logger.warning("Resource limits are not supported on this platform; ignoring them")
+            _warned_unsupported = True
+        return None
+
+    if manifest.max_rss_mb:
+        size = manifest.max_rss_mb * 1024 * 1024
+        limits.append((resource.RLIMIT_AS, (size, size)))
+    if manifest.max_cpu_seconds:
+        seconds = manifest.max_cpu_seconds
+        limits.append((resource.RLIMIT_CPU, (seconds, seconds + 1)))
+    if manifest.max_open_files:
+        _, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+        count = manifest.max_open_files
+        if hard != resource.RLIM_INFINITY:
+            count = min(count, hard)
+        limits.append((resource.RLIMIT_NOFILE, (count, count)))
+
+    setrlimit = resource.setrlimit
+
+    def _apply_limits() -> None:
+        # Runs in the forked child before exec: keep it to plain syscalls
+        for which, values in limits:
+            setrlimit(which, values)
+
+    return _apply_limits
+
+
+def rusage_dict(rusage) -> Optional[Dict[str, Any]]:
+    """Child resource usage (ru_maxrss is in KiB on Linux)."""
+    if rusage is None:
+        return None
+    return {
+        "max_rss_kb": rusage.ru_maxrss,
+        "user_cpu_s": round(rusage.ru_utime, 4),
+        "sys_cpu_s": round(rusage.ru_stime, 4),
+    }
+
+
+def limit_violation(
+    manifest,
+    returncode: Optional[int],
+    usage: Optional[Dict[str, Any]],
+    stderr: Optional[str],
+    error_details: Optional[Dict[str, Any]] = None,
+) -> Optional[Tuple[str, str]]:
+    """
+    Attribute a failed run to an exceeded limit.
+
+    Skills usually catch MemoryError/OSError themselves and report them in
+    their error envelope, so both the child's stderr and the envelope
+    details are inspected.
+
+    Args:
+        manifest: SkillManifest (or None)
+        returncode: Child exit status (negative for signals)
+        usage: Output of ``rusage_dict``
+        stderr: Child stderr
+        error_details: ``error.details`` of the failed result
+
+    Returns:
+        (resource, message) if a configured limit explains the failure
+    """
+    if manifest is None:
+        return None
+    if manifest.max_cpu_seconds and returncode is not None and returncode < 0:
+        cpu = (usage or {}).get("user_cpu_s", 0) + (usage or {}).get("sys_cpu_s", 0)
+        # SIGXCPU only comes from RLIMIT_CPU; SIGKILL is the hard limit
+        # if the child ignored SIGXCPU (allow for rusage rounding)
+        xcpu = -getattr(signal, "SIGXCPU", 0)
+        if returncode == xcpu or (returncode == -signal.SIGKILL and cpu >= manifest.max_cpu_seconds * 0.99):
+            return "cpu", f"CPU time limit exceeded ({manifest.max_cpu_seconds}s)"
+    details = error_details or {}
+    text = (stderr or "")[-4096:] + " " + str(details.get("reason", ""))
+    exception = details.get("exception")
+    if manifest.max_rss_mb and (exception == "MemoryError" or "MemoryError" in text):
+        return "memory", f"Memory limit exceeded ({manifest.max_rss_mb} MB)"
+    # Native extensions (e.g. JSON parsers) may crash instead of raising
+    # MemoryError when an allocation fails under RLIMIT_AS
+    if manifest.max_rss_mb and returncode in _ALLOC_CRASH_CODES:
+        return "memory", f"Memory limit exceeded ({manifest.max_rss_mb} MB)"
+    if manifest.max_open_files and "Too many open files" in text:
+        return "open_files", f"Open file limit exceeded ({manifest.max_open_files})"
+    return None
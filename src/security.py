@@ -1,5 +1,7 @@
 """Security utilities for path validation."""
 
+import os
+import shutil
 from pathlib import Path
 from typing import Optional
 
@@ -86,3 +88,36 @@ def ensure_within_allowed_root(path: Path) -> Path:
         )
     return resolved_path
 
+
+def resolve_executable(entry: str) -> Path:
+    """
+    Resolve an exec skill entry: bare names are looked up on PATH, paths
+    are taken relative to the working directory.
+
+    Args:
+        entry: Manifest ``entry``
+
+    Returns:
+        Resolved Path (symlinks followed)
+    """
+    if os.sep not in entry:
+        found = shutil.which(entry)
+        if found:
+            return Path(found).resolve()
+    return Path(entry).resolve()
+
+
+def is_allowed_executable(path: Path) -> bool:
+    """
+    Check whether an executable may be launched by an exec skill: it must
+    live under OPENSKILL_CLI_DIR or be listed in OPENSKILL_EXEC_ALLOWLIST.
+
+    Args:
+        path: Resolved executable path
+
+    Returns:
+        True if allowed
+    """
+    if path.is_relative_to(config.cli_dir.resolve()):
+        return True
+    return path in config.exec_allowlist
@@ -0,0 +1,253 @@
+"""Pre-fork multi-process launcher for production serving."""
+
+import gc
+import logging
+import os
+import secrets
+import shutil
+import signal
+import socket
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Restart back-off for workers that keep crashing right after start
+MIN_UPTIME_SECONDS = 5.0
+MAX_RESTART_DELAY = 10.0
+
+
+def parse_cpu_list(spec: str) -> List[int]:
+    """
+    Parse a CPU list such as ``"0-3,8,10-11"``.
+
+    Raises:
+        ValueError: If the spec is malformed
+    """
+    cpus: List[int] = []
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            cpus.extend(range(int(lo), int(hi) + 1))
+        else:
+            cpus.append(int(part))
+    if not cpus:
+        raise ValueError(f"Empty CPU list: {spec!r}")
+    return sorted(set(cpus))
+
+
+def plan_affinity(workers: int, spec: Optional[str]) -> List[Optional[Set[int]]]:
+    """
+    CPU set per worker.
+
+    Args:
+        workers: Number of workers
+        spec: ``None``/``"none"`` (no pinning), ``"auto"`` (one allowed CPU
+            per worker, round robin) or an explicit CPU list
+
+    Returns:
+        One CPU set (or None) per worker index
+    """
+    if not spec or spec == "none":
+        return [None] * workers
+    if not hasattr(os, "sched_setaffinity"):
+        logger.warning("CPU affinity is not supported on this platform; ignoring it")
+        return [None] * workers
+    pool = sorted(os.sched_getaffinity(0)) if spec == "auto" else parse_cpu_list(spec)
+    return [{pool[i % len(pool)]} for i in range(workers)]
+
+
+def _bind(host: str, port: int, reuse_port: bool) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _bind_unix(path: str) -> socket.socket:
+    if os.path.exists(path):
+        os.unlink(path)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.bind(path)
+    sock.listen(2048)
+    return sock
+
+
+class PreforkServer:
+    """
+    Forks N uvicorn workers from a fully warmed-up parent.
+
+    The parent imports the app and runs the warm-up (registry, runners,
+    LLM SDKs, tool schemas) once, then freezes the GC so those objects are
+    never touched again and stay shared copy-on-write with every worker.
+    With SO_REUSEPORT each worker binds its own listening socket and the
+    kernel balances connections across them; otherwise a single socket is
+    bound in the parent and inherited. Dead workers are restarted.
+
+    Unless OPENSKILL_AGENT_AFFINITY=0 (or peers are configured explicitly),
+    each worker also serves a private Unix socket and the workers become
+    each other's agent peers: ``/agent/chat`` turns are forwarded to the
+    worker that holds the conversation (see ``agent.affinity``).
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8000,
+        workers: Optional[int] = None,
+        cpu_affinity: Optional[str] = None,
+    ):
+        self.host = host
+        self.port = port
+        self.workers = workers or os.cpu_count() or 1
+        self.affinity = plan_affinity(self.workers, cpu_affinity)
+        self.reuse_port = hasattr(socket, "SO_REUSEPORT")
+        self._shared_socket: Optional[socket.socket] = None
+        self._peer_dir: Optional[str] = None
+        self._children: Dict[int, int] = {}  # pid -> worker index
+        self._started: Dict[int, float] = {}  # worker index -> start time
+        self._stopping = False
+
+    def preload(self) -> None:
+        """Import and warm up everything the workers will share."""
+        from .app import app  # noqa: F401  (import side effects: config, routes)
+        from .warmup import warm_up
+
+        # Skill worker pools are per process; each worker starts its own
+        warm_up(pools=False)
+        gc.collect()
+        # Keep the preloaded heap out of future collections, so workers
+        # don't dirty (and un-share) its pages by updating GC headers
+        gc.freeze()
+
+    def run(self) -> int:
+        """Start workers and supervise them until SIGTERM/SIGINT."""
+        if not hasattr(os, "fork"):
+            logger.error("Multi-process serving requires fork(); run uvicorn directly instead")
+            return 1
+
+        self.preload()
+        if not self.reuse_port:
+            self._shared_socket = _bind(self.host, self.port, reuse_port=False)
+        self._plan_agent_peers()
+
+        signal.signal(signal.SIGTERM, self._handle_stop)
+        signal.signal(signal.SIGINT, self._handle_stop)
+
+        mode = "SO_REUSEPORT" if self.reuse_port else "shared socket"
+        logger.info(
+            f"Starting {self.workers} workers on {self.host}:{self.port} ({mode}), "
+            f"parent pid={os.getpid()}"
+        )
+        for index in range(self.workers):
+            self._spawn(index)
+
+        while self._children:
+            try:
+                pid, status = os.wait()
+            except ChildProcessError:
+                break
+            except InterruptedError:
+                continue
+            index = self._children.pop(pid, None)
+            if index is None or self._stopping:
+                continue
+            code = os.waitstatus_to_exitcode(status)
+            uptime = time.monotonic() - self._started.get(index, 0)
+            logger.warning(f"Worker {index} (pid {pid}) exited with {code} after {uptime:.1f}s; restarting")
+            if uptime < MIN_UPTIME_SECONDS:
+                # Crash loop: back off instead of forking continuously
+                time.sleep(min(MAX_RESTART_DELAY, MIN_UPTIME_SECONDS - uptime + 1))
+            if not self._stopping:
+                self._spawn(index)
+
+        if self._peer_dir:
+            shutil.rmtree(self._peer_dir, ignore_errors=True)
+        logger.info("All workers stopped")
+        return 0
+
+    def _plan_agent_peers(self) -> None:
+        """Make the workers agent peers, reachable on private Unix sockets."""
+        from .config import config
+
+        if not config.agent_affinity or config.agent_peers or self.workers < 2:
+            return
+        self._peer_dir = tempfile.mkdtemp(prefix="openskill-agent-")
+        config.agent_peers = [f"unix:{self._peer_dir}/worker-{i}.sock" for i in range(self.workers)]
+        config.agent_peer_token = config.agent_peer_token or secrets.token_hex(16)
+        logger.info(f"Conversation affinity across {self.workers} workers via {self._peer_dir}")
+
+    def _handle_stop(self, signum, frame) -> None:
+        if self._stopping:
+            return
+        self._stopping = True
+        logger.info(f"Received signal {signum}; stopping workers")
+        for pid in list(self._children):
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    def _spawn(self, index: int) -> None:
+        pid = os.fork()
+        if pid:
+            self._children[pid] = index
+            self._started[index] = time.monotonic()
+            return
+        # Child
+        code = 0
+        try:
+            self._worker_main(index)
+        except BaseException:
+            logger.exception(f"Worker {index} crashed")
+            code = 1
+        finally:
+            # os._exit skips atexit; flush the log queue first
+            from .logpipe import shutdown
+
+            shutdown()
+            os._exit(code)
+
+    def _worker_main(self, index: int) -> None:
+        import uvicorn
+
+        from .app import app
+
+        from .logpipe import restart_after_fork
+
+        restart_after_fork()
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        cpus = self.affinity[index]
+        if cpus:
+            os.sched_setaffinity(0, cpus)
+        sockets = [self._shared_socket or _bind(self.host, self.port, reuse_port=True)]
+        if self._peer_dir:
+            from .config import config
+
+            config.agent_self = config.agent_peers[index]
+            sockets.append(_bind_unix(config.agent_self[len("unix:"):]))
+        logger.info(f"Worker {index} started: pid={os.getpid()}, cpus={sorted(cpus) if cpus else 'any'}")
+        # log_config=None keeps uvicorn's loggers on our logging pipeline
+        server = uvicorn.Server(uvicorn.Config(app, lifespan="on", log_config=None))
+        server.run(sockets=sockets)
+
+
+def serve(host: str, port: int, workers: Optional[int], cpu_affinity: Optional[str]) -> int:
+    """Run the pre-fork server; returns the process exit code."""
+    try:
+        server = PreforkServer(host, port, workers, cpu_affinity)
+    except ValueError as e:
+        print(f"Invalid option: {e}", file=sys.stderr)
+        return 2
+    return server.run()
@@ -0,0 +1,170 @@
+"""Slow-invocation recorder for reproducing tail-latency cases."""
+
+import collections
+import threading
+import time
+from typing import Any, Callable, Deque, Dict, List, Optional
+
+from . import codec
+from .config import config
+
+# Size caps for captured payloads
+MAX_INPUT_BYTES = 4096
+STDERR_TAIL_CHARS = 2048
+
+# Rolling window per skill used for the percentile trigger
+WINDOW_SIZE = 200
+# Samples needed before the percentile trigger is trusted
+MIN_WINDOW_SAMPLES = 50
+# New samples between recomputations of a window's percentile cutoff
+CUTOFF_REFRESH_SAMPLES = 20
+
+
+def cap_input(input_data: Any) -> Dict[str, Any]:
+    """
+    Serialize input for storage, truncated to MAX_INPUT_BYTES.
+
+    Returns:
+        Dictionary with ``input`` (parsed object, or the truncated JSON
+        text when it had to be cut), ``input_bytes`` and ``input_truncated``
+    """
+    try:
+        raw = codec.dumps(input_data, default=str)
+    except Exception:
+        raw = repr(input_data).encode("utf-8")
+    if len(raw) <= MAX_INPUT_BYTES:
+        return {"input": input_data, "input_bytes": len(raw), "input_truncated": False}
+    return {
+        "input": raw[:MAX_INPUT_BYTES].decode("utf-8", errors="ignore"),
+        "input_bytes": len(raw),
+        "input_truncated": True,
+    }
+
+
+def stderr_tail(stderr: Optional[str]) -> Optional[str]:
+    """Last STDERR_TAIL_CHARS characters of stderr."""
+    if not stderr:
+        return None
+    return stderr[-STDERR_TAIL_CHARS:]
+
+
+class SlowCallRecorder:
+    """
+    Bounded ring buffer of slow skill invocations.
+
+    A call is recorded when its latency reaches the per-skill threshold
+    (manifest ``slow_threshold_ms``, else OPENSKILL_SLOW_MS), or when it
+    lands at or above the configured percentile of that skill's recent
+    latencies. The percentile cutoff is cached per skill and recomputed
+    (sorting a copy of the window, outside the lock) every
+    CUTOFF_REFRESH_SAMPLES calls; record construction is deferred until a
+    call qualifies. Most fast calls only pay for a window append.
+    """
+
+    def __init__(self, capacity: int, threshold_ms: int, percentile: float):
+        self.threshold_ms = threshold_ms
+        self.percentile = percentile
+        self._records: Deque[Dict[str, Any]] = collections.deque(maxlen=max(capacity, 1))
+        self._windows: Dict[str, Deque[float]] = {}
+        # Per skill: cached cutoff and samples appended since it was computed
+        self._cutoffs: Dict[str, Optional[float]] = {}
+        self._stale: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def _percentile_cutoff(self, samples: List[float]) -> Optional[float]:
+        if len(samples) < MIN_WINDOW_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        index = min(int(len(ordered) * self.percentile / 100.0), len(ordered) - 1)
+        return ordered[index]
+
+    def observe(
+        self,
+        skill_id: str,
+        latency_ms: float,
+        build_record: Callable[[], Dict[str, Any]],
+        threshold_ms: Optional[int] = None,
+    ) -> bool:
+        """
+        Feed one finished call; record it if it is slow.
+
+        Args:
+            skill_id: The skill ID
+            latency_ms: Call latency in milliseconds
+            build_record: Returns the snapshot to store (called only if slow)
+            threshold_ms: Per-skill threshold overriding the global one
+
+        Returns:
+            True if the call was recorded
+        """
+        limit = threshold_ms if threshold_ms is not None else self.threshold_ms
+        refresh = None
+        with self._lock:
+            window = self._windows.get(skill_id)
+            if window is None:
+                window = self._windows[skill_id] = collections.deque(maxlen=WINDOW_SIZE)
+            cutoff = self._cutoffs.get(skill_id)
+            stale = self._stale.get(skill_id, CUTOFF_REFRESH_SAMPLES)
+            if self.percentile > 0 and stale >= CUTOFF_REFRESH_SAMPLES:
+                # Judge this call against the window before it, as cached cutoffs are
+                refresh = list(window)
+                stale = 0
+            self._stale[skill_id] = stale + 1
+            window.append(latency_ms)
+
+        if refresh is not None:
+            cutoff = self._percentile_cutoff(refresh)
+            with self._lock:
+                self._cutoffs[skill_id] = cutoff
+
+        if limit and latency_ms >= limit:
+            reason = "threshold"
+        elif cutoff is not None and latency_ms >= cutoff:
+            reason = f"p{self.percentile:g}"
+        else:
+            return False
+
+        record = build_record()
+        record.update({
+            "skill_id": skill_id,
+            "latency_ms": round(latency_ms, 3),
+            "reason": reason,
+            "threshold_ms": limit or None,
+            "window_cutoff_ms": round(cutoff, 3) if cutoff is not None else None,
+            "recorded_at": time.time(),
+        })
+        with self._lock:
+            self._records.append(record)
+        return True
+
+    def snapshot(self, skill_id: Optional[str] = None, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Recorded calls, newest first."""
+        with self._lock:
+            records = list(self._records)
+        records.reverse()
+        if skill_id:
+            records = [r for r in records if r.get("skill_id") == skill_id]
+        return records[:limit] if limit else records
+
+    def clear(self) -> int:
+        """Drop all records; returns how many were removed."""
+        with self._lock:
+            count = len(self._records)
+            self._records.clear()
+        return count
+
+
+# Global recorder instance
+_recorder: Optional[SlowCallRecorder] = None
+
+
+def get_slow_recorder() -> SlowCallRecorder:
+    """Get the global slow-call recorder."""
+    global _recorder
+    if _recorder is None:
+        _recorder = SlowCallRecorder(
+            capacity=config.slow_buffer_size,
+            threshold_ms=config.slow_ms,
+            percentile=config.slow_percentile,
+        )
+    return _recorder
@@ -5,6 +5,8 @@ import logging
 import time
 from typing import Any, Dict, Optional
 
+from . import codec
+
 
 class TraceIDFormatter(logging.Formatter):
     """Custom formatter that ensures trace_id is always present."""
@@ -17,71 +19,43 @@ class TraceIDFormatter(logging.Formatter):
         return super().format(record)
 
 
-def setup_logging(debug: bool = False) -> None:
+def setup_logging(
+    debug: bool = False,
+    log_format: str = "text",
+    queue_size: int = 10000,
+    sample: str = "",
+) -> None:
     """
     Setup logging configuration.
 
+    Records go through a bounded queue to a background thread that formats
+    and writes them (see ``logpipe``), so request handlers never block on
+    stderr. Child loggers propagate to the root logger, whose queue handler
+    carries the trace ID filter.
+
     Args:
         debug: Enable debug logging
+        log_format: "json" (one object per line) or "text"
+        queue_size: Records buffered before new ones are dropped
+        sample: Per-route sampling rates for records below WARNING
     """
+    from .logpipe import JSONFormatter, install, parse_sample_rates
+
     level = logging.DEBUG if debug else logging.INFO
-    
+
     # Use a format that includes trace_id
     format_str = (
         "%(asctime)s - %(name)s - %(levelname)s - "
         "[%(trace_id)s] - %(message)s"
     )
 
-    # Get root logger
-    root_logger = logging.getLogger()
-    
-    # Create filter instance (shared across handlers)
-    trace_filter = TraceIDFilter()
-    
-    # Only configure if not already configured
-    if not root_logger.handlers:
-        # Create a handler
-        handler = logging.StreamHandler()
-        handler.setLevel(level)
-        
-        # Use custom formatter that ensures trace_id exists
-        formatter = TraceIDFormatter(format_str)
-        handler.setFormatter(formatter)
-        
-        # Add filter to handler as well (double protection)
-        handler.addFilter(trace_filter)
-        
-        root_logger.setLevel(level)
-        root_logger.addHandler(handler)
-    else:
-        # Update existing handlers
-        for handler in root_logger.handlers:
-            # Update formatter to use TraceIDFormatter
-            if not isinstance(handler.formatter, TraceIDFormatter):
-                handler.setFormatter(TraceIDFormatter(format_str))
-            # Add filter if not present
-            if not any(isinstance(f, TraceIDFilter) for f in handler.filters):
-                handler.addFilter(trace_filter)
-        
-        # Also add to logger filters as backup
-        if not any(isinstance(f, TraceIDFilter) for f in root_logger.filters):
-            root_logger.addFilter(trace_filter)
-    
-    # Ensure all child loggers also get the filter
-    # This is important for modules that create their own loggers
-    # and for uvicorn's multiprocessing environment
-    for logger_name in list(logging.Logger.manager.loggerDict.keys()):
-        child_logger = logging.getLogger(logger_name)
-        if child_logger is not root_logger:
-            # Update handlers
-            for handler in child_logger.handlers:
-                if not isinstance(handler.formatter, TraceIDFormatter):
-                    handler.setFormatter(TraceIDFormatter(format_str))
-                if not any(isinstance(f, TraceIDFilter) for f in handler.filters):
-                    handler.addFilter(trace_filter)
-            # Add to logger filters
-            if not any(isinstance(f, TraceIDFilter) for f in child_logger.filters):
-                child_logger.addFilter(trace_filter)
+    handler = logging.StreamHandler()
+    handler.setLevel(level)
+    handler.setFormatter(JSONFormatter() if log_format == "json" else TraceIDFormatter(format_str))
+
+    pipeline = install(handler, level, queue_size, parse_sample_rates(sample))
+    if not any(isinstance(f, TraceIDFilter) for f in pipeline.handler.filters):
+        pipeline.handler.addFilter(TraceIDFilter())
 
 
 class TraceIDFilter(logging.Filter):
@@ -108,7 +82,7 @@ def safe_json_loads(text: str) -> Optional[Dict[str, Any]]:
         Parsed dict or None if parsing fails
     """
     try:
-        return json.loads(text)
+        return codec.loads(text)
     except (json.JSONDecodeError, TypeError):
         return None
 
@@ -0,0 +1,76 @@
+"""Start-up warm-up so no user request pays first-use costs."""
+
+import importlib
+import logging
+import time
+from typing import Dict
+
+from .config import config
+
+logger = logging.getLogger(__name__)
+
+# SDK modules imported lazily by the LLM clients, per configured provider
+PROVIDER_SDKS = {
+    "openai": ("openai",),
+    "dashscope": ("dashscope",),
+    "custom": ("openai",),
+}
+
+
+def warm_up(pools: bool = True) -> Dict[str, float]:
+    """
+    Pre-load everything the first request would otherwise load.
+
+    Loads the skill registry and runner factory, starts the workers of
+    pooled skills and, when an LLM is configured, imports the provider
+    SDKs (which the clients import inside methods) and builds the agent's
+    tool schemas. Blocking; call it before the worker starts accepting
+    requests.
+
+    Args:
+        pools: Start pooled skill workers and the HTTP skill client (not in
+            a pre-fork parent: both are per process)
+
+    Returns:
+        Milliseconds spent per step
+    """
+    timings: Dict[str, float] = {}
+
+    def step(name: str, func) -> None:
+        start = time.perf_counter()
+        try:
+            func()
+        except Exception as e:
+            # Warm-up is best effort; the request path reports real errors
+            logger.warning(f"Warm-up step {name} failed: {e}")
+        timings[name] = round((time.perf_counter() - start) * 1000, 3)
+
+    from .registry import get_registry
+    from .runners import get_factory
+
+    step("registry", get_registry)
+    step("runners", get_factory)
+    if pools:
+        step("pools", lambda: get_factory().warm(get_registry()))
+
+    if config.has_llm_config():
+        modules = []
+        for provider in config.get_llm_providers():
+            for module in PROVIDER_SDKS.get(provider, ()):
+                if module not in modules:
+                    modules.append(module)
+        for module in modules:
+            step(f"import:{module}", lambda m=module: importlib.import_module(m))
+
+        def _tool_schemas() -> None:
+            from .agent import get_agent
+
+            agent = get_agent()
+            agent.tool_manager.get_available_tools()
+            agent.validator.warm()
+
+        step("tool_schemas", _tool_schemas)
+
+    total = round(sum(timings.values()), 3)
+    logger.info(f"Warm-up finished in {total} ms: {timings}")
+    return timings
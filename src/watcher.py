@@ -0,0 +1,102 @@
+"""File watcher that hot-reloads the skill registry."""
+
+import logging
+import threading
+from typing import Optional
+
+from .config import config
+from .registry import SkillRegistry, get_registry
+
+logger = logging.getLogger(__name__)
+
+# watchfiles (inotify/FSEvents via Rust) is optional; fall back to polling
+try:
+    import watchfiles  # type: ignore
+except ImportError:
+    watchfiles = None
+
+
+class SkillWatcher:
+    """
+    Background thread refreshing a SkillRegistry when its files change.
+
+    Uses watchfiles when installed (kernel notifications, debounced) and
+    otherwise polls file signatures every ``interval`` seconds. Either way
+    the registry itself decides what changed, so a spurious wake-up costs
+    one directory scan.
+    """
+
+    def __init__(self, registry: SkillRegistry, interval: float = 1.0, use_notify: bool = True):
+        self.registry = registry
+        self.interval = interval
+        self.use_notify = use_notify and watchfiles is not None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Start watching in a daemon thread."""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="skill-watcher", daemon=True)
+        self._thread.start()
+        mode = "watchfiles" if self.use_notify else f"polling every {self.interval}s"
+        logger.info(f"Watching skills for changes ({mode})")
+
+    def stop(self) -> None:
+        """Stop the watcher thread."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                if self.use_notify:
+                    self._watch_notify()
+                else:
+                    self._watch_poll()
+            except Exception as e:
+                # Keep watching; fall back to polling if notifications break
+                logger.error(f"Skill watcher error: {e}", exc_info=True)
+                self.use_notify = False
+                self._stop.wait(self.interval)
+
+    def _watch_notify(self) -> None:
+        paths = [str(p) for p in self.registry.watch_paths()]
+        for _ in watchfiles.watch(*paths, stop_event=self._stop):
+            self._refresh()
+            if sorted(paths) != sorted(str(p) for p in self.registry.watch_paths()):
+                # A manifest now points at a new directory; re-subscribe
+                return
+
+    def _watch_poll(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._refresh()
+
+    def _refresh(self) -> None:
+        changed = self.registry.refresh()
+        if changed:
+            logger.info(f"Skill registry reloaded: changed={sorted(changed)}, version={self.registry.version}")
+
+
+# Global watcher instance
+_watcher: Optional[SkillWatcher] = None
+
+
+def start_watcher() -> Optional[SkillWatcher]:
+    """Start the global watcher if OPENSKILL_WATCH_SKILLS is enabled."""
+    global _watcher
+    if not config.watch_skills:
+        return None
+    if _watcher is None:
+        _watcher = SkillWatcher(get_registry(), interval=config.watch_interval_ms / 1000.0)
+    _watcher.start()
+    return _watcher
+
+
+def stop_watcher() -> None:
+    """Stop the global watcher if running."""
+    if _watcher is not None:
+        _watcher.stop()
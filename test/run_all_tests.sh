@@ -39,11 +39,12 @@ FAILED=0
 run_test() {
     local test_name=$1
     local test_script=$2
+    shift 2
     
     echo -e "${YELLOW}Running: ${test_name}${NC}"
     ((TOTAL++))
     
-    if bash "$test_script"; then
+    if bash "$test_script" "$@"; then
         echo -e "${GREEN}✅ ${test_name} passed${NC}"
         ((PASSED++))
     else
@@ -57,6 +58,28 @@ run_test() {
 run_test "API Tests" "./test/test_api.sh"
 run_test "Integration Tests" "./test/test_integration.sh"
 run_test "Echo Skill Tests" "./test/test_echo_skill.sh"
+run_test "Log Transform Skill Tests" "./test/test_log_transform.sh"
+# Direct invocation only; the Agent API part needs an LLM provider
+run_test "Calculator Skill Tests" "./test/test_calculator.sh" none
+# Starts its own nodes and front end
+run_test "Skill Node Tests" "./test/test_remote_nodes.sh"
+# Starts its own host with a temporary skill per runner mode
+run_test "Runner Mode Tests" "./test/test_runner_modes.sh"
+# Starts its own host with the skill watcher enabled
+run_test "Skill Watcher Tests" "./test/test_skill_watcher.sh"
+# Starts its own hosts with and without the memfd handoff
+run_test "Handoff Tests" "./test/test_handoff.sh"
+# In-process, no host needed
+run_test "Argument Repair Tests" "./test/test_argument_repair.sh"
+# CLI on scratch copies of the manifests, no host needed
+run_test "Manifest Snapshot Tests" "./test/test_manifest_snapshot.sh"
+# Starts its own stub LLM and 4-worker host
+run_test "Agent Affinity Tests" "./test/test_agent_affinity.sh"
+# Needs the admin token to register its manifests
+if [ -n "$OPENSKILL_ADMIN_TOKEN" ]; then
+    run_test "HTTP Skill Tests" "./test/test_http_skill.sh"
+    run_test "Exec Skill Tests" "./test/test_exec_skill.sh"
+fi
 
 # Summary
 echo -e "${BLUE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Stub skill service for testing `type: http` skills.
+
+Routes (all POST, body {"input": {...}, "trace_id": "..."}):
+  /echo      -> result envelope echoing input.text
+  /plain     -> bare JSON object (the host wraps it as data)
+  /slow      -> sleeps input.ms milliseconds, then like /echo
+  /fail      -> HTTP 503 with a plain-text body
+
+Usage: python test/stub_skill_service.py [port]   (default 8901)
+"""
+
+import json
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+    disable_nagle_algorithm = True  # headers and body are separate writes
+
+    def _send(self, status: int, body: bytes, content_type: str = "application/json") -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", 0))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        payload = request.get("input") or {}
+
+        if self.path == "/fail":
+            self._send(503, b"overloaded", "text/plain")
+            return
+        if self.path == "/plain":
+            self._send(200, json.dumps({"received": payload}).encode())
+            return
+        if self.path == "/slow":
+            time.sleep(payload.get("ms", 0) / 1000.0)
+        if self.path in ("/echo", "/slow"):
+            text = payload.get("text")
+            if not isinstance(text, str) or not text:
+                envelope = {
+                    "success": False,
+                    "skill_id": "stub",
+                    "trace_id": request.get("trace_id", ""),
+                    "data": None,
+                    "error": {"code": "INVALID_ARGUMENT", "message": 'Field "text" is required'},
+                    "meta": {"latency_ms": 0, "version": "0.1.0"},
+                }
+                self._send(400, json.dumps(envelope).encode())
+                return
+            envelope = {
+                "success": True,
+                "skill_id": "stub",
+                "trace_id": request.get("trace_id", ""),
+                "data": {"echoed": text, "trace_header": self.headers.get("X-Trace-Id")},
+                "error": None,
+                "meta": {"latency_ms": 0, "version": "0.1.0"},
+            }
+            self._send(200, json.dumps(envelope).encode())
+            return
+        self._send(404, b'{"detail": "not found"}')
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8901
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    print(f"Stub skill service on http://127.0.0.1:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,168 @@
+#!/bin/bash
+# Test script for agent conversation affinity across pre-fork workers
+#
+# Self-contained: starts the stub LLM (test/stub_llm_service.py) and a
+# 4-worker Skill Host of its own on HOST_PORT, so it needs no API key and
+# no running host. The stub answers "turns=N" with the number of user
+# messages it was sent, so a reply shows whether the history was kept.
+# Failover is tested on a second, single-process host (PEER_HOST_PORT)
+# whose explicit peers are a stalled one (accepts, never answers) and a
+# dead one (refuses connections). Run from the project root's virtualenv.
+
+set -e
+
+HOST_PORT=${HOST_PORT:-8903}
+LLM_PORT=${LLM_PORT:-8904}
+PEER_HOST_PORT=${PEER_HOST_PORT:-8905}
+STALLED_PORT=${STALLED_PORT:-8906}
+DEAD_PORT=${DEAD_PORT:-8907}
+BASE_URL="http://127.0.0.1:${HOST_PORT}"
+PEER_HOST="http://127.0.0.1:${PEER_HOST_PORT}"
+STALLED_PEER="http://127.0.0.1:${STALLED_PORT}"
+DEAD_PEER="http://127.0.0.1:${DEAD_PORT}"
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+ROOT_DIR="${SCRIPT_DIR}/.."
+WORK_DIR=$(mktemp -d)
+
+cleanup() {
+    for pid in "$SERVE_PID" "$LLM_PID" "$PEER_HOST_PID" "$STALLED_PID"; do
+        [ -n "$pid" ] && kill "$pid" 2>/dev/null || true
+    done
+    # Workers hand off their conversations before exiting
+    [ -n "$SERVE_PID" ] && wait "$SERVE_PID" 2>/dev/null || true
+    rm -rf "$WORK_DIR"
+}
+trap cleanup EXIT
+
+cd "$ROOT_DIR"
+
+echo "🧪 Testing agent conversation affinity..."
+echo "📍 Host: $BASE_URL (4 workers)"
+echo ""
+
+python3 test/stub_llm_service.py "$LLM_PORT" > /dev/null 2>&1 &
+LLM_PID=$!
+OPENAI_API_KEY=test OPENAI_API_BASE="http://127.0.0.1:${LLM_PORT}/v1" \
+    python3 -m src.cli serve --host 127.0.0.1 --port "$HOST_PORT" --workers 4 > /dev/null 2>&1 &
+SERVE_PID=$!
+sleep 8
+
+# chat MESSAGE [CONVERSATION_ID] (to CHAT_URL, default BASE_URL)
+chat() {
+    local body="{\"message\": \"$1\", \"provider\": \"openai\""
+    [ -n "$2" ] && body="${body}, \"conversation_id\": \"$2\""
+    curl -s -w ' HTTP %{http_code}' -X POST "${CHAT_URL:-$BASE_URL}/agent/chat" \
+      -H "Content-Type: application/json" \
+      -d "${body}}"
+}
+
+check() {
+    local name=$1 response=$2 pattern=$3
+    if echo "$response" | grep -q -- "$pattern"; then
+        echo "✅ $name passed"
+    else
+        echo "❌ $name failed"
+        echo "Response: $response"
+        exit 1
+    fi
+}
+
+# Test 1: Every turn of a conversation sees the whole history, whichever
+# worker the kernel hands the connection to
+echo "Test 1: Multi-turn conversation"
+for i in 1 2 3 4 5; do
+    RESPONSE=$(chat "turn $i" affinity-test-1)
+    check "Test 1 (turn $i)" "$RESPONSE" "\"response\":\"turns=$i\""
+done
+
+# Test 2: A new conversation gets an ID that later turns can use
+echo ""
+echo "Test 2: New conversation"
+RESPONSE=$(chat "hello")
+check "Test 2 (first turn)" "$RESPONSE" '"response":"turns=1"'
+CONVERSATION_ID=$(echo "$RESPONSE" | grep -o '"conversation_id":"[^"]*"' | cut -d'"' -f4)
+RESPONSE=$(chat "again" "$CONVERSATION_ID")
+check "Test 2 (second turn)" "$RESPONSE" '"response":"turns=2"'
+
+# Test 3: Rolling restart; each stopped worker hands its conversations to
+# the next owner, and restarted workers take them back
+echo ""
+echo "Test 3: Rolling worker restart"
+TURN=2
+for pid in $(ps -o pid= --ppid "$SERVE_PID"); do
+    kill -TERM "$pid"
+    sleep 3
+    TURN=$((TURN + 1))
+    RESPONSE=$(chat "turn $TURN" "$CONVERSATION_ID")
+    check "Test 3 (worker $pid restarted)" "$RESPONSE" "\"response\":\"turns=$TURN\""
+done
+
+# Test 4: The handoff endpoints are only for the other workers
+echo ""
+echo "Test 4: Peer endpoints are private"
+STATUS=$(curl -s -o /dev/null -w '%{http_code}' -X POST \
+    "${BASE_URL}/agent/_peer/conversations/${CONVERSATION_ID}/take")
+check "Test 4" "$STATUS" "404"
+RESPONSE=$(chat "still here" "$CONVERSATION_ID")
+check "Test 4 (conversation intact)" "$RESPONSE" "\"response\":\"turns=$((TURN + 1))\""
+
+# owned_by PEER [NEXT_PEER]: a conversation ID whose owner (and next
+# owner) on the failover host's ring is the given peer
+owned_by() {
+    python3 -c "
+import sys
+from src.agent.affinity import HashRing
+ring = HashRing(sys.argv[1].split(','))
+want = sys.argv[2:]
+print(next(f'failover-{i}' for i in range(10000) if ring.successors(f'failover-{i}')[:len(want)] == want))
+" "${PEER_HOST},${STALLED_PEER},${DEAD_PEER}" "$@"
+}
+
+# A peer that accepts connections, logs each one and never answers
+python3 -c "
+import socket, sys
+server = socket.create_server(('127.0.0.1', int(sys.argv[1])))
+held = []
+while True:
+    conn, _ = server.accept()
+    held.append(conn)
+    with open(sys.argv[2], 'a') as log:
+        log.write('accepted\\n')
+" "$STALLED_PORT" "${WORK_DIR}/stalled.log" > /dev/null 2>&1 &
+STALLED_PID=$!
+OPENAI_API_KEY=test OPENAI_API_BASE="http://127.0.0.1:${LLM_PORT}/v1" \
+    OPENSKILL_AGENT_PEERS="${PEER_HOST},${STALLED_PEER},${DEAD_PEER}" \
+    OPENSKILL_AGENT_SELF="$PEER_HOST" OPENSKILL_AGENT_PEER_TOKEN=affinity-test \
+    OPENSKILL_AGENT_FORWARD_TIMEOUT_MS=2000 \
+    python3 -m uvicorn src.app:app --host 127.0.0.1 --port "$PEER_HOST_PORT" > /dev/null 2>&1 &
+PEER_HOST_PID=$!
+sleep 5
+
+# Test 5: An owner that stalls after accepting the turn may be running it,
+# so the turn is not sent anywhere else and the owner is not skipped
+echo ""
+echo "Test 5: Stalled owner"
+STALLED_ID=$(owned_by "$STALLED_PEER")
+for attempt in 1 2; do
+    RESPONSE=$(CHAT_URL="$PEER_HOST" chat "stalled $attempt" "$STALLED_ID")
+    check "Test 5 (attempt $attempt: 504)" "$RESPONSE" "HTTP 504"
+    ACCEPTED=$(wc -l < "${WORK_DIR}/stalled.log")
+    if [ "$ACCEPTED" -ne "$attempt" ]; then
+        echo "❌ Test 5 failed: stalled peer saw $ACCEPTED connections after $attempt turns"
+        exit 1
+    fi
+done
+echo "✅ Test 5 passed"
+
+# Test 6: An owner that refuses connections never got the turn; its
+# conversations fail over to the next peer on the ring
+echo ""
+echo "Test 6: Dead owner"
+DEAD_ID=$(owned_by "$DEAD_PEER" "$PEER_HOST")
+RESPONSE=$(CHAT_URL="$PEER_HOST" chat "first" "$DEAD_ID")
+check "Test 6 (failover)" "$RESPONSE" '"response":"turns=1".*HTTP 200'
+RESPONSE=$(CHAT_URL="$PEER_HOST" chat "second" "$DEAD_ID")
+check "Test 6 (history kept)" "$RESPONSE" '"response":"turns=2".*HTTP 200'
+
+echo ""
+echo "✅ All agent affinity tests passed!"
@@ -0,0 +1,198 @@
+#!/bin/bash
+# Test script for the tool call argument repair pass (ToolCallValidator)
+#
+# Self-contained: drives the validator in-process, so it needs neither a
+# running host nor an LLM API key. Run from the project root's virtualenv.
+
+set -e
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+cd "${SCRIPT_DIR}/.."
+
+echo "🧪 Testing tool call argument repair..."
+echo ""
+
+PYTHONPATH=. OPENSKILL_LOG_FORMAT=text python3 - <<'EOF'
+import copy
+import json
+import sys
+from typing import List
+
+from pydantic import BaseModel
+
+from src.agent.models import ToolCall
+from src.agent.schemas import SKILL_INPUT_SCHEMAS
+from src.agent.validator import MAX_REPAIR_ROUNDS, ToolCallValidator
+from src.metrics import registry
+
+validator = ToolCallValidator()
+
+
+def validate(name, arguments):
+    sent = copy.deepcopy(arguments)
+    result = validator.validate(ToolCall(id="call_1", name=name, arguments=arguments))
+    if arguments != sent:
+        fail("arguments were modified in place", arguments)
+    return result
+
+
+def fail(name, detail):
+    print(f"❌ {name} failed")
+    print(f"Result: {detail}")
+    sys.exit(1)
+
+
+def check_repaired(name, tool, arguments, expected, repairs):
+    result = validate(tool, arguments)
+    if not result.valid:
+        fail(name, result.error_message)
+    for field, value in expected.items():
+        if result.corrected_arguments.get(field) != value:
+            fail(name, result.corrected_arguments)
+    if result.repairs != repairs:
+        fail(name, result.repairs)
+    print(f"✅ {name} passed")
+
+
+def check_rejected(name, tool, arguments, present, absent=()):
+    result = validate(tool, arguments)
+    if result.valid:
+        fail(name, result.corrected_arguments)
+    for text in present:
+        if text not in result.error_message:
+            fail(f"{name} (missing {text!r})", result.error_message)
+    for text in absent:
+        if text in result.error_message:
+            fail(f"{name} (unexpected {text!r})", result.error_message)
+    print(f"✅ {name} passed")
+
+
+print("Test 1: Repair kinds")
+check_repaired(
+    "Test 1 (json_list, wrap_list)", "calculator",
+    {"numbers": "[1, 2, 3]", "ops": "mean"},
+    {"numbers": [1.0, 2.0, 3.0], "ops": ["mean"]},
+    ["numbers: json_list", "ops: wrap_list"],
+)
+check_repaired(
+    "Test 1 (json_object)", "calculator",
+    {"numbers": [1], "ops": ["max"], "compare": '{"a": 10, "b": 12}'},
+    {"compare": {"a": 10.0, "b": 12.0}},
+    ["compare: json_object"],
+)
+check_repaired(
+    "Test 1 (number_to_str)", "file_search",
+    {"query": 404},
+    {"query": "404"},
+    ["query: number_to_str"],
+)
+check_repaired(
+    "Test 1 (str_to_int)", "file_search",
+    {"query": "error", "limit": "1,000"},
+    {"limit": 1000},
+    ["limit: str_to_int"],
+)
+check_repaired(
+    "Test 1 (str_to_number)", "calculator",
+    {"numbers": ["1,234.5", 2], "ops": ["sum"]},
+    {"numbers": [1234.5, 2.0]},
+    ["numbers.0: str_to_number"],
+)
+check_repaired(
+    "Test 1 (valid arguments untouched)", "echo",
+    {"text": "hello"},
+    {"text": "hello"},
+    None,
+)
+
+print("")
+print("Test 2: Repair rounds")
+# Elements of a list sent as a JSON string are only checked in round two
+check_repaired(
+    "Test 2 (two rounds)", "calculator",
+    {"numbers": '["1,000", 2]', "ops": ["mean"]},
+    {"numbers": [1000.0, 2.0]},
+    ["numbers: json_list", "numbers.0: str_to_number"],
+)
+
+
+class NestedInput(BaseModel):
+    values: List[List[List[List[int]]]]
+
+
+# Each JSON-encoded level takes one round
+SKILL_INPUT_SCHEMAS["nested_test"] = NestedInput
+try:
+    within = json.dumps([json.dumps([json.dumps([[1]])])])
+    beyond = json.dumps([json.dumps([json.dumps([json.dumps([1])])])])
+    check_repaired(
+        f"Test 2 ({MAX_REPAIR_ROUNDS} rounds)", "nested_test",
+        {"values": within},
+        {"values": [[[[1]]]]},
+        ["values: json_list", "values.0: json_list", "values.0.0: json_list"],
+    )
+    check_rejected(
+        f"Test 2 (more than {MAX_REPAIR_ROUNDS} rounds)", "nested_test",
+        {"values": beyond},
+        ["- values: Input should be a valid list"],
+    )
+finally:
+    del SKILL_INPUT_SCHEMAS["nested_test"]
+
+print("")
+print("Test 3: Values are never changed")
+check_rejected(
+    "Test 3 (fractional float for an integer)", "calculator",
+    {"numbers": [1], "ops": ["histogram"], "bins": 5.6},
+    ["- bins: Input should be a valid integer, got a number with a fractional part"],
+)
+check_rejected(
+    "Test 3 (fractional string for an integer)", "file_search",
+    {"query": "error", "limit": "12.7"},
+    ["- limit: Input should be a valid integer"],
+)
+check_rejected(
+    "Test 3 (ambiguous decimal comma)", "calculator",
+    {"numbers": ["3,5"], "ops": ["mean"]},
+    ["- numbers.0: Input should be a valid number"],
+)
+
+print("")
+print("Test 4: Constraints still apply to repaired values")
+# "10,001" parses, but k has le=10000; the LLM sees the error for what it sent
+check_rejected(
+    "Test 4 (le)", "calculator",
+    {"numbers": [1], "ops": ["top_k"], "k": "10,001"},
+    ["- k: Input should be a valid integer, unable to parse string as an integer"],
+    ["less than or equal"],
+)
+check_rejected(
+    "Test 4 (ge)", "calculator",
+    {"numbers": [1], "ops": ["histogram"], "bins": "-1,000"},
+    ["- bins: Input should be a valid integer, unable to parse string as an integer"],
+    ["greater than or equal"],
+)
+
+print("")
+print("Test 5: A failed repair reports the original errors")
+# ops alone could be repaired; the error still lists it as sent
+check_rejected(
+    "Test 5", "calculator",
+    {"numbers": ["3,5"], "ops": "mean"},
+    ["- numbers.0: Input should be a valid number", "- ops: Input should be a valid list"],
+)
+
+print("")
+print("Test 6: Repair metrics")
+metrics = registry.render()
+for line in (
+    'openskill_agent_argument_repairs_total{tool="calculator",kind="json_list"} 2',
+    'openskill_agent_argument_repairs_total{tool="file_search",kind="str_to_int"} 1',
+):
+    if line not in metrics:
+        fail("Test 6", "\n".join(l for l in metrics.splitlines() if "repairs" in l))
+print("✅ Test 6 passed")
+EOF
+
+echo ""
+echo "✅ All argument repair tests passed!"
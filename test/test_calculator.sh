@@ -1,5 +1,9 @@
 #!/bin/bash
-# Test script for calculator skill via Agent API
+# Test script for calculator skill: direct invocation, then via Agent API
+#
+# Usage: test_calculator.sh [PROVIDER|none] [NUMBERS]
+# The Agent API part needs an LLM provider; pass "none" to skip it.
+# Run from project root.
 
 set -e
 
@@ -13,10 +17,11 @@ NC='\033[0m'
 BASE_URL=${OPENSKILL_HTTP_BASE_URL:-http://127.0.0.1:8000}
 PROVIDER=${1:-qwen}
 NUMBERS=${2:-"1,2,5,6.7,3.3,9"}
+ALLOWED_ROOT=${OPENSKILL_ALLOWED_ROOT:-./data}
 
 echo ""
 echo -e "${BLUE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
-echo -e "${GREEN}🧮 Testing Calculator via Agent API${NC}"
+echo -e "${GREEN}🧮 Testing Calculator Skill${NC}"
 echo -e "${BLUE}━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━━${NC}"
 echo ""
 echo -e "📍 Base URL: ${GREEN}${BASE_URL}${NC}"
@@ -31,6 +36,118 @@ if ! curl -s -f "${BASE_URL}/health" > /dev/null 2>&1; then
     exit 1
 fi
 
+# Number files live in a scratch directory under the allowed root
+mkdir -p "$ALLOWED_ROOT"
+WORK_DIR=$(mktemp -d "${ALLOWED_ROOT}/calculator_test.XXXXXX")
+trap 'rm -rf "$WORK_DIR"' EXIT
+
+invoke() {
+    curl -s -X POST "${BASE_URL}/skills/calculator:invoke" \
+      -H "Content-Type: application/json" \
+      -d "{\"input\": $1}"
+}
+
+check() {
+    local name=$1 response=$2 pattern=$3
+    if echo "$response" | grep -q -- "$pattern"; then
+        echo -e "${GREEN}✅ ${name} passed${NC}"
+    else
+        echo -e "${RED}❌ ${name} failed${NC}"
+        echo "Response: $response"
+        exit 1
+    fi
+}
+
+# Small fixed input with hand-checked results: sample variance
+# (9+4+1+0+36)/4, linear-interpolated percentiles, 3 equal-width bins over
+# [1, 10]; the sketch keeps every value of so few, so it answers by rank
+FIXED='"numbers": [1, 2, 3, 4, 10]'
+
+echo -e "${YELLOW}Test 1: Exact values for every op${NC}"
+RESPONSE=$(invoke "{${FIXED}, \"ops\": [\"mean\", \"median\", \"min\", \"max\", \"sum\", \"variance\", \"stddev\", \"percentile\", \"histogram\", \"top_k\", \"approx_percentile\"], \"percentiles\": [25, 50, 90], \"bins\": 3, \"k\": 2}")
+check "Test 1 (mean/median/min/max/sum)" "$RESPONSE" '"mean":4.0,"median":3.0,"min":1.0,"max":10.0,"sum":20.0'
+check "Test 1 (variance/stddev)" "$RESPONSE" '"variance":12.5,"stddev":3.5355339059327378'
+check "Test 1 (percentile)" "$RESPONSE" '"percentile":{"25":2.0,"50":3.0,"90":7.6000000000000005}'
+check "Test 1 (histogram)" "$RESPONSE" '"histogram":{"edges":\[1.0,4.0,7.0,10.0\],"counts":\[3,1,1\]}'
+check "Test 1 (top_k)" "$RESPONSE" '"top_k":\[10.0,4.0\]'
+check "Test 1 (approx_percentile)" "$RESPONSE" '"approx_percentile":{"values":{"25":2.0,"50":3.0,"90":10.0},"rank_error":0.01,"exact":false}'
+
+echo ""
+echo -e "${YELLOW}Test 2: One error case per op${NC}"
+# Ops without parameters reject non-numeric values
+for op in mean median min max sum variance stddev; do
+    check "Test 2 ($op)" "$(invoke "{\"numbers\": [1, \"x\"], \"ops\": [\"$op\"]}")" \
+      '"code":"INVALID_ARGUMENT","message":"Field \\"numbers\\" must contain only numeric values'
+done
+check "Test 2 (percentile)" "$(invoke "{${FIXED}, \"ops\": [\"percentile\"], \"percentiles\": [101]}")" \
+  '"field":"percentiles"'
+check "Test 2 (histogram)" "$(invoke "{${FIXED}, \"ops\": [\"histogram\"], \"bins\": 0}")" \
+  '"field":"bins"'
+check "Test 2 (top_k)" "$(invoke "{${FIXED}, \"ops\": [\"top_k\"], \"k\": 0}")" \
+  '"field":"k"'
+check "Test 2 (approx_percentile)" "$(invoke "{${FIXED}, \"ops\": [\"approx_percentile\"], \"sketch_error\": 0.9}")" \
+  '"field":"sketch_error"'
+
+echo ""
+echo -e "${YELLOW}Test 3: numbers_path files (text, f64, npy)${NC}"
+# The same values in each format; blank lines in text are skipped
+printf '1\n2\n\n3\n4\n10\n' > "${WORK_DIR}/numbers.txt"
+python3 - "$WORK_DIR" <<'PY'
+import struct
+import sys
+
+values = [1.0, 2.0, 3.0, 4.0, 10.0]
+data = struct.pack("<5d", *values)
+with open(f"{sys.argv[1]}/numbers.f64", "wb") as f:
+    f.write(data)
+# .npy v1.0: magic, version, header length, header padded to 64 bytes
+header = "{'descr': '<f8', 'fortran_order': False, 'shape': (5,), }"
+header = header.ljust(64 - 10 - 1) + "\n"
+with open(f"{sys.argv[1]}/numbers.npy", "wb") as f:
+    f.write(b"\x93NUMPY\x01\x00" + struct.pack("<H", len(header)) + header.encode("latin1") + data)
+# Not a whole number of float64 values
+with open(f"{sys.argv[1]}/short.f64", "wb") as f:
+    f.write(data[:7])
+PY
+for ext in txt f64 npy; do
+    RESPONSE=$(invoke "{\"numbers_path\": \"${WORK_DIR}/numbers.${ext}\", \"ops\": [\"mean\", \"median\", \"variance\", \"top_k\"], \"k\": 2}")
+    check "Test 3 ($ext)" "$RESPONSE" '"mean":4.0,"median":3.0,"variance":12.5,"top_k":\[10.0,4.0\]'
+done
+# An explicit format overrides the extension
+cp "${WORK_DIR}/numbers.f64" "${WORK_DIR}/numbers.dat"
+check "Test 3 (numbers_format f64)" \
+  "$(invoke "{\"numbers_path\": \"${WORK_DIR}/numbers.dat\", \"numbers_format\": \"f64\", \"ops\": [\"sum\"]}")" \
+  '"sum":20.0'
+
+echo ""
+echo -e "${YELLOW}Test 4: numbers_path errors${NC}"
+check "Test 4 (outside allowed root)" \
+  "$(invoke "{\"numbers_path\": \"${WORK_DIR}/../../etc/passwd\", \"ops\": [\"sum\"]}")" \
+  '"code":"FORBIDDEN_PATH"'
+check "Test 4 (missing file)" \
+  "$(invoke "{\"numbers_path\": \"${WORK_DIR}/missing.txt\", \"ops\": [\"sum\"]}")" \
+  '"code":"NOT_FOUND"'
+check "Test 4 (numbers and numbers_path)" \
+  "$(invoke "{${FIXED}, \"numbers_path\": \"${WORK_DIR}/numbers.txt\", \"ops\": [\"sum\"]}")" \
+  'are mutually exclusive'
+check "Test 4 (unsupported numbers_format)" \
+  "$(invoke "{\"numbers_path\": \"${WORK_DIR}/numbers.txt\", \"numbers_format\": \"csv\", \"ops\": [\"sum\"]}")" \
+  'Unsupported numbers_format: csv'
+check "Test 4 (truncated f64)" \
+  "$(invoke "{\"numbers_path\": \"${WORK_DIR}/short.f64\", \"ops\": [\"sum\"]}")" \
+  'is not a multiple of 8'
+printf '1\nabc\n' > "${WORK_DIR}/bad.txt"
+check "Test 4 (non-numeric text line)" \
+  "$(invoke "{\"numbers_path\": \"${WORK_DIR}/bad.txt\", \"ops\": [\"sum\"]}")" \
+  'line 2: could not convert'
+
+echo ""
+if [ "$PROVIDER" = "none" ]; then
+    echo -e "${YELLOW}Skipping Agent API test (no provider)${NC}"
+    echo ""
+    exit 0
+fi
+
 # Test agent chat with calculator request
 echo -e "${YELLOW}Sending request to Agent...${NC}"
 echo ""
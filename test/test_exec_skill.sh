@@ -0,0 +1,113 @@
+#!/bin/bash
+# Test script for runtime: exec skills (grep wrapped with an argv template)
+#
+# The host must run with OPENSKILL_ADMIN_TOKEN set and grep allow-listed
+# (OPENSKILL_EXEC_ALLOWLIST=grep): the test adds its manifests under
+# skills/ and reloads them via /debug/reload.
+
+set -e
+
+BASE_URL=${OPENSKILL_HTTP_BASE_URL:-http://127.0.0.1:8000}
+TRACE_ID="test-$(date +%s)"
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+SKILLS_DIR="${SCRIPT_DIR}/../skills"
+DATA_DIR="${SCRIPT_DIR}/../data/exec_test"
+
+if [ -z "$OPENSKILL_ADMIN_TOKEN" ]; then
+    echo "❌ OPENSKILL_ADMIN_TOKEN is not set (needed for /debug/reload)"
+    exit 1
+fi
+
+reload() {
+    curl -s -X POST "${BASE_URL}/debug/reload" -H "X-Admin-Token: ${OPENSKILL_ADMIN_TOKEN}" > /dev/null
+}
+
+cleanup() {
+    rm -f "${SKILLS_DIR}"/exec_grep_*.yaml
+    rm -rf "$DATA_DIR"
+    reload || true
+}
+trap cleanup EXIT
+
+echo "🧪 Testing exec skills..."
+echo "📍 Base URL: $BASE_URL"
+echo ""
+
+mkdir -p "$DATA_DIR"
+printf 'alpha\nbeta\nalphabet\n' > "${DATA_DIR}/words.txt"
+printf '{"level":"error","msg":"disk full"}\n{"level":"info","msg":"ok"}\n' > "${DATA_DIR}/events.jsonl"
+
+# $1: id suffix, $2: output_format, $3: args (YAML flow sequence)
+write_manifest() {
+    cat > "${SKILLS_DIR}/exec_grep_$1.yaml" <<EOF
+id: exec_grep_$1
+type: cli
+runtime: exec
+entry: grep
+args: $3
+output_format: $2
+ok_exit_codes: [0, 1]
+timeout_ms: 5000
+allowed_root: ./data
+EOF
+}
+write_manifest text text '["-n", "--", "{pattern}", "{path:path}"]'
+write_manifest jsonl jsonl '["--", "{pattern}", "{path:path}"]'
+write_manifest unsafe text '["{pattern}", "{path:path}"]'
+reload
+
+invoke() {
+    curl -s -X POST "${BASE_URL}/skills/$1:invoke" \
+      -H "Content-Type: application/json" \
+      -H "X-Trace-Id: ${TRACE_ID}" \
+      -d "$2"
+}
+
+check() {
+    local name=$1 response=$2 pattern=$3
+    if echo "$response" | grep -q -- "$pattern"; then
+        echo "✅ $name passed"
+    else
+        echo "❌ $name failed"
+        echo "Response: $response"
+        exit 1
+    fi
+}
+
+# Test 1: Plain-text output
+echo "Test 1: grep with text output"
+RESPONSE=$(invoke exec_grep_text '{"input": {"pattern": "alpha", "path": "exec_test/words.txt"}}')
+check "Test 1" "$RESPONSE" '"stdout":"1:alpha\\n3:alphabet\\n"'
+
+# Test 2: Exit code 1 (no match) is listed in ok_exit_codes
+echo ""
+echo "Test 2: No match"
+RESPONSE=$(invoke exec_grep_text '{"input": {"pattern": "zzz", "path": "exec_test/words.txt"}}')
+check "Test 2" "$RESPONSE" '"success":true'
+
+# Test 3: JSON Lines output
+echo ""
+echo "Test 3: grep with jsonl output"
+RESPONSE=$(invoke exec_grep_jsonl '{"input": {"pattern": "error", "path": "exec_test/events.jsonl"}}')
+check "Test 3" "$RESPONSE" '"records":\[{"level":"error","msg":"disk full"}\]'
+
+# Test 4: Path outside allowed_root
+echo ""
+echo "Test 4: Path traversal (should fail)"
+RESPONSE=$(invoke exec_grep_text '{"input": {"pattern": "root", "path": "../../etc/passwd"}}')
+check "Test 4" "$RESPONSE" '"code":"FORBIDDEN_PATH"'
+
+# Test 5: Option-like value without "--" in the template
+echo ""
+echo "Test 5: Option-like value (should fail)"
+RESPONSE=$(invoke exec_grep_unsafe '{"input": {"pattern": "-r", "path": "exec_test/words.txt"}}')
+check "Test 5" "$RESPONSE" '"code":"FORBIDDEN_PATH"'
+
+# Test 6: Missing template field
+echo ""
+echo "Test 6: Missing field (should fail)"
+RESPONSE=$(invoke exec_grep_text '{"input": {"path": "exec_test/words.txt"}}')
+check "Test 6" "$RESPONSE" '"code":"INVALID_ARGUMENT"'
+
+echo ""
+echo "✅ All exec skill tests passed!"
@@ -0,0 +1,153 @@
+#!/bin/bash
+# Test script for the memfd handoff of large skill payloads
+# (OPENSKILL_HANDOFF_BYTES)
+#
+# Self-contained: starts one Skill Host with a 64KB handoff threshold on
+# HOST_PORT and one with the handoff disabled on PIPE_HOST_PORT, so it
+# does not need a running host. Linux only (memfd_create). Run from the
+# project root's virtualenv.
+
+set -e
+
+HOST_PORT=${HOST_PORT:-8910}
+PIPE_HOST_PORT=${PIPE_HOST_PORT:-8911}
+BASE_URL="http://127.0.0.1:${HOST_PORT}"
+PIPE_BASE_URL="http://127.0.0.1:${PIPE_HOST_PORT}"
+THRESHOLD=65536
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+WORK_DIR=$(mktemp -d)
+
+cleanup() {
+    [ -n "$SERVE_PID" ] && kill "$SERVE_PID" 2>/dev/null || true
+    [ -n "$PIPE_SERVE_PID" ] && kill "$PIPE_SERVE_PID" 2>/dev/null || true
+    rm -rf "$WORK_DIR"
+}
+trap cleanup EXIT
+
+cd "${SCRIPT_DIR}/.."
+
+echo "🧪 Testing memfd handoff..."
+echo "📍 Host: $BASE_URL (handoff above ${THRESHOLD} bytes)"
+echo "📍 Host: $PIPE_BASE_URL (handoff disabled)"
+echo ""
+
+OPENSKILL_HANDOFF_BYTES=$THRESHOLD OPENSKILL_LOG_FORMAT=text \
+    python3 -m uvicorn src.app:app --host 127.0.0.1 --port "$HOST_PORT" > /dev/null 2>&1 &
+SERVE_PID=$!
+OPENSKILL_HANDOFF_BYTES=0 OPENSKILL_LOG_FORMAT=text \
+    python3 -m uvicorn src.app:app --host 127.0.0.1 --port "$PIPE_HOST_PORT" > /dev/null 2>&1 &
+PIPE_SERVE_PID=$!
+sleep 5
+
+# Request bodies well above the threshold: 200000 characters for echo
+# (returned as is), 20000 numbers for calculator (a small result)
+python3 - "$WORK_DIR" <<'EOF'
+import json
+import sys
+
+work_dir = sys.argv[1]
+with open(f"{work_dir}/echo.json", "w") as f:
+    json.dump({"input": {"text": "x" * 200000}}, f)
+with open(f"{work_dir}/blank.json", "w") as f:
+    json.dump({"input": {"text": " " * 200000}}, f)
+with open(f"{work_dir}/calculator.json", "w") as f:
+    json.dump({"input": {"numbers": list(range(1, 20001)), "ops": ["sum", "max"]}}, f)
+EOF
+
+# invoke BASE_URL SKILL BODY_FILE
+invoke() {
+    curl -s -X POST "$1/skills/$2:invoke" \
+      -H "Content-Type: application/json" \
+      --data-binary "@$3"
+}
+
+# handoff_bytes BASE_URL DIRECTION: openskill_handoff_bytes_total (0 if unset)
+handoff_bytes() {
+    local value
+    value=$(curl -s "$1/metrics" | grep "^openskill_handoff_bytes_total{direction=\"$2\"}" | awk '{print $2}')
+    echo "${value:-0}" | cut -d. -f1
+}
+
+check() {
+    local name=$1 response=$2 pattern=$3
+    if echo "$response" | grep -q -- "$pattern"; then
+        echo "✅ $name passed"
+    else
+        echo "❌ $name failed"
+        echo "Response: ${response:0:300}"
+        exit 1
+    fi
+}
+
+# check_grew NAME BEFORE AFTER MIN: the counter grew by at least MIN
+check_grew() {
+    if [ $(($3 - $2)) -ge "$4" ]; then
+        echo "✅ $1 passed"
+    else
+        echo "❌ $1 failed: grew by $(($3 - $2)) bytes, expected at least $4"
+        exit 1
+    fi
+}
+
+echoed_length() {
+    python3 -c "import json, sys; print(len(json.load(sys.stdin)['data']['echoed']))"
+}
+
+# Test 1: Small payloads keep using the pipes
+echo "Test 1: Small payload"
+IN_BEFORE=$(handoff_bytes "$BASE_URL" input)
+OUT_BEFORE=$(handoff_bytes "$BASE_URL" output)
+echo '{"input": {"text": "hello"}}' > "${WORK_DIR}/small.json"
+check "Test 1 (call)" "$(invoke "$BASE_URL" echo "${WORK_DIR}/small.json")" '"echoed":"hello"'
+if [ "$(handoff_bytes "$BASE_URL" input)" != "$IN_BEFORE" ] \
+    || [ "$(handoff_bytes "$BASE_URL" output)" != "$OUT_BEFORE" ]; then
+    echo "❌ Test 1 failed: a small payload went through a memfd"
+    exit 1
+fi
+echo "✅ Test 1 (pipes only) passed"
+
+# Test 2: A large request and result both travel through memfds
+echo ""
+echo "Test 2: Large input and output"
+IN_BEFORE=$(handoff_bytes "$BASE_URL" input)
+OUT_BEFORE=$(handoff_bytes "$BASE_URL" output)
+RESPONSE=$(invoke "$BASE_URL" echo "${WORK_DIR}/echo.json")
+check "Test 2 (call)" "$RESPONSE" '"success":true'
+check "Test 2 (result intact)" "$(echo "$RESPONSE" | echoed_length)" "^200000$"
+check_grew "Test 2 (input handoff)" "$IN_BEFORE" "$(handoff_bytes "$BASE_URL" input)" 200000
+check_grew "Test 2 (output handoff)" "$OUT_BEFORE" "$(handoff_bytes "$BASE_URL" output)" 200000
+
+# Test 3: A large request with a small result hands off the input only
+echo ""
+echo "Test 3: Large input, small output"
+IN_BEFORE=$(handoff_bytes "$BASE_URL" input)
+OUT_BEFORE=$(handoff_bytes "$BASE_URL" output)
+check "Test 3 (call)" "$(invoke "$BASE_URL" calculator "${WORK_DIR}/calculator.json")" \
+  '"results":{"sum":200010000.0,"max":20000.0}'
+check_grew "Test 3 (input handoff)" "$IN_BEFORE" "$(handoff_bytes "$BASE_URL" input)" $THRESHOLD
+if [ "$(handoff_bytes "$BASE_URL" output)" != "$OUT_BEFORE" ]; then
+    echo "❌ Test 3 failed: a small result went through a memfd"
+    exit 1
+fi
+echo "✅ Test 3 (output on stdout) passed"
+
+# Test 4: Skill errors for a handed-off request come back as usual
+echo ""
+echo "Test 4: Error for a large input"
+check "Test 4" "$(invoke "$BASE_URL" echo "${WORK_DIR}/blank.json")" \
+  '"code":"INVALID_ARGUMENT","message":"Field \\"text\\" is required'
+
+# Test 5: With OPENSKILL_HANDOFF_BYTES=0 the same payloads use the pipes
+echo ""
+echo "Test 5: Handoff disabled"
+RESPONSE=$(invoke "$PIPE_BASE_URL" echo "${WORK_DIR}/echo.json")
+check "Test 5 (call)" "$RESPONSE" '"success":true'
+check "Test 5 (result intact)" "$(echo "$RESPONSE" | echoed_length)" "^200000$"
+if curl -s "${PIPE_BASE_URL}/metrics" | grep -q '^openskill_handoff_bytes_total{'; then
+    echo "❌ Test 5 failed: handoff used although disabled"
+    exit 1
+fi
+echo "✅ Test 5 (no handoff) passed"
+
+echo ""
+echo "✅ All memfd handoff tests passed!"
@@ -0,0 +1,104 @@
+#!/bin/bash
+# Test script for type: http skills (against test/stub_skill_service.py)
+#
+# The host must run with OPENSKILL_ADMIN_TOKEN set: the test adds its
+# manifests under skills/ and reloads them via /debug/reload.
+
+set -e
+
+BASE_URL=${OPENSKILL_HTTP_BASE_URL:-http://127.0.0.1:8000}
+STUB_PORT=${STUB_PORT:-8901}
+TRACE_ID="test-$(date +%s)"
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+SKILLS_DIR="${SCRIPT_DIR}/../skills"
+
+if [ -z "$OPENSKILL_ADMIN_TOKEN" ]; then
+    echo "❌ OPENSKILL_ADMIN_TOKEN is not set (needed for /debug/reload)"
+    exit 1
+fi
+
+reload() {
+    curl -s -X POST "${BASE_URL}/debug/reload" -H "X-Admin-Token: ${OPENSKILL_ADMIN_TOKEN}" > /dev/null
+}
+
+cleanup() {
+    rm -f "${SKILLS_DIR}"/http_stub_*.yaml
+    reload || true
+    [ -n "$STUB_PID" ] && kill "$STUB_PID" 2>/dev/null || true
+}
+trap cleanup EXIT
+
+echo "🧪 Testing http skills..."
+echo "📍 Base URL: $BASE_URL"
+echo "🔌 Stub service: http://127.0.0.1:${STUB_PORT}"
+echo ""
+
+python3 "${SCRIPT_DIR}/stub_skill_service.py" "$STUB_PORT" > /dev/null &
+STUB_PID=$!
+sleep 1
+
+write_manifest() {
+    cat > "${SKILLS_DIR}/http_stub_$1.yaml" <<EOF
+id: http_stub_$1
+type: http
+endpoint: http://127.0.0.1:${STUB_PORT}/$1
+timeout_ms: ${2:-5000}
+pool_size: 4
+EOF
+}
+write_manifest echo
+write_manifest plain
+write_manifest fail
+write_manifest slow 300
+reload
+
+invoke() {
+    curl -s -X POST "${BASE_URL}/skills/$1:invoke" \
+      -H "Content-Type: application/json" \
+      -H "X-Trace-Id: ${TRACE_ID}" \
+      -d "$2"
+}
+
+check() {
+    local name=$1 response=$2 pattern=$3
+    if echo "$response" | grep -q "$pattern"; then
+        echo "✅ $name passed"
+    else
+        echo "❌ $name failed"
+        echo "Response: $response"
+        exit 1
+    fi
+}
+
+# Test 1: Envelope passthrough (trace id forwarded)
+echo "Test 1: Envelope response"
+RESPONSE=$(invoke http_stub_echo '{"input": {"text": "hello"}}')
+check "Test 1" "$RESPONSE" '"echoed":"hello"'
+check "Test 1 (trace header)" "$RESPONSE" "\"trace_header\":\"${TRACE_ID}\""
+
+# Test 2: Error envelope on HTTP 400 keeps the service's error code
+echo ""
+echo "Test 2: Error envelope (should fail)"
+RESPONSE=$(invoke http_stub_echo '{"input": {}}')
+check "Test 2" "$RESPONSE" '"code":"INVALID_ARGUMENT"'
+
+# Test 3: Bare JSON object becomes data
+echo ""
+echo "Test 3: Plain JSON response"
+RESPONSE=$(invoke http_stub_plain '{"input": {"x": 1}}')
+check "Test 3" "$RESPONSE" '"received":{"x":1}'
+
+# Test 4: HTTP 503 without envelope
+echo ""
+echo "Test 4: HTTP 503 (should fail)"
+RESPONSE=$(invoke http_stub_fail '{"input": {}}')
+check "Test 4" "$RESPONSE" '"code":"RESOURCE_EXHAUSTED"'
+
+# Test 5: Timeout from timeout_ms
+echo ""
+echo "Test 5: Slow service (should time out)"
+RESPONSE=$(invoke http_stub_slow '{"input": {"text": "late", "ms": 1000}}')
+check "Test 5" "$RESPONSE" '"code":"TIMEOUT"'
+
+echo ""
+echo "✅ All http skill tests passed!"
@@ -0,0 +1,158 @@
+#!/bin/bash
+# Test script for log_transform skill (run from project root)
+
+set -e
+
+BASE_URL=${OPENSKILL_HTTP_BASE_URL:-http://127.0.0.1:8000}
+ALLOWED_ROOT=${OPENSKILL_ALLOWED_ROOT:-./data}
+TRACE_ID="test-$(date +%s)"
+
+# Fixtures and outputs live in a scratch directory under the allowed root
+mkdir -p "$ALLOWED_ROOT"
+WORK_DIR=$(mktemp -d "${ALLOWED_ROOT}/log_transform_test.XXXXXX")
+trap 'rm -rf "$WORK_DIR"' EXIT
+
+echo "🧪 Testing log_transform skill..."
+echo "📍 Base URL: $BASE_URL"
+echo "🔍 Trace ID: $TRACE_ID"
+echo ""
+
+# Prepare a small log file under the allowed root
+cat > "${WORK_DIR}/app.log" <<'LOG'
+2024-01-01 10:00:00 INFO service started
+2024-01-01 10:00:01 WARN disk usage 91%
+2024-01-01 10:00:02 ERROR request failed
+LOG
+
+# Test 1: Records returned on stdout
+echo "Test 1: stdout output"
+RESPONSE=$(curl -s -X POST "${BASE_URL}/skills/log_transform:invoke" \
+  -H "Content-Type: application/json" \
+  -H "X-Trace-Id: ${TRACE_ID}" \
+  -d "{\"input\": {\"input_path\": \"${WORK_DIR}/app.log\"}}")
+
+if echo "$RESPONSE" | grep -q '"success":true' && echo "$RESPONSE" | grep -q '"count":3'; then
+    echo "✅ Test 1 passed"
+else
+    echo "❌ Test 1 failed"
+    echo "Response: $RESPONSE"
+    exit 1
+fi
+
+# Test 2: gzip JSONL file sink only reports stats
+echo ""
+echo "Test 2: file output (jsonl + gzip)"
+RESPONSE=$(curl -s -X POST "${BASE_URL}/skills/log_transform:invoke" \
+  -H "Content-Type: application/json" \
+  -H "X-Trace-Id: ${TRACE_ID}-2" \
+  -d "{\"input\": {\"input_path\": \"${WORK_DIR}/app.log\", \"output\": \"file\", \"output_path\": \"${WORK_DIR}/app.jsonl.gz\", \"compression\": \"gzip\"}}")
+
+if echo "$RESPONSE" | grep -q '"records":3' && ! echo "$RESPONSE" | grep -q '"message"'; then
+    echo "✅ Test 2 passed"
+else
+    echo "❌ Test 2 failed"
+    echo "Response: $RESPONSE"
+    exit 1
+fi
+
+# Test 3: Output path outside allowed root (should fail)
+echo ""
+echo "Test 3: output_path outside allowed root (should fail)"
+RESPONSE=$(curl -s -X POST "${BASE_URL}/skills/log_transform:invoke" \
+  -H "Content-Type: application/json" \
+  -H "X-Trace-Id: ${TRACE_ID}-3" \
+  -d "{\"input\": {\"input_path\": \"${WORK_DIR}/app.log\", \"output\": \"file\", \"output_path\": \"out.csv\", \"output_format\": \"csv\"}}")
+
+if echo "$RESPONSE" | grep -q '"FORBIDDEN_PATH"'; then
+    echo "✅ Test 3 passed"
+else
+    echo "❌ Test 3 failed"
+    echo "Response: $RESPONSE"
+    exit 1
+fi
+
+# incremental [LIMIT]: next batch of ${WORK_DIR}/tail.log, summarised as
+# "count=N lines=A,B reset=R pending=P truncated=T"
+incremental() {
+    local limit=${1:-200}
+    curl -s -X POST "${BASE_URL}/skills/log_transform:invoke" \
+      -H "Content-Type: application/json" \
+      -H "X-Trace-Id: ${TRACE_ID}-inc" \
+      -d "{\"input\": {\"input_path\": \"${WORK_DIR}/tail.log\", \"mode\": \"incremental\", \"state_path\": \"${WORK_DIR}/state.json\", \"limit\": ${limit}}}" \
+      | python3 -c "
+import json, sys
+response = json.load(sys.stdin)
+data = response.get('data') or {}
+checkpoint = data.get('checkpoint') or {}
+print(
+    f\"count={data.get('count')}\",
+    'lines=' + ','.join(str(r['line']) for r in data.get('records', [])),
+    f\"reset={checkpoint.get('reset')}\",
+    f\"pending={checkpoint.get('pending_bytes')}\",
+    f\"truncated={data.get('truncated')}\",
+    f\"message={data['records'][0]['message'] if data.get('records') else ''}\",
+    '' if response.get('success') else json.dumps(response),
+)"
+}
+
+check() {
+    local name=$1 response=$2 pattern=$3
+    if echo "$response" | grep -q -- "$pattern"; then
+        echo "✅ $name passed"
+    else
+        echo "❌ $name failed"
+        echo "Response: $response"
+        exit 1
+    fi
+}
+
+log_lines() {
+    for i in $(seq "$1" "$2"); do
+        echo "2024-01-01 10:01:0$((i % 10)) INFO event $i"
+    done >> "${WORK_DIR}/tail.log"
+}
+
+# Test 4: Incremental mode returns only what was appended since the last call
+echo ""
+echo "Test 4: incremental mode (append)"
+log_lines 1 3
+check "Test 4 (first call reads everything)" "$(incremental)" "count=3 lines=1,2,3 reset=None"
+check "Test 4 (nothing new)" "$(incremental)" "count=0 lines= reset=None"
+log_lines 4 5
+check "Test 4 (appended lines)" "$(incremental)" "count=2 lines=4,5 reset=None"
+
+# Test 5: A line without its newline yet is held back, not half-parsed
+echo ""
+echo "Test 5: incremental mode (partial line)"
+printf '2024-01-01 10:02:00 INFO half' >> "${WORK_DIR}/tail.log"
+check "Test 5 (fragment held back)" "$(incremental)" "count=0 lines= reset=None pending=29"
+printf ' done\n' >> "${WORK_DIR}/tail.log"
+check "Test 5 (fragment completed)" "$(incremental)" "count=1 lines=6 reset=None pending=0 truncated=False message=INFO half done"
+
+# Test 6: Lines beyond limit stay unconsumed for the next call
+echo ""
+echo "Test 6: incremental mode (limit)"
+log_lines 7 11
+check "Test 6 (first batch)" "$(incremental 2)" "count=2 lines=7,8 reset=None pending=0 truncated=True"
+check "Test 6 (second batch)" "$(incremental 2)" "count=2 lines=9,10 reset=None pending=0 truncated=True"
+check "Test 6 (rest)" "$(incremental 2)" "count=1 lines=11 reset=None pending=0 truncated=False"
+
+# Test 7: A file truncated in place is read again from the start
+echo ""
+echo "Test 7: incremental mode (truncate)"
+: > "${WORK_DIR}/tail.log"
+log_lines 1 1
+check "Test 7 (reset)" "$(incremental)" "count=1 lines=1 reset=truncated"
+log_lines 2 2
+check "Test 7 (resumes after reset)" "$(incremental)" "count=1 lines=2 reset=None"
+
+# Test 8: A rotated file (new inode at the same path) is read from the start
+echo ""
+echo "Test 8: incremental mode (rotate)"
+mv "${WORK_DIR}/tail.log" "${WORK_DIR}/tail.log.1"
+log_lines 1 4
+check "Test 8 (reset)" "$(incremental)" "count=4 lines=1,2,3,4 reset=rotated"
+check "Test 8 (nothing new)" "$(incremental)" "count=0 lines= reset=None"
+
+echo ""
+echo "✅ All log_transform skill tests passed!"
@@ -0,0 +1,118 @@
+#!/bin/bash
+# Test script for the precompiled manifest snapshot
+# (python -m src.cli compile-manifests)
+#
+# Self-contained: works on copies of two manifests in a scratch directory
+# and never touches skills/.manifests.snapshot.json, so it needs no
+# running host. Run from the project root's virtualenv.
+
+set -e
+
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+cd "${SCRIPT_DIR}/.."
+
+WORK_DIR=$(mktemp -d)
+SKILLS_DIR="${WORK_DIR}/skills"
+SNAPSHOT="${WORK_DIR}/snapshot.json"
+trap 'rm -rf "$WORK_DIR"' EXIT
+
+mkdir -p "$SKILLS_DIR"
+cp skills/echo.yaml skills/calculator.yaml "$SKILLS_DIR"
+
+echo "🧪 Testing manifest snapshot..."
+echo ""
+
+# compile_manifests [--check]: sets OUTPUT and STATUS
+compile_manifests() {
+    STATUS=0
+    OUTPUT=$(PYTHONPATH=. OPENSKILL_LOG_FORMAT=text python3 -m src.cli compile-manifests \
+        --skills-dir "$SKILLS_DIR" -o "$SNAPSHOT" "$@" 2>&1) || STATUS=$?
+}
+
+# check NAME EXPECTED_STATUS PATTERN: against the last compile_manifests
+check() {
+    local name=$1 expected=$2 pattern=$3
+    if [ "$STATUS" -eq "$expected" ] && echo "$OUTPUT" | grep -q -- "$pattern"; then
+        echo "✅ $name passed"
+    else
+        echo "❌ $name failed"
+        echo "Exit status: $STATUS (expected $expected)"
+        echo "Output: $OUTPUT"
+        exit 1
+    fi
+}
+
+# Test 1: Compile, then --check reports the snapshot fresh
+echo "Test 1: Compile"
+compile_manifests
+check "Test 1 (compile)" 0 "Wrote 2 manifests to ${SNAPSHOT}"
+compile_manifests --check
+check "Test 1 (fresh)" 0 ": fresh$"
+
+# Test 2: A new mtime alone (e.g. a fresh checkout) keeps it fresh
+echo ""
+echo "Test 2: Touched manifest"
+touch -d "+1 minute" "${SKILLS_DIR}/echo.yaml"
+compile_manifests --check
+check "Test 2" 0 ": fresh$"
+
+# Test 3: An edit that keeps the file size is still noticed
+echo ""
+echo "Test 3: Edited manifest"
+sed -i 's/^timeout_ms: 15000$/timeout_ms: 25000/' "${SKILLS_DIR}/echo.yaml"
+compile_manifests --check
+check "Test 3 (stale)" 1 ": stale or missing$"
+
+# The registry parses the YAML instead of trusting the stale snapshot
+if PYTHONPATH=. OPENSKILL_LOG_FORMAT=text python3 - "$SKILLS_DIR" "$SNAPSHOT" <<'EOF'
+import sys
+from pathlib import Path
+
+from src.registry import SkillRegistry
+
+registry = SkillRegistry(Path(sys.argv[1]), snapshot_path=Path(sys.argv[2]))
+sys.exit(0 if registry.get_skill("echo").timeout_ms == 25000 else 1)
+EOF
+then
+    echo "✅ Test 3 (registry uses the edit) passed"
+else
+    echo "❌ Test 3 failed: registry loaded the stale snapshot"
+    exit 1
+fi
+compile_manifests
+compile_manifests --check
+check "Test 3 (recompiled)" 0 ": fresh$"
+
+# Test 4: Added and removed manifests make it stale
+echo ""
+echo "Test 4: Added and removed manifests"
+cp skills/log_transform.yaml "$SKILLS_DIR"
+compile_manifests --check
+check "Test 4 (added)" 1 ": stale or missing$"
+compile_manifests
+check "Test 4 (recompiled)" 0 "Wrote 3 manifests"
+rm "${SKILLS_DIR}/log_transform.yaml"
+compile_manifests --check
+check "Test 4 (removed)" 1 ": stale or missing$"
+
+# Test 5: A missing snapshot is reported, not an error
+echo ""
+echo "Test 5: Missing snapshot"
+rm -f "$SNAPSHOT"
+compile_manifests --check
+check "Test 5" 1 ": stale or missing$"
+
+# Test 6: An invalid manifest fails the compile and writes nothing
+echo ""
+echo "Test 6: Invalid manifest"
+printf 'id: Not Valid\n' > "${SKILLS_DIR}/broken.yaml"
+compile_manifests
+check "Test 6 (compile fails)" 1 "Failed to compile manifests: Invalid skill id format"
+if [ -e "$SNAPSHOT" ]; then
+    echo "❌ Test 6 failed: snapshot written despite the invalid manifest"
+    exit 1
+fi
+echo "✅ Test 6 (no snapshot written) passed"
+
+echo ""
+echo "✅ All manifest snapshot tests passed!"
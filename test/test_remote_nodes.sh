@@ -0,0 +1,214 @@
+#!/bin/bash
+# Test script for skill nodes (placement: remote)
+#
+# Self-contained: starts two local skill nodes (one on a Unix socket, one
+# on TCP), a wedged one (accepts TCP connections, never answers) and a
+# front-end Skill Host of its own on FRONT_PORT, so it does not need a
+# running host. Run from the project root's virtualenv.
+
+set -e
+
+FRONT_PORT=${FRONT_PORT:-8902}
+NODE_PORT=${NODE_PORT:-9302}
+WEDGED_PORT=${WEDGED_PORT:-9303}
+BASE_URL="http://127.0.0.1:${FRONT_PORT}"
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+ROOT_DIR="${SCRIPT_DIR}/.."
+WORK_DIR=$(mktemp -d)
+NODE1="unix:${WORK_DIR}/node1.sock"
+NODE2="127.0.0.1:${NODE_PORT}"
+WEDGED="127.0.0.1:${WEDGED_PORT}"
+ADMIN_TOKEN="remote-nodes-test"
+export OPENSKILL_NODE_TOKEN="remote-nodes-test-node"
+MANIFEST="${ROOT_DIR}/skills/remote_echo_test.yaml"
+
+cleanup() {
+    # Test 8 stops NODE2; a stopped process would not act on SIGTERM
+    [ -n "$NODE2_PID" ] && kill -CONT "$NODE2_PID" 2>/dev/null || true
+    for pid in "$FRONT_PID" "$NODE1_PID" "$NODE2_PID" "$WEDGED_PID"; do
+        [ -n "$pid" ] && kill "$pid" 2>/dev/null || true
+    done
+    rm -f "$MANIFEST"
+    rm -rf "$WORK_DIR"
+}
+trap cleanup EXIT
+
+cd "$ROOT_DIR"
+
+echo "🧪 Testing skill nodes..."
+echo "📍 Front end: $BASE_URL"
+echo "🔌 Nodes: $NODE1, $NODE2 (wedged: $WEDGED)"
+echo ""
+
+cat > "$MANIFEST" <<EOF
+id: remote_echo_test
+type: cli
+runtime: python
+entry: ./skill_cli/echo.py
+placement: remote
+idempotent: true
+timeout_ms: 5000
+EOF
+
+start_node1() {
+    python3 -m src.cli node --listen "$NODE1" -w 4 > /dev/null 2>&1 &
+    NODE1_PID=$!
+}
+start_node1
+python3 -m src.cli node --listen "$NODE2" -w 4 > /dev/null 2>&1 &
+NODE2_PID=$!
+# Listens but never accepts: connects succeed, handshakes never finish
+python3 -c "
+import socket, sys, time
+server = socket.create_server(('127.0.0.1', int(sys.argv[1])))
+time.sleep(3600)
+" "$WEDGED_PORT" > /dev/null 2>&1 &
+WEDGED_PID=$!
+sleep 2
+
+OPENSKILL_NODES="${NODE1},${NODE2},${WEDGED}" OPENSKILL_ADMIN_TOKEN="$ADMIN_TOKEN" \
+    python3 -m uvicorn src.app:app --host 127.0.0.1 --port "$FRONT_PORT" > /dev/null 2>&1 &
+FRONT_PID=$!
+sleep 4
+
+invoke() {
+    curl -s -X POST "${BASE_URL}/skills/remote_echo_test:invoke" \
+      -H "Content-Type: application/json" \
+      -d "{\"input\": {\"text\": \"$1\"}}"
+}
+
+nodes() {
+    curl -s "${BASE_URL}/debug/nodes" -H "X-Admin-Token: ${ADMIN_TOKEN}"
+}
+
+check() {
+    local name=$1 response=$2 pattern=$3
+    if echo "$response" | grep -q -- "$pattern"; then
+        echo "✅ $name passed"
+    else
+        echo "❌ $name failed"
+        echo "Response: $response"
+        exit 1
+    fi
+}
+
+# Test 1: Invocation through a node
+echo "Test 1: Remote invocation"
+RESPONSE=$(invoke hello)
+check "Test 1" "$RESPONSE" '"echoed":"hello"'
+
+# Test 2: Calls are spread over both nodes
+echo ""
+echo "Test 2: Load balancing"
+for i in 1 2 3 4 5 6; do invoke "lb-$i" > /dev/null; done
+RESPONSE=$(nodes)
+check "Test 2 (three nodes)" "$RESPONSE" '"count":3'
+check "Test 2 (wedged node kept out)" "$RESPONSE" "\"address\":\"${WEDGED}\",\"healthy\":false"
+if echo "$RESPONSE" | grep -o "\"address\":\"[^\"]*\",\"healthy\":true,\"outstanding\":0,\"completed\":0," | grep -q .; then
+    echo "❌ Test 2 failed: a node received no calls"
+    echo "Response: $RESPONSE"
+    exit 1
+fi
+echo "✅ Test 2 passed"
+
+# Test 3: Killing a node under load; idempotent calls are retried
+echo ""
+echo "Test 3: Node failure under load"
+CALL_PIDS=()
+for i in $(seq 1 20); do
+    invoke "load-$i" > "${WORK_DIR}/call-$i.json" &
+    CALL_PIDS+=($!)
+done
+sleep 0.2
+kill -9 "$NODE1_PID"
+wait "${CALL_PIDS[@]}"
+FAILED=$(grep -L '"success":true' "${WORK_DIR}"/call-*.json | wc -l)
+if [ "$FAILED" -ne 0 ]; then
+    echo "❌ Test 3 failed: $FAILED calls failed"
+    cat "${WORK_DIR}"/call-*.json
+    exit 1
+fi
+echo "✅ Test 3 passed"
+
+# Test 4: The dead node is ejected
+echo ""
+echo "Test 4: Ejection"
+sleep 1
+RESPONSE=$(nodes)
+check "Test 4" "$RESPONSE" "\"address\":\"${NODE1}\",\"healthy\":false"
+
+# Test 5: A restarted node rejoins after the next heartbeat
+echo ""
+echo "Test 5: Rejoin"
+start_node1
+sleep 4
+RESPONSE=$(nodes)
+check "Test 5" "$RESPONSE" "\"address\":\"${NODE1}\",\"healthy\":true"
+
+# Test 6: Reconnect attempts to the wedged node delay neither calls nor
+# the heartbeats of the healthy nodes
+echo ""
+echo "Test 6: Wedged node"
+TOTAL=$(curl -s -o /dev/null -w '%{time_total}' -X POST "${BASE_URL}/skills/remote_echo_test:invoke" \
+    -H "Content-Type: application/json" -d '{"input": {"text": "wedged"}}')
+if ! awk -v t="$TOTAL" 'BEGIN { exit !(t < 1.0) }'; then
+    echo "❌ Test 6 failed: call took ${TOTAL}s"
+    exit 1
+fi
+RESPONSE=$(nodes)
+check "Test 6" "$RESPONSE" "\"address\":\"${NODE2}\",\"healthy\":true,\"outstanding\":[0-9]*,\"completed\":[0-9]*,\"ejections\":0"
+
+# Test 7: A node only serves clients that present the node token
+echo ""
+echo "Test 7: Node token"
+RESPONSE=$(python3 -c "
+import socket, sys
+from src.runners.remote import recv_frame, send_frame
+sock = socket.create_connection(('127.0.0.1', int(sys.argv[1])))
+send_frame(sock, {'op': 'invoke', 'id': 1, 'skill_id': 'echo', 'input': {'text': 'x'}})
+print(recv_frame(sock), recv_frame(sock))
+" "$NODE_PORT" 2>&1)
+check "Test 7 (refused without token)" "$RESPONSE" "'error': 'Unauthorized'} None"
+STATUS=0
+OPENSKILL_NODE_TOKEN= timeout 10 python3 -m src.cli node --listen "0.0.0.0:$((WEDGED_PORT + 1))" \
+    > /dev/null 2>&1 || STATUS=$?
+if [ "$STATUS" -ne 2 ]; then
+    echo "❌ Test 7 failed: node on 0.0.0.0 without a token exited with $STATUS (expected 2)"
+    exit 1
+fi
+echo "✅ Test 7 (no token, no public listen) passed"
+
+# Test 8: A node that stops reading mid-request (SIGSTOP, input larger than
+# the socket buffers) holds neither the call past its timeout nor the
+# heartbeat, so the node is still ejected
+echo ""
+echo "Test 8: Node stops reading"
+python3 -c "
+import json, sys
+print(json.dumps({'input': {'text': 'x' * (16 * 1024 * 1024)}}))
+" > "${WORK_DIR}/large.json"
+kill -STOP "$NODE2_PID"
+CALL_PIDS=()
+for i in 1 2; do
+    curl -s -o /dev/null -w '%{time_total}' --max-time 30 -X POST "${BASE_URL}/skills/remote_echo_test:invoke" \
+        -H "Content-Type: application/json" -d @"${WORK_DIR}/large.json" > "${WORK_DIR}/large-$i.time" &
+    CALL_PIDS+=($!)
+done
+wait "${CALL_PIDS[@]}"
+for i in 1 2; do
+    TOTAL=$(cat "${WORK_DIR}/large-$i.time")
+    # timeout_ms (5s) plus the reply grace
+    if ! awk -v t="$TOTAL" 'BEGIN { exit !(t < 8.0) }'; then
+        echo "❌ Test 8 failed: call $i took ${TOTAL}s"
+        exit 1
+    fi
+done
+RESPONSE=$(nodes)
+kill -CONT "$NODE2_PID"
+check "Test 8 (ejected)" "$RESPONSE" "\"address\":\"${NODE2}\",\"healthy\":false"
+sleep 4
+RESPONSE=$(nodes)
+check "Test 8 (rejoined)" "$RESPONSE" "\"address\":\"${NODE2}\",\"healthy\":true"
+
+echo ""
+echo "✅ All skill node tests passed!"
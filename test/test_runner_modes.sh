@@ -0,0 +1,180 @@
+#!/bin/bash
+# Test script for the warm runner modes (pool, forkserver, inprocess)
+#
+# Self-contained: writes a small SDK skill (skill_cli/runner_modes_test.py)
+# with one manifest per mode and starts a Skill Host of its own on
+# HOST_PORT, so it does not need a running host. Run from the project
+# root's virtualenv.
+
+set -e
+
+HOST_PORT=${HOST_PORT:-8908}
+BASE_URL="http://127.0.0.1:${HOST_PORT}"
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+ROOT_DIR="${SCRIPT_DIR}/.."
+SKILL_SCRIPT="${ROOT_DIR}/skill_cli/runner_modes_test.py"
+ADMIN_TOKEN="runner-modes-test"
+
+cleanup() {
+    [ -n "$SERVE_PID" ] && kill "$SERVE_PID" 2>/dev/null || true
+    rm -f "$SKILL_SCRIPT" "${ROOT_DIR}"/skills/runner_modes_*.yaml
+}
+trap cleanup EXIT
+
+cd "$ROOT_DIR"
+
+echo "🧪 Testing runner modes..."
+echo "📍 Host: $BASE_URL"
+echo ""
+
+# Reports its pid and a marker the reload test edits; can sleep, write
+# stderr and allocate memory on request
+cat > "$SKILL_SCRIPT" <<'PY'
+import os
+import sys
+import time
+
+from openskill_sdk import run
+
+MARK = "v1"
+
+
+def handle(payload):
+    if payload.get("stderr"):
+        print(payload["stderr"], file=sys.stderr, flush=True)
+    if payload.get("sleep_ms"):
+        time.sleep(payload["sleep_ms"] / 1000)
+    if payload.get("alloc_mb"):
+        bytearray(payload["alloc_mb"] * 1024 * 1024)
+    return {"pid": os.getpid(), "mark": MARK}
+
+
+if __name__ == "__main__":
+    raise SystemExit(run("runner_modes_test", handle))
+PY
+
+# write_manifest MODE [EXTRA YAML LINE]
+write_manifest() {
+    cat > "skills/runner_modes_$1.yaml" <<EOF
+id: runner_modes_$1
+type: cli
+runtime: python
+entry: ./skill_cli/runner_modes_test.py
+mode: ${1%_*}
+pool_size: 1
+timeout_ms: 1000
+$2
+EOF
+}
+write_manifest oneshot
+write_manifest pool "slow_threshold_ms: 1"
+write_manifest forkserver
+write_manifest inprocess
+# Resource limits move a pool skill onto the fork server
+write_manifest pool_limited "max_rss_mb: 256"
+
+OPENSKILL_ADMIN_TOKEN="$ADMIN_TOKEN" OPENSKILL_LOG_FORMAT=text \
+    python3 -m uvicorn src.app:app --host 127.0.0.1 --port "$HOST_PORT" > /dev/null 2>&1 &
+SERVE_PID=$!
+sleep 5
+
+invoke() {
+    curl -s -X POST "${BASE_URL}/skills/runner_modes_$1:invoke" \
+      -H "Content-Type: application/json" \
+      -d "{\"input\": ${2:-{\}}}"
+}
+
+pid_of() {
+    echo "$1" | grep -o '"pid":[0-9]*' | cut -d: -f2
+}
+
+check() {
+    local name=$1 response=$2 pattern=$3
+    if echo "$response" | grep -q -- "$pattern"; then
+        echo "✅ $name passed"
+    else
+        echo "❌ $name failed"
+        echo "Response: $response"
+        exit 1
+    fi
+}
+
+# Test 1: A round trip per mode; pool reuses its worker, the fork server
+# forks a fresh child per call, inprocess runs in the host itself
+echo "Test 1: Round trip per mode"
+for mode in oneshot pool forkserver inprocess; do
+    check "Test 1 ($mode)" "$(invoke "$mode")" '"success":true.*"mark":"v1"'
+done
+FIRST=$(pid_of "$(invoke pool)")
+SECOND=$(pid_of "$(invoke pool)")
+check "Test 1 (pool reuses its worker)" "$SECOND" "^${FIRST}$"
+FIRST=$(pid_of "$(invoke forkserver)")
+SECOND=$(pid_of "$(invoke forkserver)")
+if [ -z "$FIRST" ] || [ "$FIRST" = "$SECOND" ]; then
+    echo "❌ Test 1 failed: fork server served two calls from pid $FIRST"
+    exit 1
+fi
+echo "✅ Test 1 (fork server forks per call) passed"
+check "Test 1 (inprocess runs in the host)" "$(pid_of "$(invoke inprocess)")" "^${SERVE_PID}$"
+
+# Test 2: A call that outlives timeout_ms kills its worker; the next call
+# gets a new one
+echo ""
+echo "Test 2: Timeout kills the worker"
+for mode in pool forkserver; do
+    WORKER=$(pid_of "$(invoke "$mode")")
+    START=$(date +%s%N)
+    RESPONSE=$(invoke "$mode" '{"sleep_ms": 5000}')
+    ELAPSED_MS=$((($(date +%s%N) - START) / 1000000))
+    check "Test 2 ($mode: TIMEOUT)" "$RESPONSE" '"code":"TIMEOUT"'
+    if [ "$ELAPSED_MS" -ge 3000 ]; then
+        echo "❌ Test 2 failed: $mode call took ${ELAPSED_MS}ms with timeout_ms 1000"
+        exit 1
+    fi
+    if [ "$mode" = pool ] && kill -0 "$WORKER" 2>/dev/null; then
+        echo "❌ Test 2 failed: timed-out pool worker $WORKER is still running"
+        exit 1
+    fi
+    check "Test 2 ($mode: next call)" "$(invoke "$mode")" '"success":true'
+done
+NEXT=$(pid_of "$(invoke pool)")
+if [ "$NEXT" = "$WORKER" ]; then
+    echo "❌ Test 2 failed: pool still uses worker $WORKER"
+    exit 1
+fi
+echo "✅ Test 2 (pool replaced its worker) passed"
+
+# Test 3: Resource limits move a pool skill onto the fork server, where
+# they apply per call
+echo ""
+echo "Test 3: Resource limits"
+FIRST=$(pid_of "$(invoke pool_limited)")
+SECOND=$(pid_of "$(invoke pool_limited)")
+if [ -z "$FIRST" ] || [ "$FIRST" = "$SECOND" ]; then
+    echo "❌ Test 3 failed: limited pool skill served two calls from pid $FIRST"
+    exit 1
+fi
+echo "✅ Test 3 (runs on the fork server) passed"
+RESPONSE=$(invoke pool_limited '{"alloc_mb": 512}')
+check "Test 3 (limit applies)" "$RESPONSE" '"code":"RESOURCE_EXHAUSTED".*Memory limit exceeded'
+check "Test 3 (worker survives)" "$(invoke pool_limited)" '"success":true'
+
+# Test 4: A worker's stderr reaches the slow-call recorder (pool has
+# slow_threshold_ms: 1; the sleep keeps a warm call above it)
+echo ""
+echo "Test 4: stderr capture"
+invoke pool '{"stderr": "runner-modes-stderr-marker", "sleep_ms": 20}' > /dev/null
+RESPONSE=$(curl -s "${BASE_URL}/debug/slow?skill_id=runner_modes_pool&limit=1" -H "X-Admin-Token: ${ADMIN_TOKEN}")
+check "Test 4" "$RESPONSE" '"stderr_tail":"runner-modes-stderr-marker\\n"'
+
+# Test 5: Editing the script reloads every warm mode
+echo ""
+echo "Test 5: Reload after a script edit"
+sed -i 's/^MARK = "v1"$/MARK = "v2-edited"/' "$SKILL_SCRIPT"
+curl -s -X POST "${BASE_URL}/debug/reload" -H "X-Admin-Token: ${ADMIN_TOKEN}" > /dev/null
+for mode in pool forkserver inprocess; do
+    check "Test 5 ($mode)" "$(invoke "$mode")" '"mark":"v2-edited"'
+done
+
+echo ""
+echo "✅ All runner mode tests passed!"
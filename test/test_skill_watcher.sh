@@ -0,0 +1,178 @@
+#!/bin/bash
+# Test script for the skill watcher (OPENSKILL_WATCH_SKILLS hot reload)
+#
+# Self-contained: writes a small pooled SDK skill (skill_cli/watch_test.py)
+# and starts a Skill Host of its own on HOST_PORT with the watcher
+# polling every 100ms, so it does not need a running host. No call to
+# /debug/reload is made: every change must be picked up by the watcher.
+# Run from the project root's virtualenv.
+
+set -e
+
+HOST_PORT=${HOST_PORT:-8909}
+BASE_URL="http://127.0.0.1:${HOST_PORT}"
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+ROOT_DIR="${SCRIPT_DIR}/.."
+SKILL_SCRIPT="${ROOT_DIR}/skill_cli/watch_test.py"
+MANIFEST="${ROOT_DIR}/skills/watch_test.yaml"
+RESULTS_DIR=$(mktemp -d)
+
+cleanup() {
+    [ -n "$CHURN_PID" ] && kill "$CHURN_PID" 2>/dev/null || true
+    [ -n "$SERVE_PID" ] && kill "$SERVE_PID" 2>/dev/null || true
+    rm -f "$SKILL_SCRIPT" "$MANIFEST" "${MANIFEST}.tmp"
+    rm -rf "$RESULTS_DIR"
+}
+trap cleanup EXIT
+
+cd "$ROOT_DIR"
+
+echo "🧪 Testing skill watcher..."
+echo "📍 Host: $BASE_URL"
+echo ""
+
+# Reports its pid, a marker the script-edit test changes, and the
+# allowed_root its manifest passed down
+cat > "$SKILL_SCRIPT" <<'PY'
+import os
+
+from openskill_sdk import allowed_root, run
+
+MARK = "v1"
+
+
+def handle(payload):
+    return {"pid": os.getpid(), "mark": MARK, "root": allowed_root().name}
+
+
+if __name__ == "__main__":
+    raise SystemExit(run("watch_test", handle))
+PY
+
+# write_manifest ALLOWED_ROOT (must lie under ./data to take effect)
+# Written beside the manifest and renamed over it, as deploy tools do: the
+# watcher could otherwise catch an in-place rewrite half-written
+write_manifest() {
+    cat > "${MANIFEST}.tmp" <<EOF
+id: watch_test
+type: cli
+runtime: python
+entry: ./skill_cli/watch_test.py
+mode: pool
+pool_size: 2
+timeout_ms: 10000
+allowed_root: $1
+EOF
+    mv "${MANIFEST}.tmp" "$MANIFEST"
+}
+
+OPENSKILL_WATCH_SKILLS=1 OPENSKILL_WATCH_INTERVAL_MS=100 OPENSKILL_LOG_FORMAT=text \
+    python3 -m uvicorn src.app:app --host 127.0.0.1 --port "$HOST_PORT" > /dev/null 2>&1 &
+SERVE_PID=$!
+sleep 5
+
+invoke() {
+    curl -s -X POST "${BASE_URL}/skills/watch_test:invoke" \
+      -H "Content-Type: application/json" \
+      -d '{"input": {}}'
+}
+
+pid_of() {
+    echo "$1" | grep -o '"pid":[0-9]*' | cut -d: -f2
+}
+
+check() {
+    local name=$1 response=$2 pattern=$3
+    if echo "$response" | grep -q -- "$pattern"; then
+        echo "✅ $name passed"
+    else
+        echo "❌ $name failed"
+        echo "Response: $response"
+        exit 1
+    fi
+}
+
+# wait_for NAME PATTERN: invoke until the response matches (up to 5s)
+wait_for() {
+    local name=$1 pattern=$2 response
+    for _ in $(seq 50); do
+        response=$(invoke)
+        if echo "$response" | grep -q -- "$pattern"; then
+            break
+        fi
+        sleep 0.1
+    done
+    check "$name" "$response" "$pattern"
+}
+
+# Test 1: A manifest added after start-up is picked up
+echo "Test 1: New manifest"
+check "Test 1 (unknown before)" "$(invoke)" '"code":"NOT_FOUND"'
+write_manifest ./data/watch_first
+wait_for "Test 1 (loaded)" '"success":true.*"mark":"v1","root":"watch_first"'
+
+# Test 2: Editing the manifest swaps it in
+echo ""
+echo "Test 2: Manifest edit"
+write_manifest ./data/watch_second
+wait_for "Test 2" '"root":"watch_second"'
+
+# Test 3: Editing the entry script replaces the pooled worker
+echo ""
+echo "Test 3: Script edit invalidates the pool"
+WORKER=$(pid_of "$(invoke)")
+sed -i 's/^MARK = "v1"$/MARK = "v2-edited"/' "$SKILL_SCRIPT"
+wait_for "Test 3 (new code)" '"mark":"v2-edited"'
+if [ "$(pid_of "$(invoke)")" = "$WORKER" ]; then
+    echo "❌ Test 3 failed: pool still uses worker $WORKER"
+    exit 1
+fi
+echo "✅ Test 3 (new worker) passed"
+
+# Test 4: Calls racing a stream of manifest edits all see a complete
+# manifest (the old or the new one), never a missing skill
+echo ""
+echo "Test 4: Calls during manifest edits"
+(
+    while true; do
+        write_manifest ./data/watch_first
+        sleep 0.05
+        write_manifest ./data/watch_second
+        sleep 0.05
+    done
+) &
+CHURN_PID=$!
+# One file per response: concurrent curls sharing a pipe interleave
+seq 60 | xargs -P 6 -I@ curl -s -X POST "${BASE_URL}/skills/watch_test:invoke" \
+    -H "Content-Type: application/json" -d '{"input": {}}' -o "${RESULTS_DIR}/@.json"
+kill "$CHURN_PID"
+wait "$CHURN_PID" 2>/dev/null || true
+CHURN_PID=
+PATTERN='"success":true.*"root":"(watch_first|watch_second)"'
+OK=$(grep -l -E "$PATTERN" "$RESULTS_DIR"/*.json | wc -l)
+if [ "$OK" -ne 60 ]; then
+    echo "❌ Test 4 failed: $OK/60 calls succeeded"
+    grep -L -E "$PATTERN" "$RESULTS_DIR"/*.json | head -3 | xargs cat
+    exit 1
+fi
+echo "✅ Test 4 passed (60/60 calls succeeded)"
+
+# Test 5: A manifest that no longer parses keeps the last good one
+echo ""
+echo "Test 5: Broken manifest edit"
+write_manifest ./data/watch_first
+wait_for "Test 5 (settled)" '"root":"watch_first"'
+printf 'id: watch_test\nmode: [unclosed\n' > "$MANIFEST"
+sleep 1
+check "Test 5 (still served)" "$(invoke)" '"success":true.*"root":"watch_first"'
+write_manifest ./data/watch_second
+wait_for "Test 5 (fixed)" '"root":"watch_second"'
+
+# Test 6: Deleting the manifest removes the skill
+echo ""
+echo "Test 6: Removed manifest"
+rm -f "$MANIFEST"
+wait_for "Test 6" '"code":"NOT_FOUND"'
+
+echo ""
+echo "✅ All skill watcher tests passed!"